@@ -0,0 +1,109 @@
+"""
+Load test of the `/api/name` endpoint: the ASGI application (`shennongname.asgi`, served by uvicorn, with a pool of worker processes) against the Flask application served by the Flask development server (as `run.py` does, one thread per request).
+
+Every server is started by its entry point in its own process, the load generator opens `concurrency` connections (kept alive if the server allows it), and sends the requests of a synthetic catalogue (POST, one name element per request).
+
+Usage
+-----
+python benchmarks/bench_asgi.py [n_requests] [concurrency] [asgi_workers]
+
+The ASGI application requires uvicorn (the `asgi` extra).
+"""
+import asyncio
+import importlib.util
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_batch import generate_catalogue
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, body: bytes) -> tuple[int, bool]:
+    '''
+    Send a request, and return the status and whether the connection is kept alive by the server.
+    '''
+    writer.write(b'POST /api/name HTTP/1.1\r\nhost: localhost\r\ncontent-type: application/json\r\ncontent-length: %d\r\n\r\n' % len(body) + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').lower().split('\r\n')
+    headers = dict(i.split(':', 1) for i in lines[1:] if i)
+    await reader.readexactly(int(headers['content-length']))
+    return int(lines[0].split(' ')[1]), headers.get('connection', '').strip() != 'close'
+
+
+async def generate_load(port: int, bodies: list[bytes], concurrency: int) -> tuple[float, list[float]]:
+    queue = iter(bodies)
+    latencies = []
+    
+    async def client():
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for body in queue:
+            start = time.perf_counter()
+            status, keep_alive = await request(reader, writer, body)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, status
+            if not keep_alive:
+                writer.close()
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.close()
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    return time.perf_counter() - start, latencies
+
+
+async def wait_for_server(port: int) -> None:
+    for _ in range(200):
+        try:
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+    raise RuntimeError('The server did not start.')
+
+
+def bench(name: str, module: str, env: dict[str, str], bodies: list[bytes], concurrency: int) -> None:
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', module],
+        env={**os.environ, **env, 'PORT': str(port), 'DEBUG': 'False'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_for_server(port))
+        # warm up the server (dictionaries, models, worker processes)
+        asyncio.run(generate_load(port, bodies[:concurrency * 2], concurrency))
+        elapsed, latencies = asyncio.run(generate_load(port, bodies, concurrency))
+    finally:
+        # SIGINT, so that the servers shut down their workers
+        process.send_signal(signal.SIGINT)
+        process.wait()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f'{name}: {len(bodies) / elapsed:.0f} requests/s, latency median {statistics.median(latencies) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms')
+
+
+def main(n: int = 5000, concurrency: int = 64, asgi_workers: int = os.cpu_count() or 1):
+    bodies = [i.model_dump_json().encode('utf-8') for i in generate_catalogue(n, seed=1)]
+    print(f'{n} requests, {concurrency} connections, {os.cpu_count()} CPUs')
+    bench('Flask (development server, shennongname.flask.run)', 'shennongname.flask.run', {}, bodies, concurrency)
+    if importlib.util.find_spec('uvicorn') is None:
+        print('ASGI: skipped, uvicorn is not installed (the `asgi` extra)')
+        return
+    bench(f'ASGI ({asgi_workers} worker processes, shennongname.asgi.run)', 'shennongname.asgi.run', {'ASGI_WORKERS': str(asgi_workers)}, bodies, concurrency)
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
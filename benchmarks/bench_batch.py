@@ -0,0 +1,68 @@
+"""
+Benchmark `construct_nmmsn_batch` against a `construct_nmmsn` loop.
+
+Usage
+-----
+python benchmarks/bench_batch.py [n_records]
+"""
+import random
+import sys
+import time
+
+from shennongname.snnmma.algorithm import construct_nmmsn, construct_nmmsn_batch
+from shennongname.snnmma.model import NmmsnNameElement
+
+
+SPECIES = [
+    ['Ephedra sinica', '草麻黄'], ['Ephedra intermedia', '中麻黄'], ['Ephedra equisetina', '木贼麻黄'],
+    ['Artemisia annua', '黄花蒿'], ['Panax ginseng', '人参'], ['Angelica sinensis', '当归'],
+    ['Lycium barbarum', '宁夏枸杞'], ['Astragalus membranaceus', '膜荚黄芪'],
+]
+PARTS = [['root', '根'], ['rhizome', '根茎'], ['stem herbaceous', '草质茎'], ['leaf', '叶'], ['fruit', '果实']]
+DESCRIPTIONS = [['fresh', '鲜'], ['dried', '干']]
+METHODS = [['segmented', '段制'], ['aquafried honey', '蜜炙制'], ['stirfried', '炒制'], ['steamed', '蒸制']]
+
+
+def random_ne_list(rng: random.Random, terms: list[list[str]], max_len: int, operator: str) -> list:
+    ne_list = []
+    for term in rng.sample(terms, rng.randint(1, max_len)):
+        ne_list += [term, operator]
+    return ne_list[:-1]
+
+
+def generate_catalogue(n: int, seed: int = 0) -> list[NmmsnNameElement]:
+    rng = random.Random(seed)
+    catalogue = []
+    for _ in range(n):
+        processed = rng.random() < 0.5
+        catalogue.append(NmmsnNameElement(
+            nmm_type='processed' if processed else 'plant',
+            species_origins=random_ne_list(rng, SPECIES, 2, 'or'),
+            medicinal_parts=random_ne_list(rng, PARTS, 2, 'or'),
+            special_descriptions=random_ne_list(rng, DESCRIPTIONS, 1, 'or'),
+            processing_methods=random_ne_list(rng, METHODS, 2, 'and') if processed else [],
+        ))
+    return catalogue
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    catalogue = generate_catalogue(n)
+    
+    start = time.perf_counter()
+    loop_results = [construct_nmmsn(i) for i in catalogue]
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    batch_results = construct_nmmsn_batch(catalogue)
+    batch_time = time.perf_counter() - start
+    
+    assert [i.model_dump() for i in loop_results] == [i.model_dump() for i in batch_results]
+    print(f'records: {n}')
+    print(f'construct_nmmsn loop:  {loop_time:.3f} s ({n / loop_time:.0f} records/s)')
+    print(f'construct_nmmsn_batch: {batch_time:.3f} s ({n / batch_time:.0f} records/s)')
+    print(f'speedup: {loop_time / batch_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
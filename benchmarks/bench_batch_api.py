@@ -0,0 +1,72 @@
+"""
+Throughput of the `/api/name/batch` endpoint (NDJSON request and response) against one `/api/name` request per name element, on the Flask application served by gunicorn (`shennongname.flask.gunicorn_conf`).
+
+The per-record requests are sent by the load generator of `bench_asgi.py` over `concurrency` keep-alive connections, the batches are sent one after another over a single connection. The time to the first line of a batch shows that the results are streamed while the batch is named.
+
+Usage
+-----
+python benchmarks/bench_batch_api.py [n_records] [batch_size] [concurrency] [workers]
+"""
+import asyncio
+import http.client
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from bench_asgi import free_port, generate_load, wait_for_server
+from bench_batch import generate_catalogue
+
+
+def post_batches(port: int, bodies: list[bytes], batch_size: int) -> tuple[float, list[float], int]:
+    '''
+    Send the name elements in NDJSON batches, and return the elapsed time, the times to the first line of the batches and the number of result lines.
+    '''
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    first_line_times = []
+    n_lines = 0
+    start = time.perf_counter()
+    for i in range(0, len(bodies), batch_size):
+        batch_start = time.perf_counter()
+        connection.request('POST', '/api/name/batch', b'\n'.join(bodies[i:i + batch_size]), {'Content-Type': 'application/x-ndjson'})
+        response = connection.getresponse()
+        assert response.status == 200, response.status
+        response.readline()
+        first_line_times.append(time.perf_counter() - batch_start)
+        n_lines += 1 + sum(1 for _ in response)
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed, first_line_times, n_lines
+
+
+def main(n: int = 5000, batch_size: int = 1000, concurrency: int = 8, workers: int = 1):
+    bodies = [i.model_dump_json().encode('utf-8') for i in generate_catalogue(n, seed=1)]
+    print(f'{n} records, batches of {batch_size}, {concurrency} connections for the per-record requests, {workers} gunicorn workers')
+    
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'python:shennongname.flask.gunicorn_conf', 'shennongname.flask.run:app'],
+        env={**os.environ, 'PORT': str(port), 'GUNICORN_WORKERS': str(workers), 'BATCH_MAX_SIZE': str(batch_size)},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_for_server(port))
+        # warm up the workers
+        asyncio.run(generate_load(port, bodies[:concurrency * 4], concurrency))
+        
+        single_time, _ = asyncio.run(generate_load(port, bodies, concurrency))
+        batch_time, first_line_times, n_lines = post_batches(port, bodies, batch_size)
+    finally:
+        process.send_signal(signal.SIGINT)
+        process.wait()
+    
+    assert n_lines == n
+    print(f'/api/name, one request per record: {single_time:.2f} s ({n / single_time:.0f} records/s)')
+    print(f'/api/name/batch:                   {batch_time:.2f} s ({n / batch_time:.0f} records/s), first line after {max(first_line_times) * 1000:.1f} ms at most')
+    print(f'speedup: {single_time / batch_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
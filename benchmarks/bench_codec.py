@@ -0,0 +1,52 @@
+"""
+Benchmark the bulk encoding and decoding of name element columns (`encode_nmmsn_ne_series`, `decode_nmmsn_ne_series`) against converting every cell with `str(NmmsnNeData)` and `NmmsnNeData.init_from_str`, on the name element columns of a catalogue.
+
+Usage
+-----
+python benchmarks/bench_codec.py [n_records]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from bench_batch import generate_catalogue
+from shennongname.snnmma.algorithm import NmmsnNeData
+from shennongname.snnmma.codec import decode_nmmsn_ne_series, encode_nmmsn_ne_series
+
+
+def main(n: int = 50000):
+    columns = ['species_origins', 'medicinal_parts', 'special_descriptions', 'processing_methods']
+    catalogue = generate_catalogue(n)
+    frozen_columns = {column: pd.Series([NmmsnNeData(getattr(i, column)).freeze() for i in catalogue]) for column in columns}
+    data_columns = {column: [NmmsnNeData(getattr(i, column)) for i in catalogue] for column in columns}
+    n_cells = n * len(columns)
+    
+    start = time.perf_counter()
+    expected_strs = {column: [str(i) for i in data_columns[column]] for column in columns}
+    str_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    encoded = {column: encode_nmmsn_ne_series(frozen_columns[column]) for column in columns}
+    encode_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    expected_frozen = {column: [NmmsnNeData.init_from_str(i).freeze() for i in expected_strs[column]] for column in columns}
+    init_from_str_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    decoded = {column: decode_nmmsn_ne_series(encoded[column]) for column in columns}
+    decode_time = time.perf_counter() - start
+    
+    for column in columns:
+        # the generated terms have no irregular whitespace, so the display form is the same as the encoding
+        assert encoded[column].tolist() == expected_strs[column]
+        assert decoded[column].tolist() == expected_frozen[column] == frozen_columns[column].tolist()
+    
+    print(f'{n_cells} cells')
+    print(f'encode: str per cell {str_time:.3f} s, bulk {encode_time:.3f} s ({str_time / encode_time:.2f}x)')
+    print(f'decode: init_from_str per cell {init_from_str_time:.3f} s, bulk {decode_time:.3f} s ({init_from_str_time / decode_time:.2f}x)')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
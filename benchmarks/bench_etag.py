@@ -0,0 +1,54 @@
+"""
+Benchmark the `/api/name` response cache (`shennongname.flask.cache`) on repeated requests, as a front-end re-requesting the names on every page view: the same name elements are posted `n_views` times through the Flask test client, without cache, with the in-process cache, with the shared SQLite cache only, and with `If-None-Match` (304 without body).
+
+Usage
+-----
+python benchmarks/bench_etag.py [n_records] [n_views]
+"""
+import sys
+import tempfile
+import time
+
+from bench_batch import generate_catalogue
+from flask import Flask
+from shennongname.flask.blueprint.snn import ApiSnn, blueprint_snn
+from shennongname.flask.cache import ResponseCache
+
+
+def bench(name: str, client, bodies: list[bytes], n_views: int, baseline: float | None = None, etags: list[str] | None = None) -> float:
+    start = time.perf_counter()
+    for _ in range(n_views):
+        for i, body in enumerate(bodies):
+            headers = {'If-None-Match': etags[i]} if etags else {}
+            response = client.post('/api/name', data=body, content_type='application/json', headers=headers)
+            assert response.status_code == (304 if etags else 200)
+    elapsed = time.perf_counter() - start
+    n = len(bodies) * n_views
+    speedup = f', {baseline / elapsed:.2f}x' if baseline else ''
+    print(f'{name}: {elapsed:.2f} s ({elapsed / n * 1e6:.0f} us/request{speedup})')
+    return elapsed
+
+
+def main(n: int = 1000, n_views: int = 5):
+    bodies = [i.model_dump_json().encode('utf-8') for i in generate_catalogue(n, seed=1)]
+    app = Flask(__name__)
+    app.register_blueprint(blueprint_snn)
+    client = app.test_client()
+    print(f'{n} records x {n_views} views')
+    
+    ApiSnn.response_cache = None
+    baseline = bench('no cache', client, bodies, n_views)
+    
+    ApiSnn.response_cache = ResponseCache(maxsize=n)
+    bench('in-process cache', client, bodies, n_views, baseline)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ApiSnn.response_cache = ResponseCache(maxsize=0, sqlite_path=f'{tmp_dir}/cache.sqlite3')
+        bench('SQLite cache only', client, bodies, n_views, baseline)
+    
+    etags = [client.post('/api/name', data=body, content_type='application/json').headers['ETag'] for body in bodies]
+    bench('If-None-Match (304)', client, bodies, n_views, baseline, etags)
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,85 @@
+"""
+Throughput of the Flask server under gunicorn (`shennongname.flask.gunicorn_conf`) with a few launch profiles, against the Flask development server (`shennongname.flask.run`).
+
+Every server is started in its own process and loaded by the load generator of `bench_asgi.py` (`concurrency` connections, one name element per request). The memory of a server is the proportional set size (PSS) of the master and its workers, so that the pages shared by copy-on-write (with `preload_app`) are only counted once (Linux only).
+
+Usage
+-----
+python benchmarks/bench_gunicorn.py [n_requests] [concurrency] [workers]
+"""
+import asyncio
+import os
+from pathlib import Path
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+from bench_asgi import free_port, generate_load, wait_for_server
+from bench_batch import generate_catalogue
+
+
+def get_process_tree(pid: int) -> list[int]:
+    pids = [pid]
+    for children in Path(f'/proc/{pid}/task').glob('*/children'):
+        for child in children.read_text().split():
+            pids += get_process_tree(int(child))
+    return pids
+
+
+def get_pss_mib(pid: int) -> float | None:
+    '''
+    The total PSS of a process and its children, None if it is not available.
+    '''
+    total = 0
+    try:
+        for i in get_process_tree(pid):
+            for line in Path(f'/proc/{i}/smaps_rollup').read_text().splitlines():
+                if line.startswith('Pss:'):
+                    total += int(line.split()[1])
+    except OSError:
+        return None
+    return total / 1024
+
+
+def bench(name: str, command: list[str], env: dict[str, str], bodies: list[bytes], concurrency: int) -> None:
+    port = free_port()
+    process = subprocess.Popen(
+        command,
+        env={**os.environ, **env, 'PORT': str(port), 'DEBUG': 'False'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_for_server(port))
+        # warm up the workers
+        asyncio.run(generate_load(port, bodies[:concurrency * 4], concurrency))
+        elapsed, latencies = asyncio.run(generate_load(port, bodies, concurrency))
+        pss = get_pss_mib(process.pid)
+    finally:
+        process.send_signal(signal.SIGINT)
+        process.wait()
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    memory = f', memory {pss:.0f} MiB' if pss is not None else ''
+    print(f'{name}: {len(bodies) / elapsed:.0f} requests/s, latency median {statistics.median(latencies) * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms{memory}')
+
+
+def main(n: int = 5000, concurrency: int = 32, workers: int = os.cpu_count() or 1):
+    bodies = [i.model_dump_json().encode('utf-8') for i in generate_catalogue(n, seed=1)]
+    print(f'{n} requests, {concurrency} connections, {os.cpu_count()} CPUs')
+    
+    bench('Flask development server', [sys.executable, '-m', 'shennongname.flask.run'], {}, bodies, concurrency)
+    gunicorn = [sys.executable, '-m', 'gunicorn', '-c', 'python:shennongname.flask.gunicorn_conf', 'shennongname.flask.run:app']
+    profiles = [
+        (f'gunicorn, {workers} workers x 2 threads, preload (default)', {}),
+        (f'gunicorn, {workers} workers x 2 threads, no preload', {'GUNICORN_PRELOAD_APP': 'False'}),
+        (f'gunicorn, {workers} sync workers, preload', {'GUNICORN_THREADS': '1'}),
+    ]
+    for name, env in profiles:
+        bench(name, gunicorn, {'GUNICORN_WORKERS': str(workers), **env}, bodies, concurrency)
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,44 @@
+"""
+Benchmark the cold start time of `python -c "import shennongname.snnmma.algorithm"` (and other modules).
+
+The time of `python -c "pass"` is subtracted, so that only the import time is reported.
+
+Usage
+-----
+python benchmarks/bench_import.py [n_runs] [module ...]
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+
+DEFAULT_MODULES = [
+    'shennongname.snnmma.algorithm',
+    'shennongname.snnmma.model',
+    'shennongname.cli',
+]
+
+
+def time_command(code: str, n_runs: int) -> float:
+    times = []
+    for _ in range(n_runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    n_runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    modules = sys.argv[2:] or DEFAULT_MODULES
+    
+    baseline = time_command('pass', n_runs)
+    print(f'python -c "pass": {baseline * 1000:.1f} ms (median of {n_runs} runs)')
+    for module in modules:
+        import_time = time_command(f'import {module}', n_runs) - baseline
+        print(f'import {module}: {import_time * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
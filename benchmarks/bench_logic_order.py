@@ -0,0 +1,76 @@
+"""
+Benchmark `NmmsnNeData.logic_order` (single grouping pass and one sort) against the implementation it replaced, over long `and`/`or` chains.
+
+Usage
+-----
+python benchmarks/bench_logic_order.py [chain_length] [n_chains]
+"""
+import random
+import sys
+import time
+
+from shennongname.snnmma.algorithm import NmmsnNeData
+
+
+def reference_logic_order(pairs: tuple, ops: tuple, based_on_str_pair_index: int = 0, exclude_and: bool = False) -> tuple:
+    # the implementation replaced: groups, sets, sorts, tuples, set of groups, sort, operators re-inserted
+    tuple_lst = [pairs[0]]
+    for op, pair in zip(ops, pairs[1:]):
+        tuple_lst += [op, pair]
+    groups = []
+    group = []
+    for item in tuple_lst:
+        if item == 'or':
+            groups.append(group)
+            group = []
+        elif item != 'and':
+            group.append(item)
+    groups.append(group)
+    new_groups = []
+    if exclude_and:
+        new_groups = groups
+    else:
+        for group in groups:
+            group = list(set(group))
+            group.sort(key=lambda x: x[based_on_str_pair_index])
+            new_groups.append(group)
+    new_groups = [list(x) for x in set(tuple(i) for i in new_groups)]
+    new_groups.sort(key=lambda x: x[0][based_on_str_pair_index])
+    sorted_lst = []
+    for group in new_groups:
+        for pair in group:
+            sorted_lst += [pair, 'and']
+        sorted_lst[-1] = 'or'
+    sorted_lst.pop()
+    return tuple(sorted_lst[0::2]), tuple(sorted_lst[1::2])
+
+
+def generate_chain(rng: random.Random, length: int) -> list:
+    # one-to-one pairs, the chain is repeated once, so that every group is duplicated
+    chain = []
+    for i in rng.sample(range(length * 10), length // 2):
+        chain += [[f'term {i}', f'术语{i}'], rng.choice(['and', 'or'])]
+    return chain[:-1] + ['or'] + chain[:-1]
+
+
+def main(length: int = 200, n: int = 500):
+    rng = random.Random(0)
+    ne_datas = [NmmsnNeData(generate_chain(rng, length)) for _ in range(n)]
+    
+    start = time.perf_counter()
+    expected = [reference_logic_order(ne_data.pairs, ne_data.ops) for ne_data in ne_datas]
+    reference_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = [ne_data.canonical_key() for ne_data in ne_datas]
+    new_time = time.perf_counter() - start
+    
+    assert result == expected
+    print(f'{n} chains of {length} pairs')
+    print(f'reference:   {reference_time:.3f} s')
+    print(f'logic_order: {new_time:.3f} s')
+    print(f'speedup: {reference_time / new_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
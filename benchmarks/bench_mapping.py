@@ -0,0 +1,63 @@
+"""
+Benchmark the indexed `Mapping` on a term dictionary: building it, and keeping its mapping type up to date while items are added, against rebuilding the `defaultdict(set)` indexes of the previous implementation after every update.
+
+Usage
+-----
+python benchmarks/bench_mapping.py [n_items] [n_updates]
+"""
+import random
+import sys
+import time
+from collections import defaultdict
+
+from shennongname.snnmma.algorithm import Mapping
+
+
+def reference_mapping_type(mapping: list[tuple[str, str]]) -> str:
+    # the previous implementation: sort the unique items, then rebuild the indexes
+    mapping = sorted(set(mapping))
+    if len(mapping) == 0:
+        return 'nn'
+    keys_to_values = defaultdict(set)
+    values_to_keys = defaultdict(set)
+    for key, value in mapping:
+        keys_to_values[key].add(value)
+        values_to_keys[value].add(key)
+    one_to_multi = any(len(values) > 1 for values in keys_to_values.values())
+    multi_to_one = any(len(keys) > 1 for keys in values_to_keys.values())
+    return {(False, False): 'oo', (True, False): 'om', (False, True): 'mo', (True, True): 'mm'}[(one_to_multi, multi_to_one)]
+
+
+def generate_term_dictionary(n: int, seed: int = 0) -> list[tuple[str, str]]:
+    # nonstandard -> standard terms, about 3 nonstandard terms per standard term
+    rng = random.Random(seed)
+    return [(f'nonstandard term {i}', f'standard term {rng.randrange(n // 3)}') for i in range(n)]
+
+
+def main(n: int = 100000, n_updates: int = 20):
+    items = generate_term_dictionary(n)
+    updates = [(f'new term {i}', f'standard term {i}') for i in range(n_updates)]
+    
+    start = time.perf_counter()
+    mapping = Mapping(items)
+    build_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    reference_types = []
+    for update in updates:
+        items.append(update)
+        reference_types.append(reference_mapping_type(items))
+    reference_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    types = [mapping.add(*update).mapping_type for update in updates]
+    indexed_time = time.perf_counter() - start
+    
+    assert types == reference_types
+    print(f'{n} items, built in {build_time:.3f} s')
+    print(f'{n_updates} updates, rebuilding the indexes: {reference_time:.3f} s')
+    print(f'{n_updates} updates, incremental:            {indexed_time * 1e3:.3f} ms')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
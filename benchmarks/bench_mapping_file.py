@@ -0,0 +1,59 @@
+"""
+Benchmark loading a term dictionary from a memory-mapped mapping file (`MappedMapping`) against building a `Mapping` from Python tuples, and compare their lookups and memory.
+
+Usage
+-----
+python benchmarks/bench_mapping_file.py [n_items]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from bench_mapping import generate_term_dictionary
+from shennongname.snnmma.algorithm import Mapping
+from shennongname.snnmma.mapping_file import MappedMapping, save_mapping
+
+
+def main(n: int = 100000):
+    items = generate_term_dictionary(n)
+    keys = [key for key, _ in items[::10]]
+    
+    tracemalloc.start()
+    start = time.perf_counter()
+    mapping = Mapping(items)
+    build_time = time.perf_counter() - start
+    build_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'mapping.bin')
+        start = time.perf_counter()
+        save_mapping(mapping, path)
+        save_time = time.perf_counter() - start
+        
+        tracemalloc.start()
+        start = time.perf_counter()
+        mapped_mapping = MappedMapping(path)
+        load_time = time.perf_counter() - start
+        load_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        
+        start = time.perf_counter()
+        expected = [mapping.get_values(key) for key in keys]
+        mapping_lookup_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        result = [mapped_mapping.get_values(key) for key in keys]
+        mapped_lookup_time = time.perf_counter() - start
+        
+        assert result == expected
+        print(f'{n} items, mapping file of {os.path.getsize(path) / 1e6:.1f} MB written in {save_time:.3f} s')
+        print(f'Mapping:       built in {build_time * 1e3:8.1f} ms, {build_memory / 1e6:5.1f} MB of Python objects, {len(keys) / mapping_lookup_time:9.0f} lookups/s')
+        print(f'MappedMapping: loaded in {load_time * 1e3:7.1f} ms, {load_memory / 1e6:5.1f} MB of Python objects, {len(keys) / mapped_lookup_time:9.0f} lookups/s')
+        mapped_mapping.close()
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,61 @@
+"""
+Measure the memory per record of the name element lists, in the list form (`NmmsnNeList`) and in the compact form of `NmmsnNeData` (tuples of interned terms), with `tracemalloc`.
+
+The records are parsed from strings, as in `shennongname.snnmma.pipeline`, so that the terms of different records are distinct str objects.
+
+Usage
+-----
+python benchmarks/bench_memory.py [n_records]
+"""
+import sys
+import tracemalloc
+
+from bench_batch import generate_catalogue
+from shennongname.snnmma.algorithm import NmmsnNeData, split_sentence_by_words
+
+
+def ne_strs(n: int) -> list[str]:
+    strs = []
+    for nmmsn_ne in generate_catalogue(n):
+        for ne_list in [nmmsn_ne.species_origins, nmmsn_ne.medicinal_parts, nmmsn_ne.processing_methods]:
+            strs.append(str(NmmsnNeData(ne_list)))
+    return strs
+
+
+def parse_list_form(s: str) -> list:
+    '''Parse a string to the cleaned list form, as `NmmsnNeData` used to keep it (no interning).'''
+    nmmsn_ne_list = []
+    for i in split_sentence_by_words(f' {s} ', [' or ', ' and '], keep_sep=True):
+        if '|' in i:
+            nmmsn_ne_list.append([j.strip() for j in i.split('|')])
+        else:
+            nmmsn_ne_list.append(i.strip().lower())
+    return nmmsn_ne_list
+
+
+def measure(build, strs: list[str]) -> float:
+    '''Return the memory (bytes) held by the records built from `strs`.'''
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = build(strs)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return after - before
+
+
+def main(n: int = 20000):
+    strs = ne_strs(n)
+    # warm up the caches (split patterns, etc.), so that they are not counted
+    NmmsnNeData.init_from_str(strs[0])
+    
+    list_bytes = measure(lambda strs: [parse_list_form(s) for s in strs], strs)
+    compact_bytes = measure(lambda strs: [NmmsnNeData.init_from_str(s) for s in strs], strs)
+    
+    print(f'{len(strs)} name element lists')
+    print(f'list form:    {list_bytes / len(strs):7.1f} bytes/record')
+    print(f'compact form: {compact_bytes / len(strs):7.1f} bytes/record ({list_bytes / compact_bytes:.1f}x smaller)')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
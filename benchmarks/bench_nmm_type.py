@@ -0,0 +1,60 @@
+"""
+Benchmark the NMM type classification (`is_pafa_pro()` and `is_pro()`, as called by `construct_nmmsn` for every record) with the cached `get_nmm_type` and the lookup table, against the previous `NmmType`, which normalized the raw string and scanned the label lists on every call.
+
+Usage
+-----
+python benchmarks/bench_nmm_type.py [n_records]
+"""
+import random
+import sys
+import time
+
+from shennongname.snnmma.algorithm import NmmType, get_nmm_type
+
+
+class ReferenceNmmType:
+    def __init__(self, nmm_type: str):
+        self.nmm_type = nmm_type.strip().lower().replace("-", "_")
+    
+    def is_pafa(self) -> bool:
+        return self.nmm_type in NmmType.PAFA
+        
+    def is_pro(self) -> bool:
+        return self.nmm_type in NmmType.PROCESSED
+    
+    def is_pafa_pro(self) -> bool:
+        return self.is_pafa() or self.is_pro()
+
+
+def reference_classify(nmm_type: str) -> tuple[bool, bool]:
+    nmm_type_cls = ReferenceNmmType(nmm_type)
+    return nmm_type_cls.is_pafa_pro(), nmm_type_cls.is_pro()
+
+
+def classify(nmm_type: str) -> tuple[bool, bool]:
+    nmm_type_cls = get_nmm_type(nmm_type)
+    return nmm_type_cls.is_pafa_pro(), nmm_type_cls.is_pro()
+
+
+def main(n: int = 1000000):
+    rng = random.Random(0)
+    labels = ['plant', 'Plant', 'animal', 'algal', 'processed', 'Processed ', '炮制药', '植物药', 'mineral', 'unknown']
+    nmm_types = [rng.choice(labels) for _ in range(n)]
+    
+    start = time.perf_counter()
+    expected = [reference_classify(i) for i in nmm_types]
+    reference_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = [classify(i) for i in nmm_types]
+    lookup_time = time.perf_counter() - start
+    
+    assert result == expected
+    print(f'{n} records')
+    print(f'previous NmmType: {reference_time:.3f} s')
+    print(f'cached lookup:    {lookup_time:.3f} s')
+    print(f'speedup: {reference_time / lookup_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
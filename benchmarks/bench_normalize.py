@@ -0,0 +1,67 @@
+"""
+Micro-benchmark the single-pass normalizers of `shennongname.snnmma.normalize` against the per-character loops they replace.
+
+Usage
+-----
+python benchmarks/bench_normalize.py [n_repeats]
+"""
+import re
+import sys
+import timeit
+
+from shennongname.snnmma.normalize import (
+    is_printable_ascii,
+    replace_non_printable_ascii,
+    replace_non_alphabet_and_hyphen_and_space,
+)
+
+
+STRINGS = [
+    'Ephedra equisetina vel intermedia vel sinica',
+    'Ephedra sinica × intermedia',
+    'Herbaceous-stem or Rhizome and Root',
+    '蒸制炒制鲜或干木贼麻黄或中麻黄或草麻黄草质茎或根茎与根',
+    'Strobilanthes cusia （原）板蓝',
+]
+
+
+def loop_char_is_printable_ascii(c: str) -> bool:
+    return ord(c) < 128 and ord(c) >= 32
+
+
+def loop_char_is_alphabet_and_hyphen_and_space(c: str) -> bool:
+    return c.isalpha() or c == "-" or c == " "
+
+
+def loop_is_printable_ascii(s: str) -> bool:
+    return all(loop_char_is_printable_ascii(c) for c in s)
+
+
+def loop_replace_non_printable_ascii(s: str, replacement: str = "") -> str:
+    s = "".join([c if loop_char_is_printable_ascii(c) else replacement for c in s])
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def loop_replace_non_alphabet_and_hyphen_and_space(s: str, replacement: str = "") -> str:
+    s = "".join([c if loop_char_is_alphabet_and_hyphen_and_space(c) else replacement for c in s])
+    s = re.sub(r"\s+", " ", s)
+    s = re.sub(r"-+", "-", s)
+    return s.strip()
+
+
+def main():
+    n_repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    pairs = [
+        ('is_printable_ascii', loop_is_printable_ascii, is_printable_ascii),
+        ('replace_non_printable_ascii', loop_replace_non_printable_ascii, replace_non_printable_ascii),
+        ('replace_non_alphabet_and_hyphen_and_space', loop_replace_non_alphabet_and_hyphen_and_space, replace_non_alphabet_and_hyphen_and_space),
+    ]
+    for name, loop_func, single_pass_func in pairs:
+        assert [loop_func(s) for s in STRINGS] == [single_pass_func(s) for s in STRINGS]
+        loop_time = timeit.timeit(lambda: [loop_func(s) for s in STRINGS], number=n_repeats)
+        single_pass_time = timeit.timeit(lambda: [single_pass_func(s) for s in STRINGS], number=n_repeats)
+        print(f'{name}: loop {loop_time:.3f} s, single pass {single_pass_time:.3f} s, speedup {loop_time / single_pass_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Benchmark the scaling of `NmmsnProcessPool` with the number of worker processes.
+
+Usage
+-----
+python benchmarks/bench_parallel.py [n_records] [max_jobs]
+"""
+import os
+import sys
+import time
+
+from bench_batch import generate_catalogue
+
+from shennongname.snnmma.parallel import NmmsnProcessPool
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    max_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    # a catalogue with little repetition, so that the work is CPU-bound
+    catalogue = generate_catalogue(n, seed=1)
+    
+    base_rate = None
+    jobs = 1
+    while jobs <= max_jobs:
+        with NmmsnProcessPool(jobs=jobs, chunksize=1000) as pool:
+            start = time.perf_counter()
+            n_results = sum(1 for _ in pool.construct_nmmsn(catalogue))
+            elapsed = time.perf_counter() - start
+        rate = n_results / elapsed
+        base_rate = base_rate or rate
+        print(f'jobs: {jobs:3d}  {rate:10.0f} records/s  scaling: {rate / base_rate:.2f}x')
+        jobs *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""
+Benchmark `NmmsnNeData.init_from_str` (single split, compact form built directly) against the previous path (`split_sentence_by_words`, `str.split('|')`, then cleaning the list), on the name element cells of a catalogue.
+
+Usage
+-----
+python benchmarks/bench_parse.py [n_records]
+"""
+import sys
+import time
+
+from bench_batch import generate_catalogue
+from shennongname.snnmma.algorithm import NmmsnNeData, split_sentence_by_words
+
+
+def reference_init_from_str(nmmsn_ne_str: str) -> NmmsnNeData:
+    if nmmsn_ne_str.strip() == '':
+        return NmmsnNeData([])
+    nmmsn_ne_list = split_sentence_by_words(f' {nmmsn_ne_str} ', [' or ', ' and '], keep_sep=True)
+    return NmmsnNeData([i.split('|') if '|' in i else i for i in nmmsn_ne_list])
+
+
+def main(n: int = 50000):
+    cells = []
+    for nmmsn_ne in generate_catalogue(n):
+        for ne_list in [nmmsn_ne.species_origins, nmmsn_ne.medicinal_parts, nmmsn_ne.special_descriptions, nmmsn_ne.processing_methods]:
+            # spreadsheet cells come with irregular spaces
+            cells.append(str(NmmsnNeData(ne_list)).replace(' | ', '|'))
+    
+    start = time.perf_counter()
+    expected = [reference_init_from_str(cell).freeze() for cell in cells]
+    reference_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = [NmmsnNeData.init_from_str(cell).freeze() for cell in cells]
+    tokenizer_time = time.perf_counter() - start
+    
+    assert result == expected
+    print(f'{len(cells)} cells')
+    print(f'previous path: {reference_time:.3f} s ({len(cells) / reference_time:.0f} cells/s)')
+    print(f'tokenizer:     {tokenizer_time:.3f} s ({len(cells) / tokenizer_time:.0f} cells/s)')
+    print(f'speedup: {reference_time / tokenizer_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,39 @@
+"""
+Benchmark `PinyinEngine.convert` against `convert_to_pinyin`.
+
+Usage
+-----
+python benchmarks/bench_pinyin.py [n_records]
+"""
+import sys
+import time
+
+from bench_batch import generate_catalogue
+
+from shennongname.snnmma.algorithm import construct_nmmsn_batch, convert_to_pinyin
+from shennongname.snnmma.pinyin import PinyinEngine
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nmmsn_zh_list = [i.nmmsn.nmmsn_zh.zh for i in construct_nmmsn_batch(generate_catalogue(n)) if i.success] # type: ignore
+    
+    start = time.perf_counter()
+    expected = [convert_to_pinyin(i) for i in nmmsn_zh_list]
+    pypinyin_time = time.perf_counter() - start
+    
+    engine = PinyinEngine()
+    start = time.perf_counter()
+    results = [engine.convert(i) for i in nmmsn_zh_list]
+    engine_time = time.perf_counter() - start
+    
+    assert results == expected
+    n = len(nmmsn_zh_list)
+    print(f'names: {n}')
+    print(f'convert_to_pinyin:     {pypinyin_time:.3f} s ({n / pypinyin_time:.0f} names/s)')
+    print(f'PinyinEngine.convert:  {engine_time:.3f} s ({n / engine_time:.0f} names/s)')
+    print(f'speedup: {pypinyin_time / engine_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the per-request overhead of building and serializing the `construct_nmmsn` output: the trusted construction (`DeferredBuildModel.construct_trusted`) and `dump_json_bytes`, against validating the nested dict (`model_validate`), `model_dump` and `json.dumps` (as `jsonify` does).
+
+The NMMSNs are constructed once beforehand (with `NmmsnBatchPipes`), so only the output stage is timed.
+
+Usage
+-----
+python benchmarks/bench_response.py [n_records]
+"""
+import json
+import sys
+import time
+
+from bench_batch import generate_catalogue
+from shennongname.snnmma.algorithm import construct_nmmsn_batch
+from shennongname.snnmma.model import SnnmmaOutputSuccess, Nmmsn, NmmsnZh, NmmsnNameElement, dump_json_bytes
+
+
+def build_validated(data: dict) -> bytes:
+    output = SnnmmaOutputSuccess.model_validate(data)
+    return json.dumps(output.model_dump(), sort_keys=True).encode('utf-8')
+
+
+def build_trusted(data: dict) -> bytes:
+    nmmsn = data['nmmsn']
+    output = SnnmmaOutputSuccess.construct_trusted(
+        success=True,
+        error_msg=data['error_msg'],
+        error_msg_en_zh=data['error_msg_en_zh'],
+        nmmsn=Nmmsn.construct_trusted(
+            nmmsn=nmmsn['nmmsn'],
+            nmmsn_zh=NmmsnZh.construct_trusted(**nmmsn['nmmsn_zh']),
+            nmmsn_name_element=NmmsnNameElement.construct_trusted(**nmmsn['nmmsn_name_element']),
+            nmmsn_seq=nmmsn['nmmsn_seq'],
+        ),
+    )
+    return dump_json_bytes(output)
+
+
+def main(n: int = 20000):
+    outputs = [i for i in construct_nmmsn_batch(generate_catalogue(n)) if i.success]
+    # the pieces computed by `construct_nmmsn`, the EnZh model is kept as it is
+    datas = []
+    for output in outputs:
+        data = output.model_dump()
+        data['error_msg_en_zh'] = output.error_msg_en_zh
+        datas.append(data)
+    
+    start = time.perf_counter()
+    expected = [build_validated(i) for i in datas]
+    validated_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = [build_trusted(i) for i in datas]
+    trusted_time = time.perf_counter() - start
+    
+    assert [json.loads(i) for i in result] == [json.loads(i) for i in expected]
+    print(f'{len(datas)} outputs')
+    print(f'model_validate + model_dump + json.dumps: {validated_time:.3f} s ({validated_time / len(datas) * 1e6:.1f} us/request)')
+    print(f'construct_trusted + dump_json_bytes:      {trusted_time:.3f} s ({trusted_time / len(datas) * 1e6:.1f} us/request)')
+    print(f'speedup: {validated_time / trusted_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,59 @@
+"""
+Benchmark `detect_species_inclusion` (trie-based `SpeciesIndex`) against the quadratic `startswith` scan it replaced.
+
+Usage
+-----
+python benchmarks/bench_species.py [n_species]
+"""
+import random
+import sys
+import time
+
+from shennongname.snnmma.algorithm import detect_species_inclusion
+
+
+def quadratic_detect_species_inclusion(species_list: list[str]) -> tuple[bool, list[str]]:
+    species_list = sorted([' '.join(species.split()) for species in species_list], key=len)
+    highest_level_species = []
+    inclusion_detected = False
+    for species in species_list:
+        if not any(species.lower().startswith(higher_species.lower()) for higher_species in highest_level_species):
+            highest_level_species.append(species)
+        else:
+            inclusion_detected = True
+    return inclusion_detected, sorted(highest_level_species)
+
+
+def generate_species(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    genera = [f'Genus{i}' for i in range(max(n // 50, 1))]
+    species_list = []
+    for _ in range(n):
+        species = f'{rng.choice(genera)} epithet{rng.randrange(20)}'
+        if rng.random() < 0.7:
+            species += f' {rng.choice(["var.", "subsp.", "f."])} infra{rng.randrange(1000)}'
+        species_list.append(species)
+    return species_list
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    species_list = generate_species(n)
+    
+    start = time.perf_counter()
+    expected = quadratic_detect_species_inclusion(species_list)
+    quadratic_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = detect_species_inclusion(species_list)
+    trie_time = time.perf_counter() - start
+    
+    assert result == expected
+    print(f'species: {n}, highest level species: {len(result[1])}')
+    print(f'quadratic scan: {quadratic_time:.3f} s')
+    print(f'SpeciesIndex:   {trie_time:.3f} s')
+    print(f'speedup: {quadratic_time / trie_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark `TermStandardizer.standardize_series` against a per-cell loop, on a large term dictionary and a column with millions of (repetitive) cells.
+
+Usage
+-----
+python benchmarks/bench_standardize.py [n_cells] [n_terms]
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+from bench_mapping import generate_term_dictionary
+from shennongname.snnmma.algorithm import Mapping
+from shennongname.snnmma.standardize import TermStandardizer
+
+
+def main(n_cells: int = 2000000, n_terms: int = 100000):
+    rng = random.Random(0)
+    items = generate_term_dictionary(n_terms)
+    
+    start = time.perf_counter()
+    standardizer = TermStandardizer(Mapping(items))
+    load_time = time.perf_counter() - start
+    
+    # a catalogue uses a small part of the dictionary, with some unknown terms and some multi-term cells
+    vocabulary = [key for key, _ in rng.sample(items, 5000)] + [f'unknown term {i}' for i in range(100)]
+    vocabulary += [f'{rng.choice(vocabulary)}; {rng.choice(vocabulary)}' for _ in range(100)]
+    series = pd.Series([rng.choice(vocabulary) for _ in range(n_cells)])
+    
+    start = time.perf_counter()
+    expected = series.map(standardizer.standardize)
+    loop_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    result = standardizer.standardize_series(series)
+    vectorized_time = time.perf_counter() - start
+    
+    assert result.equals(expected)
+    print(f'mapping of {n_terms} terms loaded in {load_time:.3f} s')
+    print(f'per-cell loop: {loop_time:.3f} s ({n_cells / loop_time:.0f} cells/s)')
+    print(f'vectorized:    {vectorized_time:.3f} s ({n_cells / vectorized_time:.0f} cells/s)')
+    print(f'speedup: {loop_time / vectorized_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
@@ -0,0 +1,70 @@
+"""
+Benchmark the fused validate-and-clean pass of `NmmsnNeData` against the separate passes it replaced (clean, pattern validation, then `validate_empty`, `validate_only_and_or_only_or` and `validate_oo_mapping_type` with a `Mapping`).
+
+Usage
+-----
+python benchmarks/bench_validate.py [n_records]
+"""
+import sys
+import time
+
+from bench_batch import generate_catalogue
+from shennongname.snnmma.algorithm import NmmsnNeData, Mapping
+
+
+def reference_validate(nmmsn_ne_list: list) -> list:
+    new_nmmsn_ne_list = []
+    for i in nmmsn_ne_list:
+        if isinstance(i, list):
+            if len(i) != 2:
+                raise ValueError('length')
+            temp = [j.strip() for j in i]
+            if not any(j == '' for j in temp):
+                new_nmmsn_ne_list.append(temp)
+        elif isinstance(i, str):
+            temp = i.strip().lower()
+            if temp == '' or temp not in NmmsnNeData.AVAIL_LOGIC_OPERATOR:
+                raise ValueError('operator')
+            new_nmmsn_ne_list.append(temp)
+        else:
+            raise ValueError('type')
+    if new_nmmsn_ne_list:
+        if isinstance(new_nmmsn_ne_list[0], str) or isinstance(new_nmmsn_ne_list[-1], str):
+            raise ValueError('first and last')
+        if len(new_nmmsn_ne_list) % 2 == 0:
+            raise ValueError('odd')
+        psudo_input_data = new_nmmsn_ne_list + ['']
+        for i in range(0, len(psudo_input_data), 2):
+            if not isinstance(psudo_input_data[i], list) or not isinstance(psudo_input_data[i+1], str):
+                raise ValueError('pattern')
+    if not new_nmmsn_ne_list:
+        raise ValueError('empty')
+    if 'and' in new_nmmsn_ne_list and 'or' in new_nmmsn_ne_list:
+        raise ValueError('and or')
+    map_pairs = Mapping([tuple(i) for i in new_nmmsn_ne_list if isinstance(i, list)]).mapping
+    if Mapping(map_pairs).verify_mapping_type() != 'oo':
+        raise ValueError('oo')
+    return new_nmmsn_ne_list
+
+
+def main(n: int = 20000):
+    ne_lists = [nmmsn_ne.species_origins for nmmsn_ne in generate_catalogue(n)]
+    
+    start = time.perf_counter()
+    for ne_list in ne_lists:
+        reference_validate(ne_list)
+    reference_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for ne_list in ne_lists:
+        NmmsnNeData(ne_list, validate_empty=True, validate_only_and_or_only_or=True, validate_oo_mapping_type=True)
+    fused_time = time.perf_counter() - start
+    
+    print(f'{n} species origins')
+    print(f'separate passes: {reference_time:.3f} s')
+    print(f'fused pass:      {fused_time:.3f} s')
+    print(f'speedup: {reference_time / fused_time:.2f}x')
+
+
+if __name__ == '__main__':
+    main(*[int(i) for i in sys.argv[1:]])
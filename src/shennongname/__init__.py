@@ -0,0 +1,4 @@
+def main() -> int:
+    # Imported here, so that `import shennongname` stays lightweight.
+    from shennongname.cli import main
+    return main()
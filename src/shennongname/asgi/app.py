@@ -0,0 +1,194 @@
+'''
+ASGI application of the `/api/name` endpoint, the asynchronous counterpart of `shennongname.flask.blueprint.snn`.
+
+The event loop only receives and sends the HTTP messages. The CPU-bound work (validation of the name element, `construct_nmmsn` and serialization) is offloaded to a bounded pool of worker processes, so that a single process serves many concurrent connections while the NMMSNs are constructed in parallel. At most `max_concurrency` requests are submitted to the pool at once, the other requests wait in the event loop without holding a worker.
+
+The application only depends on the standard library. It can be served by any ASGI server, e.g., uvicorn (the `asgi` extra): `uvicorn shennongname.asgi.run:app` or `python -m shennongname.asgi.run`.
+
+Examples
+--------
+>>> import uvicorn
+>>> app = NmmsnAsgiApp(max_workers=4)
+>>> uvicorn.run(app, host='0.0.0.0', port=5001)
+'''
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import logging
+import os
+from typing import Any, Awaitable, Callable
+
+from shennongname.snnmma.algorithm import construct_nmmsn
+from shennongname.snnmma.model import NmmsnNameElement, build_fail_output, dump_json_bytes
+from shennongname.snnmma.parallel import warm_up_worker
+
+
+logger = logging.getLogger(__name__)
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+API_SNN = '/api/name'
+JSON_CONTENT_TYPE = b'application/json'
+TEXT_CONTENT_TYPE = b'text/plain; charset=utf-8'
+
+
+def handle_name_request(body: bytes) -> tuple[int, bytes]:
+    '''
+    Construct the NMMSN of a JSON request body, and return the status and the JSON response body. It is run in the worker processes, so that only bytes are sent between the processes.
+    '''
+    try:
+        nmmsn_ne = NmmsnNameElement.model_validate_json(body)
+        return 200, dump_json_bytes(construct_nmmsn(nmmsn_ne))
+    except Exception as e:
+        return 400, dump_json_bytes(build_fail_output(str(e)))
+
+
+class NmmsnAsgiApp:
+    '''
+    ASGI application constructing NMMSNs.
+
+    - `GET /api/name`: health check.
+    - `POST /api/name`: construct the NMMSN of a name element (JSON), same as `shennongname.flask.blueprint.snn`. The invalid requests (including the invalid name elements) get the status 400 with a `SnnmmaOutputFail`.
+
+    Parameters
+    ----------
+    executor : Executor | None, optional
+        The pool constructing the NMMSNs. The default is None, which starts a `ProcessPoolExecutor` of `max_workers` processes on first use (or at the ASGI lifespan startup), and starts a new one if a worker process dies. A given executor is not shut down by `close`.
+    max_workers : int | None, optional
+        The number of worker processes of the default executor. The default is None, which uses `os.cpu_count()`.
+    max_concurrency : int | None, optional
+        The number of requests submitted to the executor at once. The default is None, which uses twice the number of workers, so that the workers are kept busy while the results are sent.
+    max_body_size : int, optional
+        The maximum size of a request body in bytes, the larger requests get the status 413. The default is 1 MiB.
+    '''
+    def __init__(
+        self,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+        max_body_size: int = 1 << 20,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_concurrency = max_concurrency or 2 * self.max_workers
+        if self.max_workers < 1:
+            raise ValueError('max_workers should be at least 1.')
+        if self.max_concurrency < 1:
+            raise ValueError('max_concurrency should be at least 1.')
+        self.max_body_size = max_body_size
+        self.executor = executor
+        self.owns_executor = executor is None
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+
+    def get_executor(self) -> Executor:
+        if self.executor is None:
+            # The current process is warmed up first, thus with `fork`, the workers share the loaded dictionaries.
+            warm_up_worker()
+            self.executor = ProcessPoolExecutor(self.max_workers, initializer=warm_up_worker)
+        return self.executor
+
+
+    def reset_executor(self, executor: Executor) -> None:
+        '''
+        Shut down a broken default executor, so that `get_executor` starts a new one. The concurrent requests failing on the same executor only reset it once.
+        '''
+        if self.owns_executor and self.executor is executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+    def close(self) -> None:
+        '''
+        Shut down the default executor.
+        '''
+        if self.owns_executor and self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] == 'http':
+            await self.handle_http(scope, receive, send)
+        elif scope['type'] == 'lifespan':
+            await self.handle_lifespan(receive, send)
+
+
+    async def handle_lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.get_executor()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+    async def handle_http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['path'] != API_SNN:
+            await send_response(send, 404, b'Not Found', TEXT_CONTENT_TYPE)
+            return
+        if scope['method'] == 'GET':
+            await send_response(send, 200, b'ShennongName is working!', TEXT_CONTENT_TYPE)
+            return
+        if scope['method'] != 'POST':
+            await send_response(send, 405, b'Method Not Allowed', TEXT_CONTENT_TYPE, [(b'allow', b'GET, POST')])
+            return
+
+        body = await read_body(receive, self.max_body_size)
+        if body is None:
+            await send_response(send, 413, dump_json_bytes(build_fail_output('The request body is too large.')), JSON_CONTENT_TYPE)
+            return
+
+        executor = self.get_executor()
+        try:
+            async with self.semaphore:
+                status, response = await asyncio.get_running_loop().run_in_executor(executor, handle_name_request, body)
+        except BrokenProcessPool:
+            logger.exception('A worker process of the ASGI application terminated abruptly.')
+            self.reset_executor(executor)
+            status, response = 500, dump_json_bytes(build_fail_output('A worker process terminated abruptly.'))
+        await send_response(send, status, response, JSON_CONTENT_TYPE)
+
+
+async def read_body(receive: Receive, max_body_size: int) -> bytes | None:
+    '''
+    Read the whole request body. Return None if it is larger than `max_body_size`.
+    '''
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > max_body_size:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body', False):
+            break
+    return b''.join(chunks)
+
+
+async def send_response(
+    send: Send,
+    status: int,
+    body: bytes,
+    content_type: bytes,
+    headers: list[tuple[bytes, bytes]] | None = None,
+) -> None:
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', content_type),
+            (b'content-length', str(len(body)).encode('ascii')),
+            *(headers or []),
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
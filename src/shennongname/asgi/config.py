@@ -0,0 +1,12 @@
+import os
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+PORT = int(os.getenv('PORT', 5001))
+# the number of worker processes constructing NMMSNs, 0 for `os.cpu_count()`
+ASGI_WORKERS = int(os.getenv('ASGI_WORKERS', 0))
+# the number of requests sent to the workers at once, 0 for twice the number of workers
+ASGI_MAX_CONCURRENCY = int(os.getenv('ASGI_MAX_CONCURRENCY', 0))
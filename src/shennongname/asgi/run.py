@@ -0,0 +1,11 @@
+from shennongname.asgi.config import PORT, ASGI_WORKERS, ASGI_MAX_CONCURRENCY
+from shennongname.asgi.app import NmmsnAsgiApp
+
+
+app = NmmsnAsgiApp(max_workers=ASGI_WORKERS or None, max_concurrency=ASGI_MAX_CONCURRENCY or None)
+
+
+if __name__ == '__main__':
+    # uvicorn is the `asgi` extra, only required to serve the application
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=PORT)
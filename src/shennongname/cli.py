@@ -0,0 +1,84 @@
+'''
+Command line interface of ShennongName.
+
+Name the NMMs in JSONL files (or stdin), one `NmmsnNameElement` per line, and write the results to a JSONL file (or stdout), one `SnnmmaOutputSuccess` or `SnnmmaOutputFail` per line, in the same order:
+```shell
+shennongname catalogue.jsonl -o catalogue_named.jsonl --jobs 8
+cat catalogue.jsonl | shennongname > catalogue_named.jsonl
+```
+'''
+
+import argparse
+from collections.abc import Iterator
+from contextlib import ExitStack
+import sys
+import time
+
+from shennongname.snnmma.algorithm import construct_nmmsn_batch
+from shennongname.snnmma.parallel import NmmsnProcessPool
+from shennongname.snnmma.model import NmmsnNameElement, build_fail_output
+
+
+def name_jsonl_lines(lines: list[str]) -> list[str]:
+    '''
+    Name the NMMs of JSONL lines and return the results as JSON strings. A line which is not a valid `NmmsnNameElement` gets a `SnnmmaOutputFail` result.
+    '''
+    results: list[str | None] = []
+    nmmsn_nes: list[NmmsnNameElement] = []
+    for line in lines:
+        try:
+            nmmsn_nes.append(NmmsnNameElement.model_validate_json(line))
+            results.append(None)
+        except Exception as e:
+            results.append(build_fail_output(str(e)).model_dump_json())
+    
+    nmmsn_results = iter(construct_nmmsn_batch(nmmsn_nes))
+    return [
+        result if result is not None else next(nmmsn_results).model_dump_json()
+        for result in results
+    ]
+
+
+def read_lines(input_paths: list[str]) -> Iterator[str]:
+    if not input_paths:
+        yield from sys.stdin
+    for input_path in input_paths:
+        with open(input_path, encoding='utf-8') as input_file:
+            yield from input_file
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog='shennongname',
+        description='Construct the NMMSNs of the name elements in JSONL files (one name element per line).',
+    )
+    parser.add_argument('input_paths', nargs='*', metavar='INPUT', help='Input JSONL files. Read from stdin if not given.')
+    parser.add_argument('-o', '--output', default=None, help='Output JSONL file. Write to stdout if not given.')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Number of processes. The default is 1.')
+    parser.add_argument('--chunksize', type=int, default=1000, help='Number of lines sent to a process at once. The default is 1000.')
+    parser.add_argument('-q', '--quiet', action='store_true', help='Do not report the throughput to stderr.')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs should be at least 1.')
+    if args.chunksize < 1:
+        parser.error('--chunksize should be at least 1.')
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    
+    start = time.perf_counter()
+    n_rows = 0
+    lines = (line for line in read_lines(args.input_paths) if line.strip())
+    with ExitStack() as stack:
+        output_file = stack.enter_context(open(args.output, 'w', encoding='utf-8')) if args.output else sys.stdout
+        pool = stack.enter_context(NmmsnProcessPool(jobs=args.jobs, chunksize=args.chunksize))
+        for named_line in pool.map_chunks(name_jsonl_lines, lines):
+            output_file.write(named_line + '\n')
+            n_rows += 1
+    
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(f'{n_rows} rows in {elapsed:.2f} s ({n_rows / elapsed if elapsed else 0:.0f} rows/s)', file=sys.stderr)
+    return 0
@@ -1,18 +1,35 @@
+from typing import Any, Iterable, Iterator
 
-from shennongname.snnmma.algorithm import construct_nmmsn
-from shennongname.snnmma.model import NmmsnNameElement, SnnmmaOutputFail
+from shennongname.flask.cache import ResponseCache, hash_nmmsn_ne
+from shennongname.flask.config import BATCH_MAX_SIZE, RESPONSE_CACHE_MAXSIZE, RESPONSE_CACHE_TTL, RESPONSE_CACHE_SQLITE_PATH
+from shennongname.snnmma.algorithm import NmmsnBatchPipes, construct_nmmsn
+from shennongname.snnmma.model import NmmsnNameElement, build_fail_output, dump_json_bytes
 
-from shennongname.lang.lang import get_translation
-_ = get_translation('zh')
-
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from flask.views import MethodView
 
 api_snn = '/api/name'
+api_snn_batch = '/api/name/batch'
 blueprint_snn = Blueprint('snn', __name__) 
 
+JSON_MIMETYPE = 'application/json'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+NDJSON_MIMETYPES = (NDJSON_MIMETYPE, 'application/ndjson', 'application/jsonl')
+
 
 class ApiSnn(MethodView):
+    '''
+    Construct the NMMSN of a name element.
+
+    The response carries an `ETag`, the hash of the canonical name element (`hash_nmmsn_ne`). A request with the same ETag in `If-None-Match` gets the status 304 without any body, and the other responses are served from `response_cache` (None to disable it) if they were computed before.
+    '''
+    response_cache = ResponseCache(
+        maxsize=RESPONSE_CACHE_MAXSIZE,
+        ttl=RESPONSE_CACHE_TTL or None,
+        sqlite_path=RESPONSE_CACHE_SQLITE_PATH or None,
+    )
+    
+    
     def get(self):
         return "ShennongName is working!"
     
@@ -21,23 +38,96 @@ class ApiSnn(MethodView):
         data = request.get_json()
         data_model = NmmsnNameElement.model_validate(data)
         
+        etag = hash_nmmsn_ne(data_model)
+        # only an explicit ETag proves that the client has the response, `*` matches any (even never computed) response
+        if not request.if_none_match.star_tag and request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
         try:
-            response = construct_nmmsn(data_model).model_dump()
-            return jsonify(response), 200
+            response_cache = self.response_cache
+            response = response_cache.get(etag) if response_cache is not None else None
+            if response is None:
+                # serialized to JSON bytes directly, without the intermediate dict
+                response = dump_json_bytes(construct_nmmsn(data_model))
+                if response_cache is not None:
+                    response_cache.set(etag, response)
+            response = Response(response, status=200, mimetype='application/json')
+            response.set_etag(etag)
+            return response
+
+        except Exception as e:
+            return jsonify(build_fail_output(str(e)).model_dump()), 400
+
+
+def name_batch_items(items: Iterable[bytes | Any], max_batch_size: int) -> Iterator[bytes]:
+    '''
+    Construct the NMMSNs of the items one after another, and yield a NDJSON line per item as soon as it is computed.
+
+    Parameters
+    ----------
+    items : Iterable[bytes | Any]
+        The name elements, either JSON lines (bytes) or decoded JSON values (the items of a JSON array).
+    max_batch_size : int
+        The maximum number of items. The items beyond are not read, a single `SnnmmaOutputFail` line is yielded instead.
 
+    Yields
+    ------
+    bytes
+        A `SnnmmaOutputSuccess` or `SnnmmaOutputFail` line per item, in the order of the items. An invalid item only gets a `SnnmmaOutputFail` line, the other items are still named.
+    '''
+    # the work on identical name elements is shared across the batch
+    pipes = NmmsnBatchPipes()
+    for i, item in enumerate(items):
+        if i == max_batch_size:
+            yield dump_json_bytes(build_fail_output(f'The batch has more than {max_batch_size} name elements, the remaining name elements are not named.')) + b'\n'
+            return
+        try:
+            if isinstance(item, bytes):
+                nmmsn_ne = NmmsnNameElement.model_validate_json(item)
+            else:
+                nmmsn_ne = NmmsnNameElement.model_validate(item)
+            output = construct_nmmsn(nmmsn_ne, pipes)
         except Exception as e:
-            return jsonify(
-                SnnmmaOutputFail.model_validate(
-                    {
-                        'success': False,
-                        'error_msg': str(e),
-                        'error_msg_en_zh': {
-                            'en': str(e),
-                            'zh': str(_(str(e)))
-                        }
-                    }
-                ).model_dump()
-            ), 400
+            output = build_fail_output(str(e))
+        yield dump_json_bytes(output) + b'\n'
+
+
+class ApiSnnBatch(MethodView):
+    '''
+    Construct the NMMSNs of multiple name elements in one request.
+
+    The request body is either a JSON array of name elements (`application/json`), or a NDJSON stream (`application/x-ndjson`, one name element per line), which is read line by line while the results are sent. The response is a NDJSON stream (`application/x-ndjson`) with one result per name element, in the order of the request, sent as soon as each one is computed.
+
+    A JSON array larger than `max_batch_size` gets the status 413. As a NDJSON stream is not read ahead, its name elements beyond `max_batch_size` get a single `SnnmmaOutputFail` line at the end of the response instead.
+    '''
+    max_batch_size = BATCH_MAX_SIZE
+    
+    
+    def post(self):
+        if request.mimetype in NDJSON_MIMETYPES:
+            items = (line for line in request.stream if line.strip())
+        elif request.mimetype == JSON_MIMETYPE:
+            items = request.get_json(silent=True)
+            if not isinstance(items, list):
+                return self.fail('The request body should be a JSON array of name elements.', 400)
+            if len(items) > self.max_batch_size:
+                return self.fail(f'The batch has more than {self.max_batch_size} name elements.', 413)
+        else:
+            return self.fail(f'The content type should be {JSON_MIMETYPE} or {NDJSON_MIMETYPE}.', 415)
+        
+        return Response(
+            stream_with_context(name_batch_items(items, self.max_batch_size)),
+            status=200,
+            mimetype=NDJSON_MIMETYPE,
+        )
+    
+    
+    @staticmethod
+    def fail(error_msg: str, status: int) -> Response:
+        return Response(dump_json_bytes(build_fail_output(error_msg)), status=status, mimetype=JSON_MIMETYPE)
 
 
 blueprint_snn.add_url_rule(api_snn, view_func=ApiSnn.as_view('snn'))
+blueprint_snn.add_url_rule(api_snn_batch, view_func=ApiSnnBatch.as_view('snn_batch'))
@@ -0,0 +1,176 @@
+'''
+Response cache of the `/api/name` endpoint.
+
+The NMMSN of a name element only depends on its canonical form (`canonicalize_nmmsn_ne`) and on the version of `shennongname`, so a request is identified by a hash of both (`hash_nmmsn_ne`). The hash is used as the cache key of the serialized response and as its `ETag`: a client sending the ETag back in `If-None-Match` already has the response, whether it is still cached or not.
+
+The responses are cached in each process (`LruCache`), and optionally in a SQLite file shared by the processes on the same machine (e.g., the gunicorn workers), so that a response computed by a worker is served by the others.
+
+Examples
+--------
+>>> response_cache = ResponseCache(maxsize=10000, ttl=3600, sqlite_path='/tmp/shennongname_cache.sqlite3')
+>>> key = hash_nmmsn_ne(nmmsn_ne)
+>>> response = response_cache.get(key)
+>>> if response is None:
+...     response = dump_json_bytes(construct_nmmsn(nmmsn_ne))
+...     response_cache.set(key, response)
+'''
+
+import hashlib
+from importlib.metadata import PackageNotFoundError, version
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from shennongname.snnmma.cache import LruCache, canonicalize_nmmsn_ne
+from shennongname.snnmma.model import NmmsnNameElement
+
+
+logger = logging.getLogger(__name__)
+
+try:
+    SHENNONGNAME_VERSION = version('shennongname')
+except PackageNotFoundError:
+    SHENNONGNAME_VERSION = ''
+
+
+def hash_nmmsn_ne(nmmsn_ne: NmmsnNameElement) -> str:
+    '''
+    Return the hex SHA-256 hash identifying the response to a name element. The name elements with the same canonical form have the same hash, and the hash changes with the version of `shennongname`.
+
+    The invalid name elements (without canonical form, see `canonicalize_nmmsn_ne`) are identified by their validated JSON, as their error messages depend on the raw input.
+    '''
+    key = canonicalize_nmmsn_ne(nmmsn_ne)
+    canonical = f'canonical:{key!r}' if key is not None else f'json:{nmmsn_ne.model_dump_json()}'
+    return hashlib.sha256(f'{SHENNONGNAME_VERSION}\n{canonical}'.encode('utf-8')).hexdigest()
+
+
+class SqliteCache:
+    '''
+    A cache of bytes in a SQLite file, shared by the processes (and threads) opening the same file.
+
+    Every thread of every process has its own connection, opened on first use. The expired values are removed every `prune_interval` calls of `set`. As it is only a cache, the database errors (e.g., the database is locked by another process for too long) are logged and handled as misses.
+
+    Parameters
+    ----------
+    path : str
+        The SQLite file, created if it does not exist.
+    ttl : float | None, optional
+        Seconds before a value expires. The default is None, which never expires.
+    prune_interval : int, optional
+        The number of `set` calls between the removals of the expired values. The default is 1000.
+    '''
+    def __init__(self, path: str, ttl: float | None = None, prune_interval: int = 1000):
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl should be positive.')
+        self.path = path
+        self.ttl = ttl
+        self.prune_interval = prune_interval
+        self.n_sets = 0
+        self.local = threading.local()
+
+
+    def connect(self) -> sqlite3.Connection:
+        # a connection is not shared with the forked processes
+        if getattr(self.local, 'pid', None) != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=1, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)')
+            self.local.connection = connection
+            self.local.pid = os.getpid()
+        return self.local.connection
+
+
+    def get(self, key: str) -> bytes | None:
+        '''
+        Return the value of the key, None if it is not cached or expired.
+        '''
+        try:
+            row = self.connect().execute(
+                'SELECT value FROM cache WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.Error:
+            logger.warning('Failed to read the SQLite cache %s.', self.path, exc_info=True)
+            return None
+        return None if row is None else row[0]
+
+
+    def set(self, key: str, value: bytes) -> None:
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        try:
+            connection = self.connect()
+            connection.execute('INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)', (key, value, expires_at))
+            self.n_sets += 1
+            if self.ttl is not None and self.n_sets % self.prune_interval == 0:
+                connection.execute('DELETE FROM cache WHERE expires_at <= ?', (time.time(),))
+        except sqlite3.Error:
+            logger.warning('Failed to write the SQLite cache %s.', self.path, exc_info=True)
+
+
+    def clear(self) -> None:
+        try:
+            self.connect().execute('DELETE FROM cache')
+        except sqlite3.Error:
+            logger.warning('Failed to clear the SQLite cache %s.', self.path, exc_info=True)
+
+
+    def __len__(self) -> int:
+        '''
+        The number of cached values (including the expired ones not removed yet), 0 if the database can not be read.
+        '''
+        try:
+            return self.connect().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        except sqlite3.Error:
+            logger.warning('Failed to read the SQLite cache %s.', self.path, exc_info=True)
+            return 0
+
+
+class ResponseCache:
+    '''
+    A cache of serialized responses, in the process (`LruCache`) and optionally in a shared SQLite file (`SqliteCache`). A response found in the SQLite file is also cached in the process.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of responses cached in the process, 0 to only use the SQLite file. The default is 10000.
+    ttl : float | None, optional
+        Seconds before a cached response expires. The default is None, which never expires.
+    sqlite_path : str | None, optional
+        The shared SQLite file. The default is None, which only caches in the process.
+    '''
+    def __init__(self, maxsize: int = 10000, ttl: float | None = None, sqlite_path: str | None = None):
+        self.memory = LruCache(maxsize, ttl) if maxsize else None
+        self.shared = SqliteCache(sqlite_path, ttl) if sqlite_path else None
+
+
+    def get(self, key: str) -> bytes | None:
+        '''
+        Return the cached response, None if it is not cached.
+        '''
+        if self.memory is not None:
+            value = self.memory.get(key, None)
+            if value is not None:
+                return value
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None and self.memory is not None:
+                self.memory.set(key, value)
+            return value
+        return None
+
+
+    def set(self, key: str, value: bytes) -> None:
+        if self.memory is not None:
+            self.memory.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+
+    def clear(self) -> None:
+        if self.memory is not None:
+            self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
@@ -7,3 +7,28 @@ load_dotenv()
 
 PORT = int(os.getenv('PORT', 5001))
 DEBUG = os.getenv('DEBUG', False) == 'True'
+
+# gunicorn, see `shennongname.flask.gunicorn_conf`
+# The naming is CPU-bound (and holds the GIL), so the parallelism comes from the worker processes, one per CPU. 0 for `os.cpu_count()`.
+GUNICORN_WORKERS = int(os.getenv('GUNICORN_WORKERS', 0))
+# With more than one thread, the workers are threaded (gthread), which keeps the connections alive and overlaps the network I/O with the naming. 1 for the sync workers.
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 2))
+# Load the application and the pypinyin dictionaries once in the master process, and share them with the workers (copy-on-write).
+GUNICORN_PRELOAD_APP = os.getenv('GUNICORN_PRELOAD_APP', 'True') == 'True'
+# Restart a worker after this number of requests (with a random jitter), which bounds the growth of the memory of the caches. 0 to disable.
+GUNICORN_MAX_REQUESTS = int(os.getenv('GUNICORN_MAX_REQUESTS', 10000))
+GUNICORN_MAX_REQUESTS_JITTER = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+# Seconds to wait for the next request on a keep-alive connection (threaded workers only).
+GUNICORN_KEEPALIVE = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+GUNICORN_TIMEOUT = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+# `/api/name/batch`: the maximum number of name elements in a request.
+BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 10000))
+
+# `/api/name` response cache, see `shennongname.flask.cache`
+# The number of responses cached in each process, 0 to disable the in-process cache.
+RESPONSE_CACHE_MAXSIZE = int(os.getenv('RESPONSE_CACHE_MAXSIZE', 10000))
+# Seconds before a cached response expires, 0 for never.
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL', 86400))
+# A SQLite file sharing the responses between the processes (e.g., the gunicorn workers), empty to disable.
+RESPONSE_CACHE_SQLITE_PATH = os.getenv('RESPONSE_CACHE_SQLITE_PATH', '')
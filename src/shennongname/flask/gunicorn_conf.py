@@ -0,0 +1,45 @@
+'''
+gunicorn configuration of the Flask server, read from `shennongname.flask.config` (i.e., the environment variables or the `.env` file).
+
+```shell
+gunicorn -c python:shennongname.flask.gunicorn_conf shennongname.flask.run:app
+```
+
+With `preload_app`, the application is loaded in the master process, and the master is warmed up (pypinyin dictionaries, gettext catalogs, pydantic models) before the workers are forked. The objects are then frozen out of the garbage collector, so that the collections in the workers do not write to the shared pages, and the workers share the dictionaries with the master through copy-on-write instead of loading their own copies.
+'''
+
+import gc
+import os
+
+from shennongname.flask.config import (
+    PORT,
+    GUNICORN_WORKERS,
+    GUNICORN_THREADS,
+    GUNICORN_PRELOAD_APP,
+    GUNICORN_MAX_REQUESTS,
+    GUNICORN_MAX_REQUESTS_JITTER,
+    GUNICORN_KEEPALIVE,
+    GUNICORN_TIMEOUT,
+)
+
+
+bind = f'0.0.0.0:{PORT}'
+workers = GUNICORN_WORKERS or os.cpu_count() or 1
+threads = GUNICORN_THREADS
+worker_class = 'gthread' if threads > 1 else 'sync'
+preload_app = GUNICORN_PRELOAD_APP
+max_requests = GUNICORN_MAX_REQUESTS
+max_requests_jitter = GUNICORN_MAX_REQUESTS_JITTER if GUNICORN_MAX_REQUESTS else 0
+keepalive = GUNICORN_KEEPALIVE
+timeout = GUNICORN_TIMEOUT
+
+
+def on_starting(server) -> None:
+    '''
+    Called in the master process before the workers are forked (after the application is preloaded).
+    '''
+    if not server.cfg.preload_app:
+        return
+    from shennongname.snnmma.parallel import warm_up_worker
+    warm_up_worker()
+    gc.freeze()
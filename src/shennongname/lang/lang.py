@@ -1,3 +1,4 @@
+from functools import lru_cache
 import os
 import gettext
 
@@ -5,5 +6,15 @@ import gettext
 localedir = os.path.join(os.path.dirname(__file__), 'locale')
 
 
+@lru_cache(maxsize=None)
 def get_translation(lang):
     return gettext.translation('messages', localedir, languages=[lang], fallback=True).gettext
+
+
+def get_lazy_translation(lang):
+    '''
+    Same as `get_translation`, but the catalog is only loaded when the first message is translated.
+    '''
+    def lazy_gettext(message):
+        return get_translation(lang)(message)
+    return lazy_gettext
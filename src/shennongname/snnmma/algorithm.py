@@ -1,15 +1,37 @@
-from collections import defaultdict
-import re
-
-from pypinyin import pinyin
-
-from shennongname.lang.lang import get_translation
-from shennongname.snnmma.model import NmmsnNeList, NmmsnNameElement, SnnmmaOutputSuccess, SnnmmaOutputFail, EnZh
-
-
-_ = get_translation('en')
+# The annotations are not evaluated at runtime, so that the pydantic models are only imported on first use, see `shennongname.snnmma.model`.
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from enum import StrEnum
+from functools import lru_cache
+from itertools import chain
+from sys import intern
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any
+
+from shennongname.lang.lang import get_translation, get_lazy_translation
+from shennongname.snnmma.pinyin import PinyinEngine, get_default_pinyin_engine
+from shennongname.snnmma.species import SpeciesIndex
+from shennongname.snnmma.normalize import (
+    ERROR_MSG_PIPE_PATTERN,
+    collapse_whitespace,
+    remove_whitespace,
+    remove_chars,
+    get_split_pattern,
+    get_spaced_word_split_pattern,
+    is_printable_ascii,
+    get_non_printable_ascii_characters,
+    replace_non_printable_ascii,
+    replace_non_alphabet_and_hyphen_and_space,
+)
+
+if TYPE_CHECKING:
+    from shennongname.snnmma.model import NmmsnNeList, NmmsnNameElement, SnnmmaOutputSuccess, SnnmmaOutputFail, EnZh
+
+
+_ = get_lazy_translation('en')
 # if you want the program to run in Chinese, uncomment the following line
-# _ = get_translation('zh')
+# _ = get_lazy_translation('zh')
 
 
 # Default parameters
@@ -27,6 +49,33 @@ class Default:
     CELL_VALUE = ''
 
 
+class NmmTypeCode(StrEnum):
+    '''
+    The NMM types resolved by `NmmType`. The values are the English labels, so the members can be used wherever the labels are (e.g., as keys of compact records).
+    '''
+    # ANMM
+    PLANT = "plant"
+    ANIMAL = "animal"
+    FUNGAL = "fungal"
+    ALGAL = "algal"
+    MINERAL = "mineral"
+    OTHER = "other"
+    # PNMM
+    PROCESSED = "processed"
+    PROCESSED_OTHER = "processed_other"
+    # Other
+    CHEMICAL = "chemical"
+    ARTIFICIAL = "artificial"
+    
+    
+    @property
+    def zh(self) -> str:
+        '''
+        The Chinese label, e.g., `植物药`.
+        '''
+        return getattr(NmmType, self.name)[1]
+
+
 class NmmType:
     # ANMM
     PLANT =  ["plant", "植物药"]
@@ -50,21 +99,68 @@ class NmmType:
     
     # combined
     PAFA = PLANT + ANIMAL + FUNGAL + ALGAL
+    PAFA_CODES = frozenset([NmmTypeCode.PLANT, NmmTypeCode.ANIMAL, NmmTypeCode.FUNGAL, NmmTypeCode.ALGAL])
+    
+    
+    # common variants of the labels (normalized), besides the English and Chinese labels
+    VARIANTS = {
+        "fungus": NmmTypeCode.FUNGAL,
+        "fungi": NmmTypeCode.FUNGAL,
+        "alga": NmmTypeCode.ALGAL,
+        "algae": NmmTypeCode.ALGAL,
+        "processed other": NmmTypeCode.PROCESSED_OTHER,
+    }
+    
+    
+    __slots__ = ('nmm_type', 'code')
     
     
     def __init__(self, nmm_type: str):
+        # strip, lower case, "-" -> "_"
         self.nmm_type = nmm_type.strip().lower().replace("-", "_")
+        self.code = NMM_TYPE_LOOKUP.get(self.nmm_type)
     
     def is_pafa(self) -> bool:
-        return self.nmm_type in self.PAFA
+        return self.code in self.PAFA_CODES
         
     def is_pro(self) -> bool:
-        return self.nmm_type in self.PROCESSED
+        return self.code is NmmTypeCode.PROCESSED
     
     def is_pafa_pro(self) -> bool:
         return self.is_pafa() or self.is_pro()
 
 
+def _build_nmm_type_lookup() -> MappingProxyType[str, NmmTypeCode]:
+    lookup: dict[str, NmmTypeCode] = {}
+    for code in NmmTypeCode:
+        en, zh = getattr(NmmType, code.name)
+        lookup[en] = code
+        lookup[zh] = code
+        # the Chinese label without the suffix 药, e.g., 植物
+        lookup[zh.removesuffix("药")] = code
+    lookup.update(NmmType.VARIANTS)
+    return MappingProxyType(lookup)
+
+
+# normalized label -> NmmTypeCode, frozen
+NMM_TYPE_LOOKUP = _build_nmm_type_lookup()
+
+
+@lru_cache(maxsize=1024)
+def get_nmm_type(nmm_type: str) -> NmmType:
+    '''
+    Return the `NmmType` of a raw NMM type. The instances are cached per raw input, and shared (they should not be modified).
+    
+    Examples
+    --------
+    >>> get_nmm_type(' Processed-Other ').code
+    <NmmTypeCode.PROCESSED_OTHER: 'processed_other'>
+    >>> get_nmm_type('植物药').is_pafa()
+    True
+    '''
+    return NmmType(nmm_type)
+
+
 ## Helper ######################################################################
 
 # Helper: String
@@ -84,30 +180,25 @@ class AsciiStr:
     
         
     def is_printable_ascii(self) -> bool:
-        return all(self.char_is_printable_ascii(c) for c in self.str)
+        return is_printable_ascii(self.str)
 
 
     def get_non_ascii_characters(self) -> set[str]:
-        char_list = [c for c in self.str if not self.char_is_printable_ascii(c)]
-        char_list = set(char_list)
-        return char_list
+        return get_non_printable_ascii_characters(self.str)
     
 
     def replace_non_printable_ascii(self, replacement: str = "") -> 'AsciiStr':
-        replaced_str = "".join([c if self.char_is_printable_ascii(c) else replacement for c in self.str])
-        # remove multiple spaces
-        replaced_str = re.sub(r"\s+", " ", replaced_str)
-        replaced_str = replaced_str.strip()
-        return AsciiStr(replaced_str)
+        # replace + remove multiple spaces + strip
+        return AsciiStr(replace_non_printable_ascii(self.str, replacement))
     
     
     def remove_space(self) -> 'AsciiStr':
-        replaced_str = re.sub(r"\s+", "", self.str)
+        replaced_str = remove_whitespace(self.str)
         return AsciiStr(replaced_str)
     
     
     def remove_zh_special_punctuation(self, zh_special_punctuation: str = ZH_SPECIAL_PUNCTUATION) -> 'AsciiStr':
-        replaced_str = re.sub(f"[{zh_special_punctuation}]", "", self.str)
+        replaced_str = remove_chars(self.str, zh_special_punctuation)
         return AsciiStr(replaced_str)
     
     
@@ -128,13 +219,8 @@ class AsciiStr:
     
     
     def replace_non_alphabet_and_hyphen_and_space(self, replacement: str = "") -> 'AsciiStr':
-        replaced_str = "".join([c if self.char_is_alphabet_and_hyphen_and_space(c) else replacement for c in self.str])
-        # remove multiple spaces
-        replaced_str = re.sub(r"\s+", " ", replaced_str)
-        # remove multiple hyphens
-        replaced_str = re.sub(r"-+", "-", replaced_str)
-        replaced_str = replaced_str.strip()
-        return AsciiStr(replaced_str)
+        # a single translation pass, then remove multiple spaces and hyphens and strip
+        return AsciiStr(replace_non_alphabet_and_hyphen_and_space(self.str, replacement))
 
 
 def split_and_strip(string: str, separator: str) -> list[str]:
@@ -146,7 +232,7 @@ def split_and_strip(string: str, separator: str) -> list[str]:
 
 def convert_to_capitalize_with_hyphen(word: str) -> str:
     # replace multiple spaces with single space
-    word = re.sub(r"\s+", " ", word)
+    word = collapse_whitespace(word)
     # strip leading and trailing spaces
     word = word.strip()
     # capitalize first letter
@@ -175,6 +261,8 @@ def convert_to_pinyin(s: str) -> str:
     >>> convert_to_pinyin("青蒿")
     'qīng hāo'
     """
+    # pypinyin loads its large phrase dictionaries at import, thus it is imported on first use.
+    from pypinyin import pinyin
     return ' '.join([i[0] for i in pinyin(s)])
 
 
@@ -213,17 +301,17 @@ def split_sentence_by_words(sentence: str, split_words: list[str], keep_sep: boo
 
         For example, if `sep` is `'and'`, then `(?P<{sep}>{sep})` would be replaced by `(?P<and>and)`. In the `split_sentence_by_words` function, we use this named capture group syntax to create a group for each word in the `split_words` list. This way, when using the `re.split()` function, we can retain these separators (if `keep_sep=True`) as they have been captured in the named groups.
         '''
-        pattern = "|".join(f"(?P<{sep.strip()}>{sep})" for sep in split_words)
+        pattern = get_split_pattern(tuple(split_words), keep_sep=True)
         
-        split_result = re.split(pattern, sentence)
+        split_result = pattern.split(sentence)
         result = [part for part in split_result if part]
         result = [part.strip() for part in result]
     else:
         # Combine the split_words with '|' to create a regex pattern
-        pattern = '|'.join(split_words)
+        pattern = get_split_pattern(tuple(split_words))
 
-        # Use re.split to split the sentence
-        result = re.split(pattern, sentence)
+        # Use the pattern to split the sentence
+        result = pattern.split(sentence)
 
         # Strip any extra whitespace
         result = [item.strip() for item in result]
@@ -233,43 +321,191 @@ def split_sentence_by_words(sentence: str, split_words: list[str], keep_sep: boo
 
 # Helper: Mappping
 
+class MappingIndex:
+    '''
+    An index from the keys to the values of a mapping.
+    
+    Most keys of a term dictionary have a single value, which is kept as is in `single`. Only the keys with multiple values keep a set of their values, in `multi`. A key is either in `single` or in `multi`.
+    '''
+    __slots__ = ('single', 'multi')
+    
+    def __init__(self):
+        self.single: dict[str, str] = {}
+        self.multi: dict[str, set[str]] = {}
+    
+    
+    def add(self, key: str, value: str) -> bool:
+        '''
+        Add a (key, value) item. Return False if the item already exists.
+        '''
+        values = self.multi.get(key)
+        if values is not None:
+            if value in values:
+                return False
+            values.add(value)
+            return True
+        old_value = self.single.get(key)
+        if old_value is None:
+            self.single[key] = value
+            return True
+        if old_value == value:
+            return False
+        del self.single[key]
+        self.multi[key] = {old_value, value}
+        return True
+    
+    
+    def remove(self, key: str, value: str) -> bool:
+        '''
+        Remove a (key, value) item. Return False if the item does not exist.
+        '''
+        values = self.multi.get(key)
+        if values is not None:
+            if value not in values:
+                return False
+            values.remove(value)
+            if len(values) == 1:
+                del self.multi[key]
+                self.single[key] = values.pop()
+            return True
+        if key in self.single and self.single[key] == value:
+            del self.single[key]
+            return True
+        return False
+    
+    
+    def get(self, key: str) -> set[str]:
+        '''
+        Return the values of a key (an empty set if the key does not exist).
+        '''
+        if key in self.single:
+            return {self.single[key]}
+        return set(self.multi.get(key, ()))
+    
+    
+    def items(self) -> Iterator[tuple[str, str]]:
+        yield from self.single.items()
+        for key, values in self.multi.items():
+            for value in values:
+                yield key, value
+
+
 class Mapping:
+    '''
+    A mapping between two sets of terms, e.g., nonstandard terms -> standard terms.
+    
+    The forward (key -> values) and backward (value -> keys) indexes are built once. Items can be added or removed incrementally, the mapping type is kept up to date without rebuilding the indexes, as the keys with multiple values are tracked by the indexes.
+    
+    Examples
+    --------
+    >>> mapping = Mapping([("appla", "apple"), ("carr", "car")])
+    >>> mapping.mapping_type
+    'oo'
+    >>> mapping.add("appli", "apple").mapping_type
+    'mo'
+    >>> mapping.get_keys("apple")
+    {'appla', 'appli'}
+    >>> mapping.remove("appli", "apple").mapping_type
+    'oo'
+    '''
     def __init__(self, mapping: list[tuple[str, str]], ignore_case: bool = False):
-        self.mapping = []
+        self.ignore_case = ignore_case
+        self.forward = MappingIndex()
+        self.backward = MappingIndex()
+        self.size = 0
+        self._sorted_mapping: list[tuple[str, str]] | None = None
+        
         if isinstance(mapping, list):
             for item in mapping:
                 if isinstance(item, tuple):
                     if len(item) == 2:
-                        key = item[0].strip()
-                        value = item[1].strip()
-                        if ignore_case:
-                            key = key.lower()
-                            value = value.lower()
-                        if key and value:
-                            self.mapping.append((key, value))
-                        else:
-                            raise ValueError(_("Mapping item cannot be empty."))
+                        self._add(*self._normalize_item(item[0], item[1]))
                     else:
                         raise ValueError(_("Mapping item must have 2 elements."))
                 else:
                     raise ValueError(_("Mapping item must be a tuple."))
         else:
             raise ValueError(_("Mapping must be a list."))
-        self._remove_duplicate_mapping() # note: this will sort the mapping
-        self.mapping_type = self.verify_mapping_type()
-
     
-    def _remove_duplicate_mapping(self):
-        """
-        Remove duplicate mappings.
-        """
-        self.mapping = sorted(set(self.mapping))
+    
+    def _normalize_item(self, key: str, value: str) -> tuple[str, str]:
+        key = key.strip()
+        value = value.strip()
+        if self.ignore_case:
+            key = key.lower()
+            value = value.lower()
+        if not key or not value:
+            raise ValueError(_("Mapping item cannot be empty."))
+        return key, value
+    
+    
+    def _add(self, key: str, value: str) -> None:
+        if self.forward.add(key, value):
+            self.backward.add(value, key)
+            self.size += 1
+            self._sorted_mapping = None
+    
+    
+    def add(self, key: str, value: str) -> 'Mapping':
+        '''
+        Add an item (stripped, and in lower case if `ignore_case`). Adding an existing item does nothing.
+        '''
+        self._add(*self._normalize_item(key, value))
         return self
     
+    
+    def remove(self, key: str, value: str) -> 'Mapping':
+        '''
+        Remove an item (stripped, and in lower case if `ignore_case`). Raise KeyError if the item does not exist.
+        '''
+        key, value = self._normalize_item(key, value)
+        if not self.forward.remove(key, value):
+            raise KeyError((key, value))
+        self.backward.remove(value, key)
+        self.size -= 1
+        self._sorted_mapping = None
+        return self
+    
+    
+    @property
+    def mapping(self) -> list[tuple[str, str]]:
+        '''
+        The sorted list of the unique items. It is only sorted again after the mapping is modified.
+        '''
+        if self._sorted_mapping is None:
+            self._sorted_mapping = sorted(self.forward.items())
+        return self._sorted_mapping
+    
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        key, value = item
+        if key in self.forward.single:
+            return self.forward.single[key] == value
+        return value in self.forward.multi.get(key, ())
+    
+    
+    def get_values(self, key: str) -> set[str]:
+        '''
+        Return the values of a key, e.g., the standard terms of a nonstandard term.
+        '''
+        return self.forward.get(key)
+    
+    
+    def get_keys(self, value: str) -> set[str]:
+        '''
+        Return the keys of a value, e.g., the nonstandard terms of a standard term.
+        '''
+        return self.backward.get(value)
+    
 
-    def verify_mapping_type(self) -> str:
+    @property
+    def mapping_type(self) -> str:
         """
-        The function will return the type of the mapping.
+        The type of the mapping.
 
         There are 5 types of mappings:
         1. nn: none-to-none (empty mapping)
@@ -278,11 +514,6 @@ class Mapping:
         4. om: one-to-multi
         5. mm: multi-to-multi    
         
-        Return
-        ------
-        str
-            The type of the mapping.
-        
         Examples
         --------
         >>> mapping = []
@@ -301,24 +532,30 @@ class Mapping:
         >>> Mapping(mapping).mapping_type
         mm
         """
-        if len(self.mapping) == 0:
-            return 'nn' 
-        
-        keys_to_values = defaultdict(set)
-        values_to_keys = defaultdict(set)
-        
-        for key, value in self.mapping:
-            keys_to_values[key].add(value)
-            values_to_keys[value].add(key)
-        
-        if all(len(values) == 1 for values in keys_to_values.values()) and all(len(keys) == 1 for keys in values_to_keys.values()):
+        if self.size == 0:
+            return 'nn'
+        one_to_multi = len(self.forward.multi) > 0
+        multi_to_one = len(self.backward.multi) > 0
+        if not one_to_multi and not multi_to_one:
             return 'oo'
-        elif any(len(values) > 1 for values in keys_to_values.values()) and all(len(keys) == 1 for keys in values_to_keys.values()):
+        elif one_to_multi and not multi_to_one:
             return 'om'
-        elif all(len(values) == 1 for values in keys_to_values.values()) and any(len(keys) > 1 for keys in values_to_keys.values()):
+        elif not one_to_multi and multi_to_one:
             return 'mo'
         else:
             return 'mm'
+    
+
+    def verify_mapping_type(self) -> str:
+        """
+        The function will return the type of the mapping, see `mapping_type`.
+        
+        Return
+        ------
+        str
+            The type of the mapping.
+        """
+        return self.mapping_type
 
 
     def get_forward_mapping(self) -> dict[str, str]:
@@ -326,7 +563,7 @@ class Mapping:
         If the mapping is in the types of 'oo' or 'mo', the function will convert the mapping to a dictionary.
         '''
         if self.mapping_type in ['oo', 'mo', 'nn']:
-            dict_mapping = dict(self.mapping)
+            dict_mapping = dict(self.forward.single)
         else:
             raise ValueError(_("The mapping is not in the types of one-to-one or multi-to-one."))
         return dict_mapping
@@ -334,7 +571,7 @@ class Mapping:
     
     def get_backward_mapping(self) -> dict[str, str]:
         if self.mapping_type in ['oo', 'om', 'nn']:
-            dict_mapping = dict([(value, key) for key, value in self.mapping])
+            dict_mapping = dict(self.backward.single)
         else:
             raise ValueError(_("The mapping is not in the types of one-to-one or one-to-multi."))
         return dict_mapping
@@ -355,18 +592,14 @@ class Mapping:
         >>> get_multi_to_one_mappings(mapping)
         [('appla', 'apple'), ('appli', 'apple')]
         """
-        if self.mapping_type == 'mo':
-            values_to_keys = defaultdict(set)
-            for key, value in self.mapping:
-                values_to_keys[value].add(key)
-        else:
+        if self.mapping_type != 'mo':
             raise ValueError(_("The mapping is not in the type of multi-to-one."))
         
+        # the values with multiple keys are ordered by their first key
         multi_to_one_mappings = []
-        for value, keys in values_to_keys.items():
-            if len(keys) > 1:
-                for key in sorted(keys):
-                    multi_to_one_mappings.append((key, value))
+        for keys, value in sorted((sorted(keys), value) for value, keys in self.backward.multi.items()):
+            for key in keys:
+                multi_to_one_mappings.append((key, value))
         self.multi_to_one_mappings = multi_to_one_mappings
         return self
 
@@ -420,20 +653,18 @@ def detect_species_inclusion(species_list: list[str]) -> tuple[bool, list[str]]:
     # strip every species in the list
     species_list = [species.strip() for species in species_list]
     # replace consecutive spaces with a single space
-    species_list = [re.sub(r'\s+', ' ', species) for species in species_list] # \s+ matches one or more whitespace characters
+    species_list = [collapse_whitespace(species) for species in species_list]
     species_list = sorted(species_list, key=len) # Sort by length, shortest first
-    highest_level_species = []
     inclusion_detected = False
-
+    
+    # The index ignores upper/lower case. The shorter species are added first, so that a species is never removed from the index.
+    species_index = SpeciesIndex()
     for species in species_list:
-        # ignore upper/lower case
-        if not any(species.lower().startswith(higher_species.lower()) for higher_species in highest_level_species):
-            highest_level_species.append(species)
-        else:
+        if species_index.add(species):
             inclusion_detected = True
     
-    # sort the highest_level_species by alphabetical order, a -> z
-    highest_level_species = sorted(highest_level_species)
+    # sorted by alphabetical order, a -> z
+    highest_level_species = species_index.highest_level_species()
 
     return inclusion_detected, highest_level_species
 
@@ -485,6 +716,8 @@ def internationalize_error_msg(error_msg: str) -> EnZh:
     def.
     ```
     '''
+    from shennongname.snnmma.model import EnZh
+    
     # Forcing the translation to be zh
     _ = get_translation('zh')
     
@@ -492,7 +725,7 @@ def internationalize_error_msg(error_msg: str) -> EnZh:
     new_error_list = []
     for i in error_list:
         if i.startswith('Pipe:'):
-            new_error_list.append(re.sub(r'^Pipe:.*Reason: ', '', i))
+            new_error_list.append(ERROR_MSG_PIPE_PATTERN.sub('', i))
         else:
             new_error_list.append(i)
         
@@ -518,13 +751,65 @@ class NmmsnNeData:
     2 conditions:
     1. The input data is empty. E.g., `[]`
     2. The input data is a list of list, str, list, .... E.g., `[['a', 'b'], 'and', ['d', 'e']]`
+    
+    Internally, the cleaned data is kept in a compact immutable form:
+    - `pairs`: a tuple of the (interned) str pairs. E.g., `(('a', 'b'), ('d', 'e'))`
+    - `ops`: a tuple of the logical operators between the pairs, one less than the pairs. E.g., `('and',)`
+    
+    The list form `nmmsn_ne_list` is only built on access, at the output boundary.
     '''
     AVAIL_LOGIC_OPERATOR = ['or', 'and']
+    LOGIC_OPERATOR_SPLIT_PATTERN = get_spaced_word_split_pattern(tuple(AVAIL_LOGIC_OPERATOR))
+    
+    __slots__ = ('pairs', 'ops')
 
-    def __init__(self, nmmsn_ne_list: NmmsnNeList):
-        self.nmmsn_ne_list = nmmsn_ne_list
-        self.clean_nmmsn_ne_list() # clean + validate
+    def __init__(
+        self,
+        nmmsn_ne_list: NmmsnNeList,
+        validate_empty: bool = False,
+        validate_only_and_or_only_or: bool = False,
+        validate_oo_mapping_type: bool = False,
+    ):
+        self.pairs: tuple[tuple[str, str], ...] = ()
+        self.ops: tuple[str, ...] = ()
+        # clean + validate
+        self.clean_nmmsn_ne_list(
+            nmmsn_ne_list,
+            validate_empty=validate_empty,
+            validate_only_and_or_only_or=validate_only_and_or_only_or,
+            validate_oo_mapping_type=validate_oo_mapping_type,
+        )
     
+    
+    @property
+    def nmmsn_ne_list(self) -> NmmsnNeList:
+        '''
+        The list form of the data. A new list is built every time.
+        
+        Examples
+        --------
+        >>> NmmsnNeData([['a', 'b'], 'AND', ['d', 'e']]).nmmsn_ne_list
+        [['a', 'b'], 'and', ['d', 'e']]
+        '''
+        return self.convert_inner_tuple_to_list(self.convert_inner_list_to_tuple())
+    
+    
+    @nmmsn_ne_list.setter
+    def nmmsn_ne_list(self, nmmsn_ne_list: NmmsnNeList):
+        self.clean_nmmsn_ne_list(nmmsn_ne_list)
+    
+    
+    def freeze(self) -> tuple[tuple[tuple[str, str], ...], tuple[str, ...]]:
+        '''
+        Return the hashable internal form `(pairs, ops)`.
+        
+        Examples
+        --------
+        >>> NmmsnNeData([['a', '甲'], 'or', ['b', '乙']]).freeze()
+        ((('a', '甲'), ('b', '乙')), ('or',))
+        '''
+        return self.pairs, self.ops
+        
         
     def __str__(self):
         '''
@@ -542,14 +827,14 @@ class NmmsnNeData:
         str
             A string representation of the NmmsnNeData object.
         '''
-        string = ''
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, list):
-                string += ' | '.join(i)
-            else:
-                string += f' {i} '
+        if not self.pairs:
+            return ''
+        parts = [' | '.join(self.pairs[0])]
+        for op, pair in zip(self.ops, self.pairs[1:]):
+            parts.append(f' {op} ')
+            parts.append(' | '.join(pair))
         # remove extra spaces
-        string = re.sub(r'\s+', ' ', string).strip()
+        string = collapse_whitespace(''.join(parts)).strip()
         return string
     
     
@@ -558,6 +843,8 @@ class NmmsnNeData:
         '''
         Initialize a NmmsnNeData object from a string.
         
+        The string is tokenized by a single split, which returns the str pairs and the logic operators alternately. If every str pair is well-formed (`str | str`, with non-empty str), the tokens are stored in the compact form directly. Otherwise, they are cleaned and validated as a list, with the same results and errors as splitting the string with `split_sentence_by_words` then `str.split('|')`.
+        
         Examples
         --------
         >>> nmmsn_ne_str = 'a | b B and d | e'
@@ -565,58 +852,117 @@ class NmmsnNeData:
         >>> nmmsn_ne_data.nmmsn_ne_list
         [['a', 'b B'], 'and', ['d', 'e']]
         '''
-        # step 1: split the string by 'and' and 'or'
         if nmmsn_ne_str.strip() == '':
             return cls([])
-        nmmsn_ne_str = f' {nmmsn_ne_str} '
-        logic_operators_with_space = [f' {i} ' for i in cls.AVAIL_LOGIC_OPERATOR]
-        nmmsn_ne_list = split_sentence_by_words(nmmsn_ne_str, logic_operators_with_space, keep_sep=True)
-        nmmsn_ne_list_2 = []
-        # step 2: split the string by '|' and strip
-        for i in range(len(nmmsn_ne_list)):
-            if '|' in nmmsn_ne_list[i]:
-                nmmsn_ne_list_2.append(nmmsn_ne_list[i].split('|'))
-            else:
-                nmmsn_ne_list_2.append(nmmsn_ne_list[i])
-        # step 3: convert to NmmsnNeData object
-        return cls(nmmsn_ne_list_2)
-    
-    
-    def clean_nmmsn_ne_list(self):
+        # the logic operators must be surrounded by spaces, the string is padded for the operators at its both ends
+        tokens = cls.LOGIC_OPERATOR_SPLIT_PATTERN.split(f' {nmmsn_ne_str} ')
+        
+        # fast path: well-formed str pairs
+        pairs = []
+        for part in tokens[0::2]:
+            en, sep, zh = part.partition('|')
+            en = en.strip()
+            zh = zh.strip()
+            if not sep or not en or not zh or '|' in zh:
+                break
+            pairs.append((intern(en), intern(zh)))
+        else:
+            nmmsn_ne_data = cls.__new__(cls)
+            nmmsn_ne_data.pairs = tuple(pairs)
+            nmmsn_ne_data.ops = tuple(map(intern, tokens[1::2]))
+            return nmmsn_ne_data
+        
+        # the empty parts (between two logic operators, or at the ends) are skipped, the other parts are stripped
+        nmmsn_ne_list = []
+        for i, token in enumerate(tokens):
+            if i % 2 == 1:
+                nmmsn_ne_list.append(token)
+            elif token:
+                token = token.strip()
+                nmmsn_ne_list.append(token.split('|') if '|' in token else token)
+        return cls(nmmsn_ne_list)
+    
+    
+    def clean_nmmsn_ne_list(
+        self,
+        nmmsn_ne_list: NmmsnNeList | None = None,
+        validate_empty: bool = False,
+        validate_only_and_or_only_or: bool = False,
+        validate_oo_mapping_type: bool = False,
+    ):
         '''
-        For the input data, the following cleaning operations are performed:
+        For the input data (the current data if None), the following cleaning operations are performed:
         1. strip and remove empty elements
         2. validate the data type and structure
+        3. store the data in the compact form (`pairs` and `ops`)
+        
+        The data is cleaned and validated in a single walk of the list. Optionally, the validations `validate_empty`, `validate_only_and_or_only_or` and `validate_oo_mapping_type` are performed in the same walk. The errors are the same as the ones of the separate validations, and are raised in the same order: cleaning, pattern, empty, logic operators, mapping type.
         '''
-        if not isinstance(self.nmmsn_ne_list, list):
+        if nmmsn_ne_list is None:
+            nmmsn_ne_list = self.nmmsn_ne_list
+        if not isinstance(nmmsn_ne_list, list):
             raise ValueError(_("The type of the input data is not list."))
 
-        new_nmmsn_ne_list = []
-        for i in self.nmmsn_ne_list:
+        pairs: list[tuple[str, str]] = []
+        ops: list[str] = []
+        # the pattern errors are only raised after the cleaning errors, as the empty str pairs are removed during cleaning
+        pattern_valid = True
+        first_is_logic_operator = False
+        last_is_logic_operator = False
+        oo_mapping = True
+        en_to_zh: dict[str, str] = {}
+        zh_to_en: dict[str, str] = {}
+        for i in nmmsn_ne_list:
             if isinstance(i, list):
-                temp = []
-                if len(i) == 2:
-                    for j in i:
-                        j = j.strip()
-                        temp.append(j)
-                    # if any element in the list is empty, remove the whole list
-                    if not any(j == '' for j in temp): # if there is no empty element in the list
-                        new_nmmsn_ne_list.append(temp)
-                else:
+                if len(i) != 2:
                     raise ValueError(_("The length of the inner list is not 2."))
+                en = i[0].strip()
+                zh = i[1].strip()
+                # if any element in the list is empty, remove the whole list
+                if en == '' or zh == '':
+                    continue
+                # the str pairs are at the even positions of the cleaned list
+                if len(pairs) != len(ops):
+                    pattern_valid = False
+                # The terms are interned, as the same terms are repeated across the records of a catalogue.
+                pair = (intern(en), intern(zh))
+                pairs.append(pair)
+                last_is_logic_operator = False
+                if validate_oo_mapping_type and oo_mapping:
+                    if en_to_zh.setdefault(pair[0], pair[1]) != pair[1] or zh_to_en.setdefault(pair[1], pair[0]) != pair[0]:
+                        oo_mapping = False
             elif isinstance(i, str):
-                temp = i.strip().lower() # convert to lower case
-                if temp != '' and temp in self.AVAIL_LOGIC_OPERATOR:
-                    new_nmmsn_ne_list.append(temp)
-                else:
+                op = i.strip().lower() # convert to lower case
+                if op not in self.AVAIL_LOGIC_OPERATOR: # the empty str is not available either
                     raise ValueError(_("The str in the input data is empty or not in the available logic operator list."))
+                # the logic operators are at the odd positions of the cleaned list
+                if len(pairs) != len(ops) + 1:
+                    pattern_valid = False
+                if not pairs and not ops:
+                    first_is_logic_operator = True
+                ops.append(intern(op))
+                last_is_logic_operator = True
             else:
                 raise ValueError(_("The type of the item in the input data is not list or str."))
         
-        self.nmmsn_ne_list = new_nmmsn_ne_list
+        # Till this step, the input data is assured to be list[list[str] | str], see `validate_str_pair_logic_operator_pattern`
+        if pairs or ops:
+            if first_is_logic_operator or last_is_logic_operator:
+                raise ValueError(_("The first and the last item could not be logic_operator."))
+            if (len(pairs) + len(ops)) % 2 == 0:
+                raise ValueError(_("The length of the list should be odd."))
+            if not pattern_valid:
+                raise ValueError(_("The input data pattern is not str_pair, logic_operator, str_pair, logic_operator, str_pair, ..."))
+        
+        self.pairs = tuple(pairs)
+        self.ops = tuple(ops)
         
-        # Till this step, the input data is assured to be list[list[str] | str]
-        self.validate_str_pair_logic_operator_pattern()
+        if validate_empty:
+            self.validate_empty()
+        if validate_only_and_or_only_or:
+            self.validate_only_and_or_only_or()
+        if not oo_mapping:
+            raise ValueError(_("The mapping type is not one-to-one."))
         return self
     
     
@@ -638,9 +984,9 @@ class NmmsnNeData:
     - [str, str]: str_pair.
     - str: logic_operator. It can only be "or" or "and".
     '''    
-    def validate_str_pair_logic_operator_pattern(self):
+    def validate_str_pair_logic_operator_pattern(self, nmmsn_ne_list: NmmsnNeList | None = None):
         '''
-        For the input list, it item pattern should be:
+        For the input list (the current data if None), it item pattern should be:
         1. The first and the last item could not be logic_operator.
         2. The len of the list should be odd.
         3. str_pair, logic_operator, str_pair, logic_operator, ...
@@ -649,18 +995,21 @@ class NmmsnNeData:
         -----
         Through the `clean_nmmsn_ne_list` of NmmsnNeData (without validation), the input data is already validated to be a list, in which the inner data type is either str or list[str, str]. So, in this validation, we focus on the pattern of the list.
         '''
-        if len(self.nmmsn_ne_list) > 0: # Thus, the empty list will always pass this validation.
+        if nmmsn_ne_list is None:
+            nmmsn_ne_list = self.nmmsn_ne_list
+        
+        if len(nmmsn_ne_list) > 0: # Thus, the empty list will always pass this validation.
 
             # 1. check if the first and the last item is logic_operator
-            if isinstance(self.nmmsn_ne_list[0], str) or isinstance(self.nmmsn_ne_list[-1], str):
+            if isinstance(nmmsn_ne_list[0], str) or isinstance(nmmsn_ne_list[-1], str):
                 raise ValueError(_("The first and the last item could not be logic_operator."))
                 
             # 2. check if the len of the list is odd
-            if len(self.nmmsn_ne_list) % 2 == 0:
+            if len(nmmsn_ne_list) % 2 == 0:
                 raise ValueError(_("The length of the list should be odd."))
         
             # 3. check if the input data pattern is str_pair, logic_operator, str_pair, logic_operator, ...
-            psudo_input_data = self.nmmsn_ne_list + ['']
+            psudo_input_data = nmmsn_ne_list + ['']
             for i in range(0, len(psudo_input_data), 2):
                 if not isinstance(psudo_input_data[i], list) or not isinstance(psudo_input_data[i+1], str):
                     raise ValueError(_("The input data pattern is not str_pair, logic_operator, str_pair, logic_operator, str_pair, ..."))
@@ -671,29 +1020,23 @@ class NmmsnNeData:
         '''
         Validate if the input data is empty.
         '''
-        if not self.nmmsn_ne_list:
+        if not self.pairs:
             raise ValueError(_("The nmmsn_ne_list is empty."))
         return self
     
     
     def validate_only_and_or_only_or(self):
-        and_detected = False
-        or_detected = False
-        for i in self.nmmsn_ne_list:
-            if i == 'and':
-                and_detected = True
-            elif i == 'or':
-                or_detected = True
-            if and_detected and or_detected:
-                raise ValueError(_("There are both \"and\" and \"or\" logic operators in the input data, only one of them is allowed."))
+        if 'and' in self.ops and 'or' in self.ops:
+            raise ValueError(_("There are both \"and\" and \"or\" logic operators in the input data, only one of them is allowed."))
         return self
     
     
     def validate_oo_mapping_type(self):
-        ne_map_pairs = self.extract_map_pairs()
-        # if the ne_map_pairs is not empty, check if the mapping type is one-to-one
-        if ne_map_pairs:
-            if not Mapping(ne_map_pairs).verify_mapping_type() == 'oo':
+        # the empty data is one-to-one
+        en_to_zh: dict[str, str] = {}
+        zh_to_en: dict[str, str] = {}
+        for en, zh in self.pairs:
+            if en_to_zh.setdefault(en, zh) != zh or zh_to_en.setdefault(zh, en) != en:
                 raise ValueError(_("The mapping type is not one-to-one."))
         return self
 
@@ -709,22 +1052,20 @@ class NmmsnNeData:
         >>> print(NmmsnNeData(lst).convert_inner_list_to_tuple())
         [('a', '甲), 'or', ('b', '乙'), 'and', ('c', '丙')]
         '''
-        new_nmmsn_ne_list = []
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, list):
-                new_nmmsn_ne_list.append(tuple(i))
-            elif isinstance(i, str):
-                new_nmmsn_ne_list.append(i)
-            else:
-                raise ValueError(_("The type of the input data is not list or str."))
+        if not self.pairs:
+            return []
+        new_nmmsn_ne_list: list[tuple[str, str] | str] = [self.pairs[0]]
+        for op, pair in zip(self.ops, self.pairs[1:]):
+            new_nmmsn_ne_list.append(op)
+            new_nmmsn_ne_list.append(pair)
         return new_nmmsn_ne_list
     
     
     def convert_inner_tuple_to_list(self, nmmne_list: list[tuple[str, str] | str]) -> NmmsnNeList:
         '''
-        Convert the inner tuple to list.
+        Convert the inner tuple to list. It builds the list form of `nmmsn_ne_list` from `convert_inner_list_to_tuple`.
         '''
-        new_nmmsn_ne_list = []
+        new_nmmsn_ne_list: NmmsnNeList = []
         for i in nmmne_list:
             if isinstance(i, tuple):
                 new_nmmsn_ne_list.append(list(i))
@@ -732,22 +1073,14 @@ class NmmsnNeData:
                 new_nmmsn_ne_list.append(i)
             else:
                 raise ValueError(_("The type of the input data is not tuple or str."))
-        return new_nmmsn_ne_list    
+        return new_nmmsn_ne_list
     
     
     def convert_nmmsn_ne_list_to_lower_case(self) -> 'NmmsnNeData':
         '''
-        Convert the input data to lower case.
+        Convert the input data to lower case. The logical operators are already in lower case.
         '''
-        new_nmmsn_ne_list = []
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, list):
-                new_nmmsn_ne_list.append([j.lower() for j in i])
-            elif isinstance(i, str):
-                new_nmmsn_ne_list.append(i.lower())
-            else:
-                raise ValueError(_("The type of the input data is not list or str."))
-        self.nmmsn_ne_list = new_nmmsn_ne_list
+        self.pairs = tuple((intern(en.lower()), intern(zh.lower())) for en, zh in self.pairs)
         return self
     
     
@@ -761,6 +1094,8 @@ class NmmsnNeData:
         
         This function will also remove duplicate string pairs based on the logic automatically.
         
+        The pairs with the same sorting str (and the groups with the same first pair) are ordered by the whole pairs (groups), so that the same logic always gives the same canonical form, see `canonical_key`.
+        
         Parameters
         ----------
         based_on_str_pair_index : int, optional
@@ -777,67 +1112,78 @@ class NmmsnNeData:
         >>> print(NmmsnNeData(lst).logic_order(exclude_and=True)
         [['a', '甲'], 'or', ['b', '乙'], 'and', ['a', '甲']]
         """
+        self.pairs, self.ops = self.canonical_key(based_on_str_pair_index, exclude_and)
+        return self
+    
+    
+    def canonical_key(
+        self,
+        based_on_str_pair_index: int = 0,
+        exclude_and: bool = False,
+    ) -> tuple[tuple[tuple[str, str], ...], tuple[str, ...]]:
+        '''
+        Return the canonical form given by `logic_order` as a hashable `(pairs, ops)` key, without modifying the object. The name element lists with the same logic (e.g., `a and b or c` and `c or b and a`) have the same key.
         
-        # if the input data is empty, return the object itself
-        if not self.nmmsn_ne_list:
-            return self
+        The pairs are grouped in a single pass, in which the duplicates are removed. Then every group is sorted once, and the (unique) groups are sorted once. The name element lists with only one kind of logical operator, the most common ones, are sorted at once.
+        
+        Examples
+        --------
+        >>> NmmsnNeData([['c', '丙'], 'or', ['b', '乙'], 'and', ['a', '甲']]).canonical_key()
+        ((('a', '甲'), ('b', '乙'), ('c', '丙')), ('and', 'or'))
+        '''
+        # if the input data is empty, the canonical form is empty
+        if not self.pairs:
+            return (), ()
         
-        tuple_lst = self.convert_inner_list_to_tuple()
+        # Fast paths: a single pair, only 'and' (a single group) or only 'or' (groups of a single pair)
+        if len(self.pairs) == 1:
+            return self.pairs, self.ops
+        if 'or' not in self.ops:
+            if exclude_and:
+                return self.pairs, self.ops
+            pairs = self._sort_pairs(set(self.pairs), based_on_str_pair_index)
+            return pairs, ('and',) * (len(pairs) - 1)
+        if 'and' not in self.ops:
+            pairs = self._sort_pairs(set(self.pairs), based_on_str_pair_index)
+            return pairs, ('or',) * (len(pairs) - 1)
         
-        # Split the list into groups based on the 'or' operator
-        groups: list[list[tuple[str, str]]] = []
-        group: list[tuple[str, str]] = []
-        for item in tuple_lst:
-            if item == 'or':
+        # Split the pairs into groups based on the 'or' operator in a single pass, the 'and' operator is implied within a group.
+        # The duplicates are removed meanwhile ("and" level), unless the order of the pairs of a group is kept.
+        groups: list = []
+        group = [self.pairs[0]] if exclude_and else {self.pairs[0]}
+        add = group.append if exclude_and else group.add
+        for op, pair in zip(self.ops, self.pairs[1:]):
+            if op == 'or':
                 groups.append(group)
-                group = []
-            elif item == 'and':
-                pass # Ignore "and" operator. Thus, in groups, there will be no both "and" and "or logic operators.
-            elif isinstance(item, tuple):
-                group.append(item)
-            else:
-                raise ValueError(_("The type of the item in the input data is not tuple or str."))
+                group = [] if exclude_and else set()
+                add = group.append if exclude_and else group.add
+            add(pair)
         groups.append(group)
         
-        new_groups: list[list[tuple[str, str]]] = []
+        # Sort each group, remove duplicates ("or" level), and sort the groups based on the first string pair
         if exclude_and:
-            new_groups = groups
+            unique_groups = set(tuple(group) for group in groups)
         else:
-            # Sort each group that is connected by 'and' operator
-            for group in groups:
-                group = list(set(group)) # remove duplicates ("and" level)
-                group.sort(key=lambda x: x[based_on_str_pair_index])
-                new_groups.append(group)
-        
-        # remove duplicates in new_groups ("or" level)
-        new_groups_tuple = [tuple(i) for i in new_groups]
-        new_groups = [list(x) for x in set(new_groups_tuple)]
-        
-        # sort the groups based on the first string pair
-        new_groups.sort(key=lambda x: x[0][based_on_str_pair_index])
-        
-        # add 'and' operator back
-        new_groups_with_and: list[list[tuple[str, str] | str]] = []
-        for group in new_groups:
-            new_group: list[tuple[str, str] | str] = []
-            for sub_group in group:
-                new_group.append(sub_group)
-                new_group.append('and')
-            new_group.pop()
-            new_groups_with_and.append(new_group)
-        
-        # add 'or' operator back
-        sorted_lst: list[tuple[str, str] | str] = []
-        for group_with_and in new_groups_with_and:
-            sorted_lst.extend(group_with_and)
-            sorted_lst.append('or')
-        
-        # Remove the last 'or'
-        sorted_lst.pop()
-        
-        self.nmmsn_ne_list = self.convert_inner_tuple_to_list(sorted_lst)
+            unique_groups = set(self._sort_pairs(group, based_on_str_pair_index) for group in groups)
+        if based_on_str_pair_index == 0:
+            sorted_groups = sorted(unique_groups)
+        else:
+            sorted_groups = sorted(unique_groups, key=lambda x: (x[0][based_on_str_pair_index], x))
         
-        return self
+        # connect the pairs back with 'and' within a group, and with 'or' between the groups
+        ops: list[str] = []
+        for group in sorted_groups:
+            ops.extend(['and'] * (len(group) - 1))
+            ops.append('or')
+        ops.pop()
+        return tuple(chain.from_iterable(sorted_groups)), tuple(ops)
+    
+    
+    @staticmethod
+    def _sort_pairs(pairs: Iterable[tuple[str, str]], based_on_str_pair_index: int) -> tuple[tuple[str, str], ...]:
+        if based_on_str_pair_index == 0:
+            return tuple(sorted(pairs))
+        return tuple(sorted(pairs, key=lambda x: (x[based_on_str_pair_index], x)))
 
     
     def stringify(
@@ -863,7 +1209,7 @@ class NmmsnNeData:
         
         def process_str(str: str) -> str:
             # remove multiple spaces
-            str = re.sub(r'\s+', ' ', str)
+            str = collapse_whitespace(str)
             # strip leading and trailing spaces
             str = str.strip()
             if with_capital:
@@ -872,8 +1218,8 @@ class NmmsnNeData:
                 str = str.replace(' ', '-')
             return str
         
-        for x in self.nmmsn_ne_list:
-            if isinstance(x, list):
+        for x in self.convert_inner_list_to_tuple():
+            if isinstance(x, tuple):
                 list_str_1.append(process_str(x[0]))
                 list_str_2.append(process_str(x[1]))
             else:
@@ -940,14 +1286,10 @@ class NmmsnNeData:
         >>> NmmsnNeList(lst).extract_map_pairs()
         [['a', '甲], ['b c', '乙 丙'], ['d', '丁'], ['e', '戊'], ['f', '己']]
         '''
-        map_pairs = []
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, list):
-                map_pairs.append(tuple(i))
         # remove duplicates
-        if len(map_pairs) > 0:
-            map_pairs = Mapping(map_pairs).mapping
-        return map_pairs
+        if not self.pairs:
+            return []
+        return Mapping(list(self.pairs)).mapping
     
     
     def extract_first_logical_operator(self) -> str:
@@ -960,12 +1302,7 @@ class NmmsnNeData:
         >>> NmmsnNeList(lst).extract_first_logical_operator()
         'or'
         '''
-        first_logical_operator = ''
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, str):
-                first_logical_operator = i
-                break
-        return first_logical_operator
+        return self.ops[0] if self.ops else ''
     
     
     def extract_logical_operators(self) -> set[str]:
@@ -978,18 +1315,14 @@ class NmmsnNeData:
         >>> NmmsnNeList(lst).extract_logical_operators()
         {'and', 'or'}
         '''
-        logical_operators = set()
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, str):
-                logical_operators.add(i)
-        return logical_operators
+        return set(self.ops)
     
     
     def convert_to_nmmsn_ne_mono(self) -> tuple[list[str], list[str]]:
         list_1 = []
         list_2 = []
-        for i in self.nmmsn_ne_list:
-            if isinstance(i, list):
+        for i in self.convert_inner_list_to_tuple():
+            if isinstance(i, tuple):
                 list_1.append(i[0])
                 list_2.append(i[1])
             else:
@@ -1033,8 +1366,7 @@ def construct_nmmsn_spe_ori(
     """
     error_msg = ''
     
-    spe_ori_ne_data = NmmsnNeData(spe_ori_input)
-    spe_ori_ne_data.validate_empty().validate_only_and_or_only_or().validate_oo_mapping_type()
+    spe_ori_ne_data = NmmsnNeData(spe_ori_input, validate_empty=True, validate_only_and_or_only_or=True, validate_oo_mapping_type=True)
     spe_ori_ne_data.logic_order() # This process will also remove duplicates.
     
     spe_ori_logic = spe_ori_ne_data.extract_first_logical_operator()
@@ -1137,8 +1469,7 @@ def construct_nmmsn_med_par(
     """
     error_msg = ''
         
-    med_par_ne_data = NmmsnNeData(med_par_input)
-    med_par_ne_data.validate_empty().validate_oo_mapping_type()
+    med_par_ne_data = NmmsnNeData(med_par_input, validate_empty=True, validate_oo_mapping_type=True)
     med_par_ne_data.convert_nmmsn_ne_list_to_lower_case()
     med_par_ne_data.logic_order()
 
@@ -1161,8 +1492,7 @@ def construct_nmmsn_spe_des(
     
     error_msg = ''
     
-    spe_des_ne_data = NmmsnNeData(spe_des_input)
-    spe_des_ne_data.validate_oo_mapping_type()
+    spe_des_ne_data = NmmsnNeData(spe_des_input, validate_oo_mapping_type=True)
     spe_des_ne_data.convert_nmmsn_ne_list_to_lower_case()
     spe_des_ne_data.logic_order()
 
@@ -1184,8 +1514,7 @@ def construct_nmmsn_pro_met(
 ) -> tuple[str, str, str, NmmsnNeList]:
     error_msg = ''
     
-    pro_met_ne_data = NmmsnNeData(pro_met_input)
-    pro_met_ne_data.validate_oo_mapping_type()
+    pro_met_ne_data = NmmsnNeData(pro_met_input, validate_oo_mapping_type=True)
     pro_met_ne_data.convert_nmmsn_ne_list_to_lower_case()
     pro_met_ne_data.logic_order(exclude_and=True)
     # * No need to order the logical operators in pro_met. Because the order of the logical operators in pro_met is meaningful.
@@ -1216,7 +1545,169 @@ def construct_nmmsn_pro_met(
     return pro_met_en, pro_met_zh, error_msg, pro_met_ne_ordered
 
 
-def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaOutputFail:
+class NmmsnPipes:
+    '''
+    The pipes called by `construct_nmmsn` to build a NMMSN.
+    
+    This base class simply forwards every call to the corresponding function. Subclasses can override the methods to share work between calls, e.g., `NmmsnBatchPipes` memoizes the results within a batch.
+    
+    The pinyin of NMMSN-zh is generated by a `PinyinEngine`, which caches the pinyin of every term. The default engine (`get_default_pinyin_engine`) is created on first use.
+    '''
+    def __init__(self, pinyin_engine: PinyinEngine | None = None):
+        self._pinyin_engine = pinyin_engine
+    
+    
+    @property
+    def pinyin_engine(self) -> PinyinEngine:
+        if self._pinyin_engine is None:
+            return get_default_pinyin_engine()
+        return self._pinyin_engine
+    
+    
+    def nmm_type(self, nmm_type: str) -> NmmType:
+        return get_nmm_type(nmm_type)
+    
+    def spe_ori(self, spe_ori_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return construct_nmmsn_spe_ori(spe_ori_input)
+    
+    def med_par(self, med_par_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return construct_nmmsn_med_par(med_par_input)
+    
+    def spe_des(self, spe_des_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return construct_nmmsn_spe_des(spe_des_input)
+    
+    def pro_met(self, pro_met_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return construct_nmmsn_pro_met(pro_met_input)
+    
+    def pinyin(self, s: str) -> str:
+        return self.pinyin_engine.convert(s)
+    
+    def error_msg_en_zh(self, error_msg: str) -> EnZh:
+        return internationalize_error_msg(error_msg)
+
+
+def freeze_nmmsn_ne_list(nmmsn_ne_list: NmmsnNeList) -> tuple:
+    '''
+    Convert a (raw) nmmsn_ne_list to a hashable tuple, so that it can be used as a dictionary key.
+    
+    Examples
+    --------
+    >>> freeze_nmmsn_ne_list([['a', '甲'], 'or', ['b', '乙']])
+    (('a', '甲'), 'or', ('b', '乙'))
+    '''
+    return tuple(tuple(i) if isinstance(i, list) else i for i in nmmsn_ne_list)
+
+
+def copy_nmmsn_ne_list(nmmsn_ne_list: NmmsnNeList) -> NmmsnNeList:
+    '''
+    Copy a nmmsn_ne_list and its inner lists (the str are immutable).
+    '''
+    return [list(i) if isinstance(i, list) else i for i in nmmsn_ne_list]
+
+
+class MemoizedException:
+    '''
+    An exception raised by a memoized call, see `memoize_call`. Only the type, the arguments and the attributes of the exception are kept, not the exception itself, so that the frames of the failing call are not kept alive by the memo.
+    '''
+    __slots__ = ('exception_type', 'args', 'attributes')
+    
+    def __init__(self, exception: BaseException):
+        self.exception_type = type(exception)
+        self.args = exception.args
+        self.attributes = dict(exception.__dict__)
+    
+    
+    def rebuild(self) -> BaseException:
+        '''
+        Return a new exception equal to the memoized one. The constructor of the exception type is not called, so that any exception can be rebuilt, whatever the arguments of its constructor.
+        '''
+        exception = self.exception_type.__new__(self.exception_type, *self.args)
+        exception.__dict__.update(self.attributes)
+        return exception
+
+
+def memoize_call(function: Callable, *args) -> Any:
+    '''
+    Call the function, and return its result, or a `MemoizedException` of the exception it raised, so that the exception can be memoized with the results. See `unwrap_memoized`.
+    '''
+    try:
+        return function(*args)
+    except Exception as e:
+        return MemoizedException(e)
+
+
+def unwrap_memoized(result: Any) -> Any:
+    '''
+    Return a result memoized by `memoize_call`, or raise a new copy of the memoized exception. Every call raises its own exception object, so that the concurrent callers (e.g., the threads of a web server) do not share its traceback and context.
+    '''
+    if isinstance(result, MemoizedException):
+        raise result.rebuild()
+    return result
+
+
+class NmmsnBatchPipes(NmmsnPipes):
+    '''
+    Pipes memoizing their results, so that the identical name elements, NMM types, Chinese names and error messages within a batch are only processed once.
+    
+    The exceptions raised by the name element constructors are memoized as well (see `memoize_call`), so that an invalid name element fails in the same way every time.
+    '''
+    def __init__(self, pinyin_engine: PinyinEngine | None = None):
+        super().__init__(pinyin_engine)
+        self.nmm_type_memo: dict[str, NmmType] = {}
+        self.ne_memo: dict[tuple, tuple[str, str, str, NmmsnNeList] | MemoizedException] = {}
+        self.pinyin_memo: dict[str, str] = {}
+        self.error_msg_en_zh_memo: dict[str, tuple[str, str]] = {}
+    
+    
+    def nmm_type(self, nmm_type: str) -> NmmType:
+        if nmm_type not in self.nmm_type_memo:
+            self.nmm_type_memo[nmm_type] = get_nmm_type(nmm_type)
+        return self.nmm_type_memo[nmm_type]
+    
+    
+    def _memoize_ne(self, pipe_name: str, constructor, ne_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        key = (pipe_name, freeze_nmmsn_ne_list(ne_input))
+        if key not in self.ne_memo:
+            self.ne_memo[key] = memoize_call(constructor, ne_input)
+        return unwrap_memoized(self.ne_memo[key])
+    
+    
+    def spe_ori(self, spe_ori_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._memoize_ne('spe_ori', construct_nmmsn_spe_ori, spe_ori_input)
+    
+    def med_par(self, med_par_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._memoize_ne('med_par', construct_nmmsn_med_par, med_par_input)
+    
+    def spe_des(self, spe_des_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._memoize_ne('spe_des', construct_nmmsn_spe_des, spe_des_input)
+    
+    def pro_met(self, pro_met_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._memoize_ne('pro_met', construct_nmmsn_pro_met, pro_met_input)
+    
+    
+    def pinyin(self, s: str) -> str:
+        if s not in self.pinyin_memo:
+            self.pinyin_memo[s] = self.pinyin_engine.convert(s)
+        return self.pinyin_memo[s]
+    
+    
+    def error_msg_en_zh(self, error_msg: str) -> EnZh:
+        from shennongname.snnmma.model import EnZh
+        
+        # A new EnZh object is returned every time, as the output models are mutable.
+        if error_msg not in self.error_msg_en_zh_memo:
+            error_msg_en_zh = internationalize_error_msg(error_msg)
+            self.error_msg_en_zh_memo[error_msg] = (error_msg_en_zh.en, error_msg_en_zh.zh)
+        en, zh = self.error_msg_en_zh_memo[error_msg]
+        return EnZh(en=en, zh=zh)
+
+
+DEFAULT_PIPES = NmmsnPipes()
+
+
+def construct_nmmsn(nmmsn_ne: NmmsnNameElement, pipes: NmmsnPipes = DEFAULT_PIPES) -> SnnmmaOutputSuccess | SnnmmaOutputFail:
+    from shennongname.snnmma.model import NmmsnNameElement, SnnmmaOutputSuccess, SnnmmaOutputFail, Nmmsn, NmmsnZh
+    
     return_fail = SnnmmaOutputFail()
     
     error_msg = ''    
@@ -1224,7 +1715,7 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     
     # name element: nmm_type
-    nmm_type_cls = NmmType(nmmsn_ne.nmm_type)
+    nmm_type_cls = pipes.nmm_type(nmmsn_ne.nmm_type)
     if not nmm_type_cls.is_pafa_pro():
         error_msg = concat_error_msg(error_msg, formulate_error_msg(
             'construct_nmmsn',
@@ -1243,7 +1734,7 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     # name element: spe_ori
     try:
-        spe_ori_la, spe_ori_zh, spe_ori_error_msg, spe_ori_ne_ordered = construct_nmmsn_spe_ori(nmmsn_ne.species_origins)  
+        spe_ori_la, spe_ori_zh, spe_ori_error_msg, spe_ori_ne_ordered = pipes.spe_ori(nmmsn_ne.species_origins)  
         error_msg = concat_error_msg(error_msg, spe_ori_error_msg)
     except Exception as e:
         error_msg = concat_error_msg(error_msg, formulate_error_msg(
@@ -1254,7 +1745,7 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     # name element: med_par
     try:
-        med_par_en, med_par_zh, med_par_error_msg, med_par_ne_ordered = construct_nmmsn_med_par(nmmsn_ne.medicinal_parts)
+        med_par_en, med_par_zh, med_par_error_msg, med_par_ne_ordered = pipes.med_par(nmmsn_ne.medicinal_parts)
         error_msg = concat_error_msg(error_msg, med_par_error_msg)
     except Exception as e:
         error_msg = concat_error_msg(error_msg, formulate_error_msg(
@@ -1265,7 +1756,7 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     # name element: spe_des
     try:
-        spe_des_en, spe_des_zh, spe_des_error_msg, spe_des_ne_ordered = construct_nmmsn_spe_des(nmmsn_ne.special_descriptions)
+        spe_des_en, spe_des_zh, spe_des_error_msg, spe_des_ne_ordered = pipes.spe_des(nmmsn_ne.special_descriptions)
         error_msg = concat_error_msg(error_msg, spe_des_error_msg)
     except Exception as e:
         error_msg = concat_error_msg(error_msg, formulate_error_msg(
@@ -1276,7 +1767,7 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     # name element: pro_met
     try:
-        pro_met_en, pro_met_zh, pro_met_error_msg, pro_met_ne_ordered = construct_nmmsn_pro_met(nmmsn_ne.processing_methods)
+        pro_met_en, pro_met_zh, pro_met_error_msg, pro_met_ne_ordered = pipes.pro_met(nmmsn_ne.processing_methods)
         error_msg = concat_error_msg(error_msg, pro_met_error_msg)
     except Exception as e:
         error_msg = concat_error_msg(error_msg, formulate_error_msg(
@@ -1287,34 +1778,63 @@ def construct_nmmsn(nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaO
     
     if exception_raised:
         return_fail.error_msg = error_msg
-        return_fail.error_msg_en_zh = internationalize_error_msg(error_msg)
+        return_fail.error_msg_en_zh = pipes.error_msg_en_zh(error_msg)
         return return_fail
     
                 
     nmmsn = f'{spe_ori_la} {med_par_en} {spe_des_en} {pro_met_en}'.strip().replace('  ', ' ') # type: ignore
     nmmsn_zh = f'{pro_met_zh}{spe_des_zh}{spe_ori_zh}{med_par_zh}'.strip() # type: ignore
-    
-    return_success = SnnmmaOutputSuccess.model_validate(
-        {
-            "success": True,
-            "error_msg": error_msg,
-            "error_msg_en_zh": internationalize_error_msg(error_msg),
-            "nmmsn": {
-                "nmmsn": nmmsn,
-                "nmmsn_zh": {
-                    "zh": nmmsn_zh,
-                    "pinyin": convert_to_pinyin(nmmsn_zh),
-                },
-                "nmmsn_name_element": {
-                    "nmm_type": nmm_type_cls.nmm_type,
-                    "species_origins": spe_ori_ne_ordered, # type: ignore
-                    "medicinal_parts": med_par_ne_ordered, # type: ignore
-                    "special_descriptions": spe_des_ne_ordered, # type: ignore
-                    "processing_methods": pro_met_ne_ordered, # type: ignore
-                },
-                "nmmsn_seq": [[spe_ori_la, spe_ori_zh], [med_par_en, med_par_zh], [spe_des_en, spe_des_zh], [pro_met_en, pro_met_zh]] # type: ignore
-            }
-        }
+    # The pinyin is converted element by element (and term by term by the pinyin engine), as the elements are concatenated without any connector.
+    nmmsn_pinyin = ' '.join(pipes.pinyin(i.strip()) for i in (pro_met_zh, spe_des_zh, spe_ori_zh, med_par_zh) if i.strip()) # type: ignore
+    
+    # The pieces are already validated and typed, so the output is built without re-validation. The name element lists are copied, as they can be shared by the memoizing pipes while the output models are mutable.
+    return SnnmmaOutputSuccess.construct_trusted(
+        success=True,
+        error_msg=error_msg,
+        error_msg_en_zh=pipes.error_msg_en_zh(error_msg),
+        nmmsn=Nmmsn.construct_trusted(
+            nmmsn=nmmsn,
+            nmmsn_zh=NmmsnZh.construct_trusted(
+                zh=nmmsn_zh,
+                pinyin=nmmsn_pinyin,
+            ),
+            nmmsn_name_element=NmmsnNameElement.construct_trusted(
+                nmm_type=nmm_type_cls.nmm_type,
+                species_origins=copy_nmmsn_ne_list(spe_ori_ne_ordered), # type: ignore
+                medicinal_parts=copy_nmmsn_ne_list(med_par_ne_ordered), # type: ignore
+                special_descriptions=copy_nmmsn_ne_list(spe_des_ne_ordered), # type: ignore
+                processing_methods=copy_nmmsn_ne_list(pro_met_ne_ordered), # type: ignore
+            ),
+            nmmsn_seq=[[spe_ori_la, spe_ori_zh], [med_par_en, med_par_zh], [spe_des_en, spe_des_zh], [pro_met_en, pro_met_zh]], # type: ignore
+        ),
     )
+
+
+def construct_nmmsn_batch(
+    nmmsn_nes: Iterable[NmmsnNameElement],
+) -> list[SnnmmaOutputSuccess | SnnmmaOutputFail]:
+    """
+    Construct the NMMSNs of multiple name elements.
+    
+    The results are the same as calling `construct_nmmsn` on every name element, but the work on identical NMM types, species origins, medicinal parts, special descriptions, processing methods, Chinese names (pinyin) and error messages (translation) is shared across the batch by `NmmsnBatchPipes`.
+    
+    Catalogues of natural medicinal materials are highly repetitive (the same species origins and medicinal parts with a handful of processing methods), thus the batch is expected to be at least 3x faster than a `construct_nmmsn` loop on such data, and no slower on data without any repetition. See `benchmarks/bench_batch.py`.
+
+    Parameters
+    ----------
+    nmmsn_nes : Iterable[NmmsnNameElement]
+        The name elements.
+
+    Returns
+    -------
+    list[SnnmmaOutputSuccess | SnnmmaOutputFail]
+        The results, in the same order as `nmmsn_nes`.
     
-    return return_success
+    Examples
+    --------
+    >>> nmmsn_nes = [NmmsnNameElement(nmm_type='plant', species_origins=[['Ephedra sinica', '草麻黄']], medicinal_parts=[['herbaceous stem', '草质茎']], special_descriptions=[], processing_methods=[])] * 2
+    >>> [i.nmmsn.nmmsn for i in construct_nmmsn_batch(nmmsn_nes)]
+    ['Ephedra sinica Herbaceous-stem', 'Ephedra sinica Herbaceous-stem']
+    """
+    pipes = NmmsnBatchPipes()
+    return [construct_nmmsn(nmmsn_ne, pipes) for nmmsn_ne in nmmsn_nes]
@@ -0,0 +1,242 @@
+'''
+Opt-in caches of NMMSN construction.
+
+Examples
+--------
+>>> nmmsn_cache = NmmsnCache(maxsize=10000)
+>>> result = nmmsn_cache.construct_nmmsn(nmmsn_ne) # same as `construct_nmmsn(nmmsn_ne)`
+>>> nmmsn_cache.stats()
+{'maxsize': 10000, 'size': 1, 'hits': 0, 'misses': 1, 'evictions': 0}
+
+The name element constructors can also be cached separately, so that the name elements sharing some of their species origins, medicinal parts, special descriptions or processing methods share the sub-results:
+>>> cached_pipes = NmmsnCachedPipes(maxsize=10000)
+>>> result = construct_nmmsn(nmmsn_ne, cached_pipes)
+>>> cached_pipes.stats()['spe_ori']
+{'maxsize': 10000, 'size': 1, 'hits': 0, 'misses': 1, 'evictions': 0}
+'''
+
+from collections import OrderedDict
+from collections.abc import Hashable
+import threading
+import time
+from typing import Any
+
+from shennongname.snnmma.algorithm import (
+    get_nmm_type,
+    NmmsnNeData,
+    NmmsnPipes,
+    DEFAULT_PIPES,
+    freeze_nmmsn_ne_list,
+    copy_nmmsn_ne_list,
+    memoize_call,
+    unwrap_memoized,
+    construct_nmmsn_spe_ori,
+    construct_nmmsn_med_par,
+    construct_nmmsn_spe_des,
+    construct_nmmsn_pro_met,
+    construct_nmmsn,
+)
+from shennongname.snnmma.pinyin import PinyinEngine
+from shennongname.snnmma.model import NmmsnNeList, NmmsnNameElement, SnnmmaOutputSuccess, SnnmmaOutputFail
+
+
+class LruCache:
+    '''
+    A bounded, thread-safe least-recently-used cache with hit/miss/eviction counters.
+    
+    With a `ttl` (in seconds), a value expires `ttl` seconds after it is set, an expired value is removed on access and counted as a miss.
+    '''
+    MISSING = object()
+    
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError('maxsize should be at least 1.')
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl should be positive.')
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # the values are stored with their expiration time if `ttl` is set
+        self.data: OrderedDict[Hashable, Any] = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    
+    @staticmethod
+    def clock() -> float:
+        return time.monotonic()
+    
+    
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        '''
+        Return the value of the key and mark it as the most recently used. Return `default` (`LruCache.MISSING` by default) if the key is not cached or expired.
+        '''
+        with self.lock:
+            if key in self.data:
+                value = self.data[key]
+                if self.ttl is not None:
+                    value, expires_at = value
+                    if expires_at <= self.clock():
+                        del self.data[key]
+                        self.misses += 1
+                        return default
+                self.data.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+    
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        '''
+        Cache the value, and evict the least recently used key if the cache is full.
+        '''
+        if self.ttl is not None:
+            value = (value, self.clock() + self.ttl)
+        with self.lock:
+            if key in self.data:
+                self.data.move_to_end(key)
+            self.data[key] = value
+            if len(self.data) > self.maxsize:
+                self.data.popitem(last=False)
+                self.evictions += 1
+    
+    
+    def clear(self) -> None:
+        with self.lock:
+            self.data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    
+    def stats(self) -> dict[str, int]:
+        return {
+            'maxsize': self.maxsize,
+            'size': len(self.data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def canonicalize_nmmsn_ne(nmmsn_ne: NmmsnNameElement) -> tuple | None:
+    '''
+    Return a hashable canonical form of the name element. The name elements with the same canonical form have the same NMMSN.
+    
+    The name element lists are cleaned by `NmmsnNeData` (strip, remove empty pairs, lower case logical operators) and the NMM type is normalized by `NmmType`. Whether the raw processing methods are empty is kept, as `construct_nmmsn` checks it before cleaning.
+    
+    Return None if a name element list is invalid, as the error message depends on the raw input.
+    '''
+    try:
+        ne_lists = tuple(
+            NmmsnNeData(ne_list).freeze()
+            for ne_list in [
+                nmmsn_ne.species_origins,
+                nmmsn_ne.medicinal_parts,
+                nmmsn_ne.special_descriptions,
+                nmmsn_ne.processing_methods,
+            ]
+        )
+    except ValueError:
+        return None
+    return (get_nmm_type(nmmsn_ne.nmm_type).nmm_type, len(nmmsn_ne.processing_methods) == 0, ne_lists)
+
+
+class NmmsnCachedPipes(NmmsnPipes):
+    '''
+    Pipes with a LRU cache for each of the name element constructors (`construct_nmmsn_spe_ori`, `construct_nmmsn_med_par`, `construct_nmmsn_spe_des` and `construct_nmmsn_pro_met`), keyed on their raw input.
+    
+    The exceptions raised by the constructors are cached as well (see `memoize_call`).
+    '''
+    CONSTRUCTORS = {
+        'spe_ori': construct_nmmsn_spe_ori,
+        'med_par': construct_nmmsn_med_par,
+        'spe_des': construct_nmmsn_spe_des,
+        'pro_met': construct_nmmsn_pro_met,
+    }
+    
+    def __init__(self, maxsize: int = 10000, pinyin_engine: PinyinEngine | None = None):
+        super().__init__(pinyin_engine)
+        self.caches = {pipe_name: LruCache(maxsize) for pipe_name in self.CONSTRUCTORS}
+    
+    
+    def _cached_construct(self, pipe_name: str, ne_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        cache = self.caches[pipe_name]
+        key = freeze_nmmsn_ne_list(ne_input)
+        result = cache.get(key)
+        if result is LruCache.MISSING:
+            result = memoize_call(self.CONSTRUCTORS[pipe_name], ne_input)
+            cache.set(key, result)
+        
+        ne_en, ne_zh, error_msg, ne_ordered = unwrap_memoized(result)
+        # copy the inner lists, so that the cached result can not be modified
+        return ne_en, ne_zh, error_msg, copy_nmmsn_ne_list(ne_ordered)
+    
+    
+    def spe_ori(self, spe_ori_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._cached_construct('spe_ori', spe_ori_input)
+    
+    def med_par(self, med_par_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._cached_construct('med_par', med_par_input)
+    
+    def spe_des(self, spe_des_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._cached_construct('spe_des', spe_des_input)
+    
+    def pro_met(self, pro_met_input: NmmsnNeList) -> tuple[str, str, str, NmmsnNeList]:
+        return self._cached_construct('pro_met', pro_met_input)
+    
+    
+    def clear(self) -> None:
+        for cache in self.caches.values():
+            cache.clear()
+    
+    
+    def stats(self) -> dict[str, dict[str, int]]:
+        '''
+        Return the stats of the cache of each constructor.
+        '''
+        return {pipe_name: cache.stats() for pipe_name, cache in self.caches.items()}
+
+
+class NmmsnCache:
+    '''
+    A LRU cache around `construct_nmmsn`, keyed on `canonicalize_nmmsn_ne`.
+    
+    A copy of the cached result is returned, so that the result can be modified without affecting the cache.
+    
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of cached results. The default is 10000.
+    pipes : NmmsnPipes, optional
+        The pipes used by `construct_nmmsn` on a cache miss, e.g., `NmmsnCachedPipes` to also cache the sub-results. The default is `DEFAULT_PIPES`.
+    '''
+    def __init__(self, maxsize: int = 10000, pipes: NmmsnPipes = DEFAULT_PIPES):
+        self.cache = LruCache(maxsize)
+        self.pipes = pipes
+    
+    
+    def construct_nmmsn(self, nmmsn_ne: NmmsnNameElement) -> SnnmmaOutputSuccess | SnnmmaOutputFail:
+        key = canonicalize_nmmsn_ne(nmmsn_ne)
+        if key is None:
+            return construct_nmmsn(nmmsn_ne, self.pipes)
+        
+        result = self.cache.get(key)
+        if result is LruCache.MISSING:
+            result = construct_nmmsn(nmmsn_ne, self.pipes)
+            self.cache.set(key, result)
+        return result.model_copy(deep=True)
+    
+    
+    def clear(self) -> None:
+        self.cache.clear()
+    
+    
+    def stats(self) -> dict[str, int]:
+        return self.cache.stats()
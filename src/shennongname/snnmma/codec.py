@@ -0,0 +1,116 @@
+'''
+Encoder and decoder of the name element string format, e.g., `Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄`.
+
+The format is used as a cache key and in the exported tables, so the encoding is canonical and lossless: for every `NmmsnNeData` accepted by `encode_nmmsn_ne`, `decode_nmmsn_ne(encode_nmmsn_ne(data)).freeze() == data.freeze()`. Unlike `str(NmmsnNeData)`, which is meant for display, the whitespace in the terms is kept as it is. The terms that can not be represented in the format (a term containing `|`, or a logic operator surrounded by spaces, e.g., `a or b`) are rejected by the encoder instead of being silently changed.
+
+The columns are encoded and decoded in bulk: every distinct cell is only converted once, and the results are broadcast back to the cells. The decoded cells are the hashable form `(pairs, ops)` of `NmmsnNeData.freeze`, so the equal cells can share the same object.
+
+Examples
+--------
+>>> encode_nmmsn_ne(NmmsnNeData([['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']]))
+'Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄'
+>>> decode_nmmsn_ne('Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄').freeze()
+((('Ephedra sinica', '草麻黄'), ('Ephedra intermedia', '中麻黄')), ('or',))
+'''
+
+import re
+
+import pandas as pd
+
+from shennongname.snnmma.algorithm import NmmsnNeData
+from shennongname.snnmma.model import NmmsnNeList
+
+
+FrozenNmmsnNe = tuple[tuple[tuple[str, str], ...], tuple[str, ...]]
+
+EMPTY_FROZEN_NMMSN_NE: FrozenNmmsnNe = ((), ())
+PAIR_SEPARATOR = ' | '
+# the logic operators are surrounded by single spaces, see `NmmsnNeData.init_from_str`
+LOGIC_OPERATOR_SEPARATORS = {op: f' {op} ' for op in NmmsnNeData.AVAIL_LOGIC_OPERATOR}
+# a term is ambiguous if it contains `|`, or a logic operator at its ends or surrounded by spaces
+AMBIGUOUS_TERM_PATTERN = re.compile(r'\||(?:^| )(?:' + '|'.join(NmmsnNeData.AVAIL_LOGIC_OPERATOR) + r')(?: |$)')
+
+
+def _freeze(nmmsn_ne: NmmsnNeData | NmmsnNeList | FrozenNmmsnNe) -> FrozenNmmsnNe:
+    if isinstance(nmmsn_ne, NmmsnNeData):
+        return nmmsn_ne.freeze()
+    if isinstance(nmmsn_ne, tuple):
+        # already frozen by `NmmsnNeData.freeze`
+        return nmmsn_ne
+    return NmmsnNeData(nmmsn_ne).freeze()
+
+
+def encode_frozen_nmmsn_ne(pairs: tuple[tuple[str, str], ...], ops: tuple[str, ...]) -> str:
+    '''
+    Encode the hashable form `(pairs, ops)` of `NmmsnNeData.freeze`, see `encode_nmmsn_ne`.
+    '''
+    if not pairs:
+        return ''
+    search = AMBIGUOUS_TERM_PATTERN.search
+    encoded_pairs = []
+    for en, zh in pairs:
+        if search(en) or search(zh):
+            raise ValueError(f'The str pair {[en, zh]} can not be encoded, a term should not contain "|" or a logic operator surrounded by spaces.')
+        encoded_pairs.append(f'{en}{PAIR_SEPARATOR}{zh}')
+    # the same logic operator is joined at once
+    if len(set(ops)) == 1:
+        return LOGIC_OPERATOR_SEPARATORS[ops[0]].join(encoded_pairs)
+    parts = [encoded_pairs[0]]
+    for op, encoded_pair in zip(ops, encoded_pairs[1:]):
+        parts.append(LOGIC_OPERATOR_SEPARATORS[op])
+        parts.append(encoded_pair)
+    return ''.join(parts)
+
+
+def encode_nmmsn_ne(nmmsn_ne: NmmsnNeData | NmmsnNeList | FrozenNmmsnNe) -> str:
+    '''
+    Encode a name element to the string format. The empty name element is encoded as an empty string.
+
+    Examples
+    --------
+    >>> encode_nmmsn_ne([['a', '甲'], 'OR', ['b  c', '乙'], 'and', ['d', '丁']])
+    'a | 甲 or b  c | 乙 and d | 丁'
+    >>> encode_nmmsn_ne([['a or b', '甲']])
+    Traceback (most recent call last):
+    ...
+    ValueError: The str pair ['a or b', '甲'] can not be encoded, a term should not contain "|" or a logic operator surrounded by spaces.
+    '''
+    return encode_frozen_nmmsn_ne(*_freeze(nmmsn_ne))
+
+
+def decode_nmmsn_ne(nmmsn_ne_str: str) -> NmmsnNeData:
+    '''
+    Decode a name element string, same as `NmmsnNeData.init_from_str`. The strings not produced by `encode_nmmsn_ne` (e.g., with irregular spaces) are accepted as well.
+    '''
+    return NmmsnNeData.init_from_str(nmmsn_ne_str)
+
+
+def encode_nmmsn_ne_series(series: pd.Series) -> pd.Series:
+    '''
+    Encode a column of name elements (`NmmsnNeData`, `NmmsnNeList` or the hashable form of `NmmsnNeData.freeze`). Every distinct name element is only encoded once. The missing cells (None) are encoded as empty strings.
+    '''
+    encoded: dict[FrozenNmmsnNe, str] = {}
+    result = []
+    for nmmsn_ne in series:
+        frozen = EMPTY_FROZEN_NMMSN_NE if nmmsn_ne is None else _freeze(nmmsn_ne)
+        encoded_nmmsn_ne = encoded.get(frozen)
+        if encoded_nmmsn_ne is None:
+            encoded_nmmsn_ne = encoded[frozen] = encode_frozen_nmmsn_ne(*frozen)
+        result.append(encoded_nmmsn_ne)
+    return pd.Series(result, index=series.index, name=series.name, dtype=object)
+
+
+def decode_nmmsn_ne_series(series: pd.Series) -> pd.Series:
+    '''
+    Decode a column of name element strings to the hashable form `(pairs, ops)` of `NmmsnNeData.freeze`. Every distinct cell is only decoded once, and the equal cells share the same tuple. The missing cells (NaN) are decoded as empty name elements.
+
+    Examples
+    --------
+    >>> decode_nmmsn_ne_series(pd.Series(['a | 甲', 'a | 甲 or b | 乙', 'a | 甲'])).tolist()
+    [((('a', '甲'),), ()), ((('a', '甲'), ('b', '乙')), ('or',)), ((('a', '甲'),), ())]
+    '''
+    codes, uniques = pd.factorize(series, sort=False)
+    decoded = [NmmsnNeData.init_from_str(str(i)).freeze() for i in uniques]
+    # the missing cells have the code -1, i.e., the empty name element appended at the end
+    decoded.append(EMPTY_FROZEN_NMMSN_NE)
+    return pd.Series([decoded[i] for i in codes], index=series.index, name=series.name, dtype=object)
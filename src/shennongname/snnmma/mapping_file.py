@@ -0,0 +1,269 @@
+'''
+Compact on-disk format of `Mapping`, loaded by memory mapping.
+
+Building a large `Mapping` (e.g., a term dictionary of 100k+ items) from Python tuples takes time in every process, and every process keeps its own copy. A mapping file is written once by `save_mapping`, then `MappedMapping` maps it read-only: the loading is immediate, the pages are shared by all the processes (e.g., gunicorn workers) through the page cache, and the lookups are served directly from the mapped buffer by binary search.
+
+File layout (native byte order, all the offsets are uint32):
+```
+header           MAGIC, byte order mark, number of items, sizes of the key and value blobs, mapping type, ignore_case
+key_offsets      n + 1 offsets of the keys in the key blob, the items are sorted by (key, value)
+value_offsets    n + 1 offsets of the values in the value blob
+backward_order   n item indexes, sorted by (value, key)
+key_blob         the UTF-8 encoded keys
+value_blob       the UTF-8 encoded values
+```
+The UTF-8 byte order is the same as the str order, so the encoded keys can be compared directly.
+'''
+
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterator
+from pathlib import Path
+
+from shennongname.snnmma.algorithm import Mapping
+
+
+# the typecode of uint32 for `array` and `memoryview.cast`, the size of the C types depends on the platform
+UINT32 = next(typecode for typecode in 'IL' if array(typecode).itemsize == 4)
+MAGIC = b'SNNMAP01'
+BYTE_ORDER_MARK = 0x01020304
+HEADER = struct.Struct('=8sIIII2s?5x')
+
+
+def save_mapping(mapping: Mapping, path: str | Path) -> None:
+    '''
+    Write a `Mapping` to a mapping file, see `MappedMapping`.
+    '''
+    items = mapping.mapping # sorted by (key, value)
+    keys = [key.encode('utf-8') for key, _ in items]
+    values = [value.encode('utf-8') for _, value in items]
+    backward_order = sorted(range(len(items)), key=lambda i: (values[i], keys[i]))
+
+    def offsets(blobs: list[bytes]) -> array:
+        result = array(UINT32, [0])
+        for blob in blobs:
+            result.append(result[-1] + len(blob))
+        return result
+
+    key_offsets = offsets(keys)
+    value_offsets = offsets(values)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(
+            MAGIC,
+            BYTE_ORDER_MARK,
+            len(items),
+            key_offsets[-1],
+            value_offsets[-1],
+            mapping.mapping_type.encode('ascii'),
+            mapping.ignore_case,
+        ))
+        f.write(key_offsets.tobytes())
+        f.write(value_offsets.tobytes())
+        f.write(array(UINT32, backward_order).tobytes())
+        f.write(b''.join(keys))
+        f.write(b''.join(values))
+
+
+class StrTable:
+    '''
+    A read-only sequence of the encoded str of a blob, which starts at `base` in the buffer. It is used by `bisect`, without decoding the blob.
+    '''
+    def __init__(self, buffer: mmap.mmap, base: int, offsets: memoryview):
+        self.buffer = buffer
+        self.base = base
+        self.offsets = offsets
+
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+    def __getitem__(self, i: int) -> bytes:
+        # slicing the mmap gives bytes directly
+        return self.buffer[self.base + self.offsets[i]:self.base + self.offsets[i + 1]]
+
+
+class OrderedStrTable(StrTable):
+    '''
+    A `StrTable` in the order of `order`.
+    '''
+    def __init__(self, buffer: mmap.mmap, base: int, offsets: memoryview, order: memoryview):
+        super().__init__(buffer, base, offsets)
+        self.order = order
+
+
+    def __getitem__(self, i: int) -> bytes:
+        return super().__getitem__(self.order[i])
+
+
+class ItemTable:
+    '''
+    The encoded (key, value) items of a `MappedMapping`, used by `bisect`.
+    '''
+    def __init__(self, mapped_mapping: 'MappedMapping'):
+        self.mapped_mapping = mapped_mapping
+
+
+    def __len__(self) -> int:
+        return self.mapped_mapping.size
+
+
+    def __getitem__(self, i: int) -> tuple[bytes, bytes]:
+        return self.mapped_mapping.keys[i], self.mapped_mapping.values[i]
+
+
+class MappedMapping:
+    '''
+    A read-only `Mapping` served from a memory-mapped mapping file written by `save_mapping`.
+
+    The lookups (`get_values`, `get_keys`, `in`) take O(log n) comparisons in the mapped buffer. The keys and values are stripped (and converted to lower case if the mapping ignores case) before lookup, as `Mapping` does.
+
+    Examples
+    --------
+    >>> save_mapping(Mapping([('appla', 'apple'), ('appli', 'apple')]), 'mapping.bin')
+    >>> with MappedMapping('mapping.bin') as mapping:
+    ...     mapping.get_keys('apple')
+    {'appla', 'appli'}
+    '''
+    def __init__(self, path: str | Path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+
+    def _load(self) -> None:
+        if len(self._mmap) < HEADER.size:
+            raise ValueError('Invalid mapping file: too short.')
+        magic, byte_order_mark, n_items, key_blob_size, value_blob_size, mapping_type, ignore_case = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            raise ValueError('Invalid mapping file: unknown format.')
+        if byte_order_mark != BYTE_ORDER_MARK:
+            raise ValueError('Invalid mapping file: written with another byte order.')
+        self.size: int = n_items
+        self.mapping_type: str = mapping_type.decode('ascii')
+        self.ignore_case: bool = ignore_case
+
+        section_sizes = [(n_items + 1) * 4, (n_items + 1) * 4, n_items * 4, key_blob_size, value_blob_size]
+        if HEADER.size + sum(section_sizes) != len(self._mmap):
+            raise ValueError('Invalid mapping file: unexpected size.')
+        buffer = memoryview(self._mmap)
+        self._views.append(buffer)
+        sections = []
+        start = HEADER.size
+        for section_size in section_sizes[:3]:
+            sections.append(buffer[start:start + section_size])
+            start += section_size
+        self._views += sections
+        key_offsets, value_offsets, backward_order = sections
+        key_blob_base = start
+        value_blob_base = start + key_blob_size
+
+        self._key_offsets = key_offsets.cast(UINT32)
+        self._value_offsets = value_offsets.cast(UINT32)
+        self._backward_order = backward_order.cast(UINT32)
+        self._views += [self._key_offsets, self._value_offsets, self._backward_order]
+        self.keys = StrTable(self._mmap, key_blob_base, self._key_offsets)
+        self.values = StrTable(self._mmap, value_blob_base, self._value_offsets)
+        self.backward_values = OrderedStrTable(self._mmap, value_blob_base, self._value_offsets, self._backward_order)
+
+
+    def close(self) -> None:
+        # the views of the buffer must be released before closing the mmap
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+
+    def __enter__(self) -> 'MappedMapping':
+        return self
+
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+    def _normalize(self, s: str) -> bytes:
+        s = s.strip()
+        if self.ignore_case:
+            s = s.lower()
+        return s.encode('utf-8')
+
+
+    def __len__(self) -> int:
+        return self.size
+
+
+    def get_values(self, key: str) -> set[str]:
+        '''
+        Return the values of a key (an empty set if the key does not exist).
+        '''
+        encoded_key = self._normalize(key)
+        values = set()
+        i = bisect_left(self.keys, encoded_key)
+        while i < self.size and self.keys[i] == encoded_key:
+            values.add(self.values[i].decode('utf-8'))
+            i += 1
+        return values
+
+
+    def get_keys(self, value: str) -> set[str]:
+        '''
+        Return the keys of a value (an empty set if the value does not exist).
+        '''
+        encoded_value = self._normalize(value)
+        keys = set()
+        i = bisect_left(self.backward_values, encoded_value)
+        while i < self.size and self.backward_values[i] == encoded_value:
+            keys.add(self.keys[self._backward_order[i]].decode('utf-8'))
+            i += 1
+        return keys
+
+
+    def get(self, key: str, default: str | None = None) -> str | None:
+        '''
+        Return the (first) value of a key, or `default` if the key does not exist.
+        '''
+        encoded_key = self._normalize(key)
+        i = bisect_left(self.keys, encoded_key)
+        if i < self.size and self.keys[i] == encoded_key:
+            return self.values[i].decode('utf-8')
+        return default
+
+
+    def __contains__(self, item: tuple[str, str]) -> bool:
+        key, value = item
+        item_encoded = (self._normalize(key), self._normalize(value))
+        i = bisect_left(ItemTable(self), item_encoded)
+        return i < self.size and (self.keys[i], self.values[i]) == item_encoded
+
+
+    def items(self) -> Iterator[tuple[str, str]]:
+        '''
+        Iterate over the items, sorted by (key, value).
+        '''
+        for i in range(self.size):
+            yield self.keys[i].decode('utf-8'), self.values[i].decode('utf-8')
+
+
+    def get_forward_mapping(self) -> dict[str, str]:
+        '''
+        Same as `Mapping.get_forward_mapping`, the dict is built in memory. Use `get` to look up the terms without copying the mapping, as `TermStandardizer` does.
+        '''
+        return self.to_mapping().get_forward_mapping()
+
+
+    def to_mapping(self) -> Mapping:
+        '''
+        Build a (modifiable) `Mapping` in memory.
+        '''
+        # the items are already normalized
+        return Mapping(list(self.items()), ignore_case=self.ignore_case)
+
@@ -1,4 +1,9 @@
-from pydantic import BaseModel
+from typing import Self
+
+from pydantic import BaseModel, ConfigDict
+from pydantic_core import to_json
+
+from shennongname.lang.lang import get_translation
 
 
 # Type alias
@@ -22,7 +27,29 @@ Examples:
 '''
 
 
-class NmmsnNameElement(BaseModel):
+class DeferredBuildModel(BaseModel):
+    '''
+    The validators and serializers of the models are built on first use instead of at import, which keeps the import of `shennongname` fast.
+    '''
+    model_config = ConfigDict(defer_build=True)
+    
+    
+    @classmethod
+    def construct_trusted(cls, **values) -> Self:
+        '''
+        Create a model from trusted values (already validated and of the field types), without validation.
+        
+        It is a lighter `model_construct`, for the outputs built on every request: there is no alias or default lookup, so all the fields should be given, and they are all considered set.
+        '''
+        model = cls.__new__(cls)
+        object.__setattr__(model, '__dict__', values)
+        object.__setattr__(model, '__pydantic_fields_set__', set(values))
+        object.__setattr__(model, '__pydantic_extra__', None)
+        object.__setattr__(model, '__pydantic_private__', None)
+        return model
+
+
+class NmmsnNameElement(DeferredBuildModel):
     nmm_type: str
     species_origins: NmmsnNeList
     medicinal_parts: NmmsnNeList
@@ -30,31 +57,58 @@ class NmmsnNameElement(BaseModel):
     processing_methods: NmmsnNeList
 
 
-class EnZh(BaseModel):
+class EnZh(DeferredBuildModel):
     en: str = ''
     zh: str = ''
 
 
-class SnnmmaOutputFail(BaseModel):
+class SnnmmaOutputFail(DeferredBuildModel):
     success: bool = False
     error_msg: str = ''
     error_msg_en_zh: EnZh = EnZh()
 
 
-class NmmsnZh(BaseModel):
+class NmmsnZh(DeferredBuildModel):
     zh: str
     pinyin: str
 
 
-class Nmmsn(BaseModel):
+class Nmmsn(DeferredBuildModel):
     nmmsn: str
     nmmsn_zh: NmmsnZh
     nmmsn_name_element: NmmsnNameElement
     nmmsn_seq: NmmsnSeq
 
 
-class SnnmmaOutputSuccess(BaseModel):
+class SnnmmaOutputSuccess(DeferredBuildModel):
     success: bool = True
     error_msg: str = ''
     error_msg_en_zh: EnZh = EnZh()
     nmmsn: Nmmsn
+
+
+def dump_json_bytes(model: BaseModel) -> bytes:
+    '''
+    Serialize a model to UTF-8 encoded JSON directly, without the intermediate dict of `model_dump` (or the str of `model_dump_json`).
+    
+    Examples
+    --------
+    >>> dump_json_bytes(EnZh(en='stem', zh='茎'))
+    b'{"en":"stem","zh":"\\xe8\\x8c\\x8e"}'
+    '''
+    return to_json(model)
+
+
+def build_fail_output(error_msg: str) -> SnnmmaOutputFail:
+    '''
+    The output of a request (or a line) that can not be named, e.g., an invalid name element, with the error message translated to Chinese.
+    '''
+    _ = get_translation('zh')
+    return SnnmmaOutputFail.model_validate({
+        'success': False,
+        'error_msg': error_msg,
+        'error_msg_en_zh': {
+            'en': error_msg,
+            'zh': str(_(error_msg)),
+        },
+    })
@@ -0,0 +1,150 @@
+'''
+String normalization helpers with precompiled regular expressions.
+
+The patterns are compiled once at import (or once per separator tuple for the split patterns), so that the name construction does not go through the pattern cache of `re` on every call.
+'''
+
+from functools import lru_cache
+import re
+
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+HYPHENS_PATTERN = re.compile(r'-+')
+ERROR_MSG_PIPE_PATTERN = re.compile(r'^Pipe:.*Reason: ')
+
+
+def collapse_whitespace(s: str) -> str:
+    '''
+    Replace consecutive whitespace characters with a single space.
+    
+    Examples
+    --------
+    >>> collapse_whitespace(' a \\t  b ')
+    ' a b '
+    '''
+    return WHITESPACE_PATTERN.sub(' ', s)
+
+
+def remove_whitespace(s: str) -> str:
+    return WHITESPACE_PATTERN.sub('', s)
+
+
+def collapse_hyphens(s: str) -> str:
+    '''
+    Replace consecutive hyphens with a single hyphen.
+    '''
+    return HYPHENS_PATTERN.sub('-', s)
+
+
+@lru_cache(maxsize=128)
+def get_char_class_pattern(chars: str) -> re.Pattern:
+    '''
+    Return the compiled pattern `[{chars}]` matching any of the characters.
+    '''
+    return re.compile(f'[{chars}]')
+
+
+def remove_chars(s: str, chars: str) -> str:
+    '''
+    Remove all the characters in `chars` from the string.
+    
+    Examples
+    --------
+    >>> remove_chars('（原）板蓝', '（）')
+    '原板蓝'
+    '''
+    return get_char_class_pattern(chars).sub('', s)
+
+
+@lru_cache(maxsize=128)
+def get_split_pattern(split_words: tuple[str, ...], keep_sep: bool = False) -> re.Pattern:
+    '''
+    Return the compiled pattern splitting a sentence by the words. With `keep_sep`, every word is a named capture group (named after the stripped word), so that the words are kept by `re.split`.
+    
+    The words are used as regular expressions (they are not escaped).
+    '''
+    if keep_sep:
+        return re.compile('|'.join(f'(?P<{sep.strip()}>{sep})' for sep in split_words))
+    return re.compile('|'.join(split_words))
+
+
+@lru_cache(maxsize=128)
+def get_spaced_word_split_pattern(words: tuple[str, ...]) -> re.Pattern:
+    '''
+    Return the compiled pattern splitting a sentence by the words surrounded by single spaces, e.g., `' and '`. The words are captured (without the spaces), so that `re.split` returns the parts and the words alternately.
+    
+    Examples
+    --------
+    >>> get_spaced_word_split_pattern(('or', 'and')).split(' a and b ')
+    [' a', 'and', 'b ']
+    '''
+    return re.compile(' (' + '|'.join(words) + ') ')
+
+
+# Single-pass character class normalization
+
+NON_PRINTABLE_ASCII_PATTERN = re.compile(r'[^\x20-\x7f]')
+
+
+def is_printable_ascii(s: str) -> bool:
+    return NON_PRINTABLE_ASCII_PATTERN.search(s) is None
+
+
+def get_non_printable_ascii_characters(s: str) -> set[str]:
+    return set(NON_PRINTABLE_ASCII_PATTERN.findall(s))
+
+
+def replace_non_printable_ascii(s: str, replacement: str = '') -> str:
+    '''
+    Replace the non-printable-ASCII characters, collapse whitespace and strip.
+    
+    Examples
+    --------
+    >>> replace_non_printable_ascii('Hello \\x00 World!', '?')
+    'Hello ? World!'
+    '''
+    # escape the backslashes, as the replacement of `re.sub` is a template
+    s = NON_PRINTABLE_ASCII_PATTERN.sub(replacement.replace('\\', '\\\\'), s)
+    return collapse_whitespace(s).strip()
+
+
+class AlphabetHyphenSpaceTable(dict):
+    '''
+    A `str.translate` table keeping the alphabetic characters (`str.isalpha`, including Chinese characters), hyphens and spaces, and replacing the other characters with `replacement`.
+    
+    The table is filled lazily: the first time a character is translated, its class is computed and cached.
+    '''
+    def __init__(self, replacement: str):
+        super().__init__()
+        self.replacement = replacement
+        # Without whitespace in the replacement, the only whitespace left after translation is the space.
+        self.only_space_left = not any(c.isspace() for c in replacement)
+    
+    def __missing__(self, code: int) -> str:
+        c = chr(code)
+        value = c if c.isalpha() or c == '-' or c == ' ' else self.replacement
+        self[code] = value
+        return value
+
+
+@lru_cache(maxsize=32)
+def get_alphabet_hyphen_space_table(replacement: str) -> AlphabetHyphenSpaceTable:
+    return AlphabetHyphenSpaceTable(replacement)
+
+
+def replace_non_alphabet_and_hyphen_and_space(s: str, replacement: str = '') -> str:
+    '''
+    Replace the characters other than alphabets, hyphens and spaces, collapse whitespace and hyphens, and strip.
+    
+    Examples
+    --------
+    >>> replace_non_alphabet_and_hyphen_and_space('Ephedra sinica × intermedia', '?')
+    'Ephedra sinica ? intermedia'
+    '''
+    table = get_alphabet_hyphen_space_table(replacement)
+    s = s.translate(table)
+    if not table.only_space_left or '  ' in s:
+        s = collapse_whitespace(s)
+    if '--' in s:
+        s = collapse_hyphens(s)
+    return s.strip()
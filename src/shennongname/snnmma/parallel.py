@@ -0,0 +1,145 @@
+'''
+Multi-process engine to construct the NMMSNs of large catalogues.
+
+The name elements are sharded into chunks, every chunk is named by `construct_nmmsn_batch` in a worker process, and the results are streamed back in the input order as soon as they are ready. The workers are warmed up once when they start (pypinyin dictionaries, gettext catalogs), and the pool can be reused across calls.
+
+Examples
+--------
+>>> with NmmsnProcessPool(jobs=8) as pool:
+...     for result in pool.construct_nmmsn(nmmsn_nes):
+...         print(result.success)
+'''
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+import multiprocessing
+from multiprocessing.context import BaseContext
+import os
+from typing import TypeVar
+
+from shennongname.snnmma.algorithm import construct_nmmsn, construct_nmmsn_batch, convert_to_pinyin
+from shennongname.snnmma.model import NmmsnNameElement, SnnmmaOutputSuccess, SnnmmaOutputFail
+
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def chunk_iterable(items: Iterable[T], chunksize: int) -> Iterator[list[T]]:
+    '''
+    Group the items into lists of `chunksize` items (the last list may be shorter).
+
+    Examples
+    --------
+    >>> list(chunk_iterable(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    '''
+    iterator = iter(items)
+    while chunk := list(islice(iterator, chunksize)):
+        yield chunk
+
+
+def warm_up_worker() -> None:
+    '''
+    Load the pypinyin dictionaries and the gettext catalogs, and build the pydantic models (all of them are loaded on first use), so that the first chunk of a worker is not slowed down by them.
+    '''
+    construct_nmmsn(NmmsnNameElement(
+        nmm_type='processed',
+        species_origins=[['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+        medicinal_parts=[['stem herbaceous', '草质茎']],
+        special_descriptions=[],
+        processing_methods=[['segmented', '段制']],
+    ))
+    convert_to_pinyin('神农')
+
+
+class NmmsnProcessPool:
+    '''
+    A pool of worker processes constructing NMMSNs.
+    
+    With `jobs=1`, no process is started and the chunks are processed in the current process, which gives the same results.
+
+    Parameters
+    ----------
+    jobs : int | None, optional
+        The number of worker processes. The default is None, which uses `os.cpu_count()`.
+    chunksize : int, optional
+        The number of items sent to a worker at once. Large chunks amortize the inter-process communication and share more work in `construct_nmmsn_batch`. The default is 1000.
+    mp_context : BaseContext | None, optional
+        The multiprocessing context. The default is None, which uses the default context of the platform. The current process is warmed up before starting the workers, thus with `fork`, the workers share the loaded dictionaries of the current process.
+    '''
+    def __init__(
+        self,
+        jobs: int | None = None,
+        chunksize: int = 1000,
+        mp_context: BaseContext | None = None,
+    ):
+        self.jobs = jobs or os.cpu_count() or 1
+        self.chunksize = chunksize
+        if self.jobs < 1:
+            raise ValueError('jobs should be at least 1.')
+        if self.chunksize < 1:
+            raise ValueError('chunksize should be at least 1.')
+        
+        self.pool = None
+        if self.jobs > 1:
+            mp_context = mp_context or multiprocessing.get_context()
+            warm_up_worker()
+            self.pool = mp_context.Pool(self.jobs, initializer=warm_up_worker)
+    
+    
+    def __enter__(self) -> 'NmmsnProcessPool':
+        return self
+    
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+    
+    
+    def map_chunks(self, func: Callable[[list[T]], list[R]], items: Iterable[T]) -> Iterator[R]:
+        '''
+        Shard the items into chunks, apply `func` to every chunk in the workers and yield the results in the input order.
+        
+        `func` must be picklable (a module-level function) and return one result per item of the chunk. The items are consumed lazily, so that `items` can be a stream.
+        '''
+        chunks = chunk_iterable(items, self.chunksize)
+        if self.pool is None:
+            for chunk in chunks:
+                yield from func(chunk)
+            return
+        
+        # At most 2 chunks per worker are in flight, so that the memory usage does not depend on the size of `items` (`Pool.imap` would consume all the items at once).
+        pending = deque()
+        for chunk in chunks:
+            pending.append(self.pool.apply_async(func, (chunk,)))
+            if len(pending) >= 2 * self.jobs:
+                yield from pending.popleft().get()
+        while pending:
+            yield from pending.popleft().get()
+    
+    
+    def construct_nmmsn(self, nmmsn_nes: Iterable[NmmsnNameElement]) -> Iterator[SnnmmaOutputSuccess | SnnmmaOutputFail]:
+        '''
+        Construct the NMMSNs of the name elements, same as `construct_nmmsn_batch`, but in the worker processes.
+        '''
+        return self.map_chunks(construct_nmmsn_batch, nmmsn_nes)
+
+
+def construct_nmmsn_parallel(
+    nmmsn_nes: Iterable[NmmsnNameElement],
+    jobs: int | None = None,
+    chunksize: int = 1000,
+) -> Iterator[SnnmmaOutputSuccess | SnnmmaOutputFail]:
+    '''
+    Construct the NMMSNs of the name elements with a temporary `NmmsnProcessPool`, and yield the results in the input order.
+    '''
+    with NmmsnProcessPool(jobs=jobs, chunksize=chunksize) as pool:
+        yield from pool.construct_nmmsn(nmmsn_nes)
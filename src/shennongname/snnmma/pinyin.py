@@ -0,0 +1,137 @@
+'''
+Pinyin engine for NMMSN-zh.
+
+NMMSN-zh are made of a small closed vocabulary of Chinese terms (species, medicinal parts, special descriptions and processing methods) connected by "或" and "与", or concatenated without any connector (e.g., `段制草麻黄草质茎`). Thus, the pinyin is generated segment by segment (split by the connectors), every segment is split into the known terms of a precomputed table (longest match first), and the remaining text between the known terms is converted by pypinyin once and cached.
+
+The precomputed table is a JSON file (`{"草麻黄": "cǎo má huáng", ...}`) built by `PinyinEngine.save`. The default engine (`get_default_pinyin_engine`) loads the table given by the environment variable `SHENNONGNAME_PINYIN_TABLE`, if any, on first use.
+'''
+
+from collections.abc import Iterable
+from functools import lru_cache
+import json
+import os
+from pathlib import Path
+import re
+
+
+PINYIN_TABLE_ENV = 'SHENNONGNAME_PINYIN_TABLE'
+
+
+class PinyinEngine:
+    CONNECTORS = {'或': 'huò', '与': 'yǔ'}
+    CONNECTOR_PATTERN = re.compile(f"({'|'.join(CONNECTORS)})")
+    
+    
+    def __init__(self, table: dict[str, str] | None = None, cache_maxsize: int = 100000):
+        self.table: dict[str, str] = dict(table or {})
+        self.max_term_length = max(map(len, self.table), default=0)
+        self.convert_segment = lru_cache(maxsize=cache_maxsize)(self._convert_segment)
+    
+    
+    @staticmethod
+    def _convert_segment(segment: str) -> str:
+        # pypinyin loads its large phrase dictionaries at import, thus it is imported on first use.
+        from pypinyin import pinyin
+        return ' '.join([i[0] for i in pinyin(segment)])
+    
+    
+    def convert(self, s: str) -> str:
+        '''
+        Convert a NMMSN-zh to pinyin.
+        
+        Examples
+        --------
+        >>> PinyinEngine().convert('木贼麻黄或草麻黄草质茎')
+        'mù zéi má huáng huò cǎo má huáng cǎo zhì jīng'
+        '''
+        result = []
+        for segment in self.CONNECTOR_PATTERN.split(s):
+            if not segment:
+                continue
+            if segment in self.CONNECTORS:
+                result.append(self.CONNECTORS[segment])
+            elif segment in self.table:
+                result.append(self.table[segment])
+            elif self.max_term_length:
+                result += self.convert_terms(segment)
+            else:
+                result.append(self.convert_segment(segment))
+        return ' '.join(result)
+    
+    
+    def convert_terms(self, segment: str) -> list[str]:
+        '''
+        Convert a segment made of concatenated terms: the longest known term is matched at every position, and the text between the known terms is converted by pypinyin.
+        
+        Examples
+        --------
+        >>> PinyinEngine({'段制': 'duàn zhì', '草质茎': 'cǎo zhì jīng'}).convert_terms('段制草麻黄草质茎')
+        ['duàn zhì', 'cǎo má huáng', 'cǎo zhì jīng']
+        '''
+        result = []
+        n = len(segment)
+        unknown_start = i = 0
+        while i < n:
+            for length in range(min(self.max_term_length, n - i), 0, -1):
+                term = segment[i:i + length]
+                if term in self.table:
+                    break
+            else:
+                i += 1
+                continue
+            if unknown_start < i:
+                result.append(self.convert_segment(segment[unknown_start:i]))
+            result.append(self.table[term])
+            i += length
+            unknown_start = i
+        if unknown_start < n:
+            result.append(self.convert_segment(segment[unknown_start:]))
+        return result
+    
+    
+    def add_terms(self, terms: Iterable[str]) -> 'PinyinEngine':
+        '''
+        Precompute the pinyin of the terms into the table.
+        '''
+        for term in terms:
+            term = term.strip()
+            if term and term not in self.table:
+                self.table[term] = self._convert_segment(term)
+                self.max_term_length = max(self.max_term_length, len(term))
+        return self
+    
+    
+    def save(self, path: str | Path) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.table, f, ensure_ascii=False, indent=0, sort_keys=True)
+    
+    
+    @classmethod
+    def load(cls, path: str | Path, cache_maxsize: int = 100000) -> 'PinyinEngine':
+        with open(path, encoding='utf-8') as f:
+            table = json.load(f)
+        if not isinstance(table, dict):
+            raise ValueError(f'The pinyin table {path} is not a JSON object.')
+        return cls(table, cache_maxsize)
+    
+    
+    @classmethod
+    def from_env(cls) -> 'PinyinEngine':
+        '''
+        Create an engine with the table given by the environment variable `SHENNONGNAME_PINYIN_TABLE`, or with an empty table. Raise a ValueError if the table can not be loaded.
+        '''
+        path = os.getenv(PINYIN_TABLE_ENV)
+        if path:
+            try:
+                return cls.load(path)
+            except (OSError, ValueError) as e:
+                raise ValueError(f'Unable to load the pinyin table {path} given by the environment variable {PINYIN_TABLE_ENV}: {e}') from e
+        return cls()
+
+
+@lru_cache(maxsize=1)
+def get_default_pinyin_engine() -> PinyinEngine:
+    '''
+    Return the engine used by default, created by `PinyinEngine.from_env` on first use, so that a bad table only fails the NMMSN construction instead of the import.
+    '''
+    return PinyinEngine.from_env()
@@ -0,0 +1,223 @@
+'''
+Streaming pipeline to construct the NMMSNs of a table of name elements.
+
+Input table (CSV, TSV or JSONL), one name element per row. E.g., CSV:
+```
+nmm_type,species_origins,medicinal_parts,special_descriptions,processing_methods
+processed,Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄,stem herbaceous | 草质茎,,segmented | 段制
+```
+In CSV/TSV, every name element cell is parsed by `NmmsnNeData.init_from_str`. In JSONL, a cell can also be a `NmmsnNeList`.
+
+The table is read, named and written chunk by chunk, so the memory usage does not depend on the size of the table.
+'''
+
+from collections.abc import Iterator
+import json
+from pathlib import Path
+from typing import IO
+
+import pandas as pd
+
+from shennongname.snnmma.algorithm import Default, NmmsnNeData, construct_nmmsn_batch
+from shennongname.snnmma.codec import encode_nmmsn_ne
+from shennongname.snnmma.model import NmmsnNameElement, SnnmmaOutputSuccess
+
+
+NE_COLUMNS = ['nmm_type', 'species_origins', 'medicinal_parts', 'special_descriptions', 'processing_methods']
+OUTPUT_COLUMNS = ['nmmsn', 'nmmsn_zh', 'nmmsn_pinyin', 'error_msg']
+AVAIL_FORMAT = ['csv', 'tsv', 'jsonl']
+FAILED_TOKENS = [Default.FAILED_MAPPING_TOKEN, Default.FAILED_CONSTRUCT_TOKEN, Default.FAILED_API_TOKEN]
+
+
+def infer_table_format(path: str | Path) -> str:
+    '''
+    Infer the table format from the file suffix.
+
+    Examples
+    --------
+    >>> infer_table_format('catalogue.tsv')
+    'tsv'
+    >>> infer_table_format('catalogue.ndjson')
+    'jsonl'
+    '''
+    suffix = Path(path).suffix.lower().lstrip('.')
+    if suffix in ['jsonl', 'ndjson']:
+        return 'jsonl'
+    if suffix in AVAIL_FORMAT:
+        return suffix
+    raise ValueError(f'Unable to infer the table format of {path}, please specify one of {AVAIL_FORMAT}.')
+
+
+def read_table_chunks(
+    input_file: str | Path | IO,
+    table_format: str,
+    chunksize: int = 10000,
+) -> Iterator[pd.DataFrame]:
+    '''
+    Read a table of name elements chunk by chunk. All the cells are read as they are (no type inference), and empty cells are filled with `Default.CELL_VALUE`.
+    '''
+    if table_format not in AVAIL_FORMAT:
+        raise ValueError(f'Invalid table format: {table_format}, it should be one of {AVAIL_FORMAT}.')
+
+    if table_format == 'jsonl':
+        reader = pd.read_json(input_file, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(
+            input_file,
+            sep=',' if table_format == 'csv' else '\t',
+            dtype=str,
+            keep_default_na=False,
+            chunksize=chunksize,
+        )
+
+    with reader:
+        for chunk in reader:
+            missing_columns = [i for i in NE_COLUMNS if i not in chunk.columns]
+            if missing_columns:
+                raise ValueError(f'Missing columns in the input table: {missing_columns}.')
+            # `isna` is only applied on the scalar cells, as a JSONL cell can be a list.
+            yield chunk.map(lambda x: Default.CELL_VALUE if not isinstance(x, list) and pd.isna(x) else x)
+
+
+def parse_nmmsn_ne_cell(cell: str | list) -> list:
+    '''
+    Parse a name element cell to a NmmsnNeList.
+
+    Examples
+    --------
+    >>> parse_nmmsn_ne_cell('Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄')
+    [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']]
+    '''
+    if isinstance(cell, list):
+        return NmmsnNeData(cell).nmmsn_ne_list
+    return NmmsnNeData.init_from_str(str(cell)).nmmsn_ne_list
+
+
+def find_failed_token(row: dict) -> str:
+    '''
+    Find the failed token left by a previous pipeline (e.g., term mapping) in a row. Return an empty string if there is no such token.
+    '''
+    for column in NE_COLUMNS:
+        cell = row[column]
+        if isinstance(cell, str):
+            for failed_token in FAILED_TOKENS:
+                if failed_token in cell:
+                    return failed_token
+    return ''
+
+
+def construct_nmmsn_chunk(chunk: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Construct the NMMSNs of a chunk of name elements.
+
+    The output columns `nmmsn`, `nmmsn_zh`, `nmmsn_pinyin` and `error_msg` are appended to the chunk. In failed rows, the `nmmsn`, `nmmsn_zh` and `nmmsn_pinyin` cells are marked by:
+    - The failed token found in the name element cells, if any (e.g., `Default.FAILED_MAPPING_TOKEN` left by term mapping).
+    - `Default.FAILED_CONSTRUCT_TOKEN`, if the cells can not be parsed or the NMMSN can not be constructed.
+    '''
+    outputs: list[list[str]] = [[] for _ in range(len(OUTPUT_COLUMNS))]
+    rows = chunk[NE_COLUMNS].to_dict('records')
+
+    # parse the cells, the rows that can not be parsed are failed directly
+    failed: dict[int, tuple[str, str]] = {}
+    nmmsn_nes: list[NmmsnNameElement] = []
+    for i, row in enumerate(rows):
+        failed_token = find_failed_token(row)
+        if failed_token:
+            failed[i] = (failed_token, f'Failed token found in the name elements: {failed_token}')
+            continue
+        try:
+            nmmsn_nes.append(NmmsnNameElement(
+                nmm_type=str(row['nmm_type']),
+                species_origins=parse_nmmsn_ne_cell(row['species_origins']),
+                medicinal_parts=parse_nmmsn_ne_cell(row['medicinal_parts']),
+                special_descriptions=parse_nmmsn_ne_cell(row['special_descriptions']),
+                processing_methods=parse_nmmsn_ne_cell(row['processing_methods']),
+            ))
+        except Exception as e:
+            failed[i] = (Default.FAILED_CONSTRUCT_TOKEN, str(e))
+
+    results = iter(construct_nmmsn_batch(nmmsn_nes))
+    for i in range(len(rows)):
+        if i in failed:
+            failed_token, error_msg = failed[i]
+            output = [failed_token, failed_token, failed_token, error_msg]
+        else:
+            result = next(results)
+            if isinstance(result, SnnmmaOutputSuccess):
+                output = [result.nmmsn.nmmsn, result.nmmsn.nmmsn_zh.zh, result.nmmsn.nmmsn_zh.pinyin, result.error_msg]
+            else:
+                failed_token = Default.FAILED_CONSTRUCT_TOKEN
+                output = [failed_token, failed_token, failed_token, result.error_msg]
+        for column_output, value in zip(outputs, output):
+            column_output.append(value)
+
+    chunk = chunk.copy()
+    for column, column_output in zip(OUTPUT_COLUMNS, outputs):
+        chunk[column] = column_output
+    return chunk
+
+
+def encode_nmmsn_ne_cell(cell):
+    '''
+    Encode a list cell (read from JSONL) to the name element string format, so that a CSV/TSV output can be read back by `parse_nmmsn_ne_cell`. The lists that can not be encoded (invalid, or with ambiguous terms) are written as JSON. The other cells are kept as they are.
+
+    Examples
+    --------
+    >>> encode_nmmsn_ne_cell([['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']])
+    'Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄'
+    '''
+    if not isinstance(cell, list):
+        return cell
+    try:
+        return encode_nmmsn_ne(cell)
+    except ValueError:
+        return json.dumps(cell, ensure_ascii=False)
+
+
+def write_table_chunk(chunk: pd.DataFrame, output_file: IO, table_format: str, header: bool) -> None:
+    if table_format == 'jsonl':
+        chunk.to_json(output_file, orient='records', lines=True, force_ascii=False)
+    else:
+        chunk = chunk.copy()
+        for column in NE_COLUMNS:
+            chunk[column] = chunk[column].map(encode_nmmsn_ne_cell)
+        chunk.to_csv(output_file, sep=',' if table_format == 'csv' else '\t', index=False, header=header)
+
+
+def construct_nmmsn_table(
+    input_path: str | Path,
+    output_path: str | Path,
+    input_format: str | None = None,
+    output_format: str | None = None,
+    chunksize: int = 10000,
+) -> int:
+    '''
+    Construct the NMMSNs of a table of name elements, and write the results to another table.
+
+    Parameters
+    ----------
+    input_path : str | Path
+        The input table (CSV, TSV or JSONL).
+    output_path : str | Path
+        The output table (CSV, TSV or JSONL). It is written chunk by chunk, and the input columns are kept.
+    input_format : str | None, optional
+        One of `AVAIL_FORMAT`. If None, it is inferred from the suffix of `input_path`.
+    output_format : str | None, optional
+        One of `AVAIL_FORMAT`. If None, it is inferred from the suffix of `output_path`.
+    chunksize : int, optional
+        The number of rows read, named and written at once. The default is 10000.
+
+    Returns
+    -------
+    int
+        The number of rows processed.
+    '''
+    input_format = input_format or infer_table_format(input_path)
+    output_format = output_format or infer_table_format(output_path)
+
+    n_rows = 0
+    with open(output_path, 'w', encoding='utf-8', newline='') as output_file:
+        for chunk in read_table_chunks(input_path, input_format, chunksize):
+            write_table_chunk(construct_nmmsn_chunk(chunk), output_file, output_format, header=n_rows == 0)
+            n_rows += len(chunk)
+    return n_rows
@@ -0,0 +1,108 @@
+'''
+Index of species names for species inclusion detection.
+
+A species name includes another one if the lower case of the latter starts with the lower case of the former, e.g., `Prinsepia uniflora` includes `Prinsepia uniflora var. serrata`.
+'''
+
+from collections.abc import Iterable
+
+
+class SpeciesIndex:
+    '''
+    A character trie of the lower-cased highest level species names (no species in the index includes another one).
+    
+    Adding, or finding the species including a name, takes a time linear in the length of the name, whatever the number of species in the index. The index can be reused across calls.
+    
+    Examples
+    --------
+    >>> index = SpeciesIndex()
+    >>> index.add('Prinsepia uniflora var. serrata')
+    False
+    >>> index.add('Prinsepia uniflora') # includes the previous species, which is removed
+    True
+    >>> index.find_including('prinsepia uniflora var. serrata')
+    'Prinsepia uniflora'
+    >>> index.highest_level_species()
+    ['Prinsepia uniflora']
+    '''
+    # the key of a trie node storing the original species name, if the node ends a species name
+    END = None
+    
+    def __init__(self, species_list: Iterable[str] = ()):
+        self.root: dict = {}
+        self.n_species = 0
+        for species in species_list:
+            self.add(species)
+    
+    
+    def __len__(self) -> int:
+        return self.n_species
+    
+    
+    def __contains__(self, species: str) -> bool:
+        return self.find_including(species) is not None
+    
+    
+    def find_including(self, species: str) -> str | None:
+        '''
+        Return the species in the index including `species` (or equal to it, ignoring case), or None.
+        '''
+        node = self.root
+        for c in species.lower():
+            if self.END in node:
+                return node[self.END]
+            node = node.get(c)
+            if node is None:
+                return None
+        return node.get(self.END)
+    
+    
+    def add(self, species: str) -> bool:
+        '''
+        Add a species to the index, and return whether an inclusion is detected:
+        - If a species in the index includes `species`, `species` is not added.
+        - If `species` includes some species in the index, they are removed.
+        '''
+        node = self.root
+        for c in species.lower():
+            if self.END in node:
+                return True
+            node = node.setdefault(c, {})
+        if self.END in node:
+            return True
+        
+        n_included = self._count_species(node)
+        # the species below the node are included by `species`
+        node.clear()
+        node[self.END] = species
+        self.n_species += 1 - n_included
+        return n_included > 0
+    
+    
+    def _count_species(self, node: dict) -> int:
+        n = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is self.END:
+                    n += 1
+                else:
+                    stack.append(child)
+        return n
+    
+    
+    def highest_level_species(self) -> list[str]:
+        '''
+        Return the species in the index, sorted by alphabetical order.
+        '''
+        species_list = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key is self.END:
+                    species_list.append(child)
+                else:
+                    stack.append(child)
+        return sorted(species_list)
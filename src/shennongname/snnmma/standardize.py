@@ -0,0 +1,142 @@
+'''
+Bulk standardization of terms (species names, medicinal parts, processing methods, etc.) with a nonstandard -> standard term `Mapping`.
+
+The mapping table is loaded once, its forward mapping is kept as a dict (or, for a memory-mapped `MappedMapping`, looked up in the shared mapped buffer), and the columns are standardized in a vectorized way: every distinct cell is only looked up once (catalogues repeat the same terms over and over), and the results are broadcast back to the cells.
+
+The cells that can not be standardized are marked by `Default.FAILED_MAPPING_TOKEN`, which is recognized by `shennongname.snnmma.pipeline`. A cell can hold multiple terms separated by `Default.SEPARATOR`, in which case every term is standardized, and only the unknown terms are marked.
+'''
+
+from pathlib import Path
+
+import pandas as pd
+
+from shennongname.snnmma.algorithm import Default, Mapping
+from shennongname.snnmma.mapping_file import MappedMapping
+
+
+class TermStandardizer:
+    '''
+    Standardize terms with a `Mapping` of the types one-to-one or multi-to-one (nonstandard -> standard).
+
+    A `MappedMapping` is not copied to a dict: the terms are looked up by binary search in the mapped buffer, which is shared by all the processes. As every distinct cell is only looked up once, the lookups stay cheap on repetitive catalogues.
+
+    The cells are stripped (and converted to lower case if the mapping ignores case) before lookup. The empty cells are kept empty.
+
+    Examples
+    --------
+    >>> standardizer = TermStandardizer(Mapping([('Ephedra sinica', 'Ephedra sinica'), ('Ephedra sinica Stapf', 'Ephedra sinica')]))
+    >>> standardizer.standardize_series(pd.Series(['Ephedra sinica Stapf', 'Ephedra sinica; Ephedra sinica Stapf', 'Ephedra', '']))
+    0                  Ephedra sinica
+    1    Ephedra sinica;Ephedra sinica
+    2                  failed_mapping
+    3
+    dtype: object
+    '''
+    def __init__(
+        self,
+        mapping: Mapping | MappedMapping,
+        failed_token: str = Default.FAILED_MAPPING_TOKEN,
+        separator: str = Default.SEPARATOR,
+    ):
+        self.mapping = mapping
+        # raise ValueError if the mapping is one-to-multi or multi-to-multi, i.e., a term has multiple standard terms
+        if isinstance(mapping, MappedMapping):
+            if mapping.mapping_type not in ['oo', 'mo', 'nn']:
+                raise ValueError('The mapping is not in the types of one-to-one or multi-to-one.')
+            self.forward_mapping = None
+            self.forward_series = None
+        else:
+            self.forward_mapping = mapping.get_forward_mapping()
+            # `Series.map` would convert a dict to a Series on every call
+            self.forward_series = pd.Series(self.forward_mapping, dtype=object)
+        self.ignore_case = mapping.ignore_case
+        self.failed_token = failed_token
+        self.separator = separator
+
+
+    @classmethod
+    def from_table(
+        cls,
+        table: str | Path | pd.DataFrame,
+        nonstandard_column: str,
+        standard_column: str,
+        ignore_case: bool = False,
+        **kwargs,
+    ) -> 'TermStandardizer':
+        '''
+        Load a mapping table (CSV or TSV, or a DataFrame) once, with a column of nonstandard terms and a column of standard terms.
+
+        The rows with an empty term are skipped. The other keyword arguments are passed to `TermStandardizer`.
+        '''
+        if not isinstance(table, pd.DataFrame):
+            sep = '\t' if Path(table).suffix.lower() == '.tsv' else ','
+            table = pd.read_csv(table, sep=sep, dtype=str, keep_default_na=False, usecols=[nonstandard_column, standard_column])
+        pairs = table[[nonstandard_column, standard_column]].fillna(Default.CELL_VALUE).astype(str)
+        # skip the rows with an empty term, which are not mapping items
+        pairs = pairs[(pairs[nonstandard_column].str.strip() != '') & (pairs[standard_column].str.strip() != '')]
+        return cls(Mapping(list(pairs.itertuples(index=False, name=None)), ignore_case=ignore_case), **kwargs)
+
+
+    def standardize(self, term: str) -> str:
+        '''
+        Standardize a single cell.
+
+        Examples
+        --------
+        >>> standardizer = TermStandardizer(Mapping([('stir-fried', 'stirfried')]))
+        >>> standardizer.standardize(' stir-fried ')
+        'stirfried'
+        >>> standardizer.standardize('stir-fried;steamed')
+        'stirfried;failed_mapping'
+        '''
+        if self.separator in term:
+            return self.separator.join(self._standardize_term(i) for i in term.split(self.separator))
+        return self._standardize_term(term)
+
+
+    def _standardize_term(self, term: str) -> str:
+        term = term.strip()
+        if term == '':
+            return term
+        if self.ignore_case:
+            term = term.lower()
+        if self.forward_mapping is None:
+            return self.mapping.get(term, self.failed_token)
+        return self.forward_mapping.get(term, self.failed_token)
+
+
+    def standardize_series(self, series: pd.Series) -> pd.Series:
+        '''
+        Standardize a column. Every distinct cell is only standardized once.
+
+        The missing cells (NaN) are considered empty.
+        '''
+        codes, uniques = pd.factorize(series, sort=False)
+        uniques = pd.Series(uniques, dtype=object).astype(str)
+
+        # the single terms are looked up with a vectorized map, the cells with multiple terms are split
+        terms = uniques.str.strip()
+        if self.ignore_case:
+            terms = terms.str.lower()
+        if self.forward_series is None:
+            standardized = terms.map(self.mapping.get)
+        else:
+            standardized = terms.map(self.forward_series)
+        standardized = standardized.where(terms != '', Default.CELL_VALUE).fillna(self.failed_token)
+        multi_terms = uniques.str.contains(self.separator, regex=False)
+        if multi_terms.any():
+            standardized[multi_terms] = uniques[multi_terms].map(self.standardize)
+
+        # the missing cells have the code -1, i.e., the empty cell appended at the end
+        standardized = pd.concat([standardized, pd.Series([Default.CELL_VALUE])], ignore_index=True).to_numpy(dtype=object)
+        return pd.Series(standardized[codes], index=series.index, name=series.name, dtype=object)
+
+
+    def standardize_frame(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        '''
+        Standardize some columns of a DataFrame. A new DataFrame is returned.
+        '''
+        df = df.copy()
+        for column in columns:
+            df[column] = self.standardize_series(df[column])
+        return df
@@ -0,0 +1,117 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import json
+
+from shennongname.asgi.app import NmmsnAsgiApp
+from shennongname.snnmma.algorithm import construct_nmmsn
+from shennongname.snnmma.model import NmmsnNameElement
+
+
+DATA = {
+    "nmm_type": "processed",
+    "species_origins": [["Ephedra sinica", "草麻黄"], "or", ["Ephedra intermedia", "中麻黄"]],
+    "medicinal_parts": [["herbaceous stem", "草质茎"]],
+    "special_descriptions": [],
+    "processing_methods": [["segmented", "段制"]],
+}
+
+
+async def call(app, method: str, path: str, body: bytes = b'', chunksize: int | None = None) -> tuple[int, dict, bytes]:
+    '''
+    Call the ASGI application directly, and return the status, the headers and the body of the response.
+    '''
+    chunksize = chunksize or max(len(body), 1)
+    messages = [
+        {'type': 'http.request', 'body': body[i:i + chunksize], 'more_body': i + chunksize < len(body)}
+        for i in range(0, max(len(body), 1), chunksize)
+    ]
+    sent = []
+    
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b''}
+    await app(scope, receive, send)
+    assert sent[0]['type'] == 'http.response.start'
+    return sent[0]['status'], dict(sent[0]['headers']), b''.join(i.get('body', b'') for i in sent[1:])
+
+
+def test_app():
+    async def main():
+        with ThreadPoolExecutor(2) as executor:
+            app = NmmsnAsgiApp(executor=executor, max_concurrency=2, max_body_size=1000)
+            
+            status, headers, body = await call(app, 'GET', '/api/name')
+            assert status == 200 and body == b'ShennongName is working!'
+            
+            expected = construct_nmmsn(NmmsnNameElement.model_validate(DATA)).model_dump()
+            status, headers, body = await call(app, 'POST', '/api/name', json.dumps(DATA).encode('utf-8'), chunksize=16)
+            assert status == 200 and headers[b'content-type'] == b'application/json'
+            assert json.loads(body) == expected
+            
+            # many concurrent requests, more than max_concurrency
+            results = await asyncio.gather(*[call(app, 'POST', '/api/name', json.dumps(DATA).encode('utf-8')) for _ in range(20)])
+            assert all(status == 200 and json.loads(body) == expected for status, _, body in results)
+            
+            # invalid name element
+            status, _, body = await call(app, 'POST', '/api/name', b'{"nmm_type": "plant"}')
+            assert status == 400 and json.loads(body)['success'] is False
+            
+            status, _, body = await call(app, 'POST', '/api/name', b'x' * 1001)
+            assert status == 413
+            status, _, _ = await call(app, 'GET', '/api/other')
+            assert status == 404
+            status, headers, _ = await call(app, 'PUT', '/api/name')
+            assert status == 405 and headers[b'allow'] == b'GET, POST'
+    
+    asyncio.run(main())
+
+
+def test_lifespan():
+    async def main():
+        app = NmmsnAsgiApp(max_workers=1)
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+        
+        async def receive():
+            return messages.pop(0)
+        
+        async def send(message):
+            sent.append(message['type'])
+            # the worker processes are started before the startup is completed
+            if message['type'] == 'lifespan.startup.complete':
+                status, _, body = await call(app, 'POST', '/api/name', json.dumps(DATA).encode('utf-8'))
+                assert status == 200 and json.loads(body)['success'] is True
+        
+        await app({'type': 'lifespan'}, receive, send)
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+        assert app.executor is None
+    
+    asyncio.run(main())
+
+
+class BrokenExecutor(ThreadPoolExecutor):
+    def submit(self, fn, /, *args, **kwargs):
+        raise BrokenProcessPool('A process in the process pool was terminated abruptly.')
+
+
+def test_app_broken_executor():
+    async def main():
+        app = NmmsnAsgiApp(max_workers=1)
+        broken_executor = app.executor = BrokenExecutor(1)
+        status, _, body = await call(app, 'POST', '/api/name', json.dumps(DATA).encode('utf-8'))
+        assert status == 500 and json.loads(body)['success'] is False
+        # the broken executor is replaced on the next request
+        assert broken_executor._shutdown and app.executor is None
+        
+        # a given executor is not replaced
+        with BrokenExecutor(1) as executor:
+            app = NmmsnAsgiApp(executor=executor)
+            status, _, _ = await call(app, 'POST', '/api/name', json.dumps(DATA).encode('utf-8'))
+            assert status == 500 and app.executor is executor
+    
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+import json
+
+from shennongname.cli import main
+
+
+RECORDS = [
+    {
+        'nmm_type': 'plant',
+        'species_origins': [['Ephedra sinica', '草麻黄']],
+        'medicinal_parts': [['herbaceous stem', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [],
+    },
+    {
+        'nmm_type': 'plant',
+        'species_origins': [['Ephedra sinica', '草麻黄']],
+        'medicinal_parts': [['herbaceous stem', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [['segmented', '段制']],
+    },
+]
+
+
+def test_main(tmp_path, capsys):
+    input_path = tmp_path / 'input.jsonl'
+    lines = [json.dumps(i, ensure_ascii=False) for i in RECORDS * 3] + ['', '{"nmm_type": "plant"}']
+    input_path.write_text('\n'.join(lines), encoding='utf-8')
+    
+    outputs = []
+    for jobs in ['1', '2']:
+        output_path = tmp_path / f'output_{jobs}.jsonl'
+        assert main([str(input_path), '-o', str(output_path), '--jobs', jobs, '--chunksize', '2']) == 0
+        assert '7 rows in' in capsys.readouterr().err
+        outputs.append([json.loads(i) for i in output_path.read_text(encoding='utf-8').splitlines()])
+    
+    assert outputs[0] == outputs[1]
+    output = outputs[0]
+    assert len(output) == 7 # the empty line is skipped
+    assert output[0]['nmmsn']['nmmsn'] == 'Ephedra sinica Herbaceous-stem'
+    assert output[1]['success'] == False
+    assert output[2] == output[0]
+    # invalid name element
+    assert output[6]['success'] == False
+    assert 'validation error' in output[6]['error_msg']
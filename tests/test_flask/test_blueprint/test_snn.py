@@ -1,6 +1,9 @@
 from shennongname.flask.blueprint.snn import (
+    ApiSnn,
+    ApiSnnBatch,
     blueprint_snn,
 )
+from shennongname.flask.cache import ResponseCache
 
 import json
 from flask import Flask
@@ -92,3 +95,114 @@ def test_blueprint_snn(client):
         response = client.post('/api/name', data=json.dumps(data), content_type='application/json')
         assert response.status_code == 200
         assert response.get_json() == expected_output
+
+
+def test_blueprint_snn_batch(client, monkeypatch):
+    datas = [
+        {
+            "nmm_type": "plant",
+            "species_origins": [["Ephedra sinica", "草麻黄"]],
+            "medicinal_parts": [["herbaceous stem", "草质茎"]],
+            "special_descriptions": [],
+            "processing_methods": [],
+        },
+        # invalid name element
+        {
+            "nmm_type": "plant",
+            "species_origins": "Ephedra sinica",
+        },
+        {
+            "nmm_type": "processed",
+            "species_origins": [["Ephedra sinica", "草麻黄"], "or", ["Ephedra intermedia", "中麻黄"]],
+            "medicinal_parts": [["root", "根"], "and", ["rhizome", "根茎"]],
+            "special_descriptions": [],
+            "processing_methods": [["stirfried", "炒制"]],
+        },
+    ]
+    expected_outputs = [
+        client.post('/api/name', data=json.dumps(data), content_type='application/json').get_json()
+        for data in datas[:1] + datas[2:]
+    ]
+    
+    def check(outputs):
+        assert len(outputs) == 4
+        assert outputs[0] == outputs[3] == expected_outputs[0]
+        assert outputs[2] == expected_outputs[1]
+        assert outputs[1]['success'] is False and outputs[1]['error_msg']
+    
+    # JSON array
+    response = client.post('/api/name/batch', data=json.dumps(datas + datas[:1]), content_type='application/json')
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    check([json.loads(line) for line in response.data.splitlines()])
+    
+    # NDJSON, the blank lines are skipped
+    body = '\n'.join(json.dumps(data) for data in datas + datas[:1]) + '\n\n'
+    response = client.post('/api/name/batch', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200 and response.mimetype == 'application/x-ndjson'
+    check([json.loads(line) for line in response.data.splitlines()])
+    
+    # invalid request bodies
+    for body, content_type, status_code in [
+        (json.dumps(datas[0]), 'application/json', 400),
+        ('[', 'application/json', 400),
+        (json.dumps(datas), 'text/plain', 415),
+    ]:
+        response = client.post('/api/name/batch', data=body, content_type=content_type)
+        assert response.status_code == status_code
+        assert response.get_json()['success'] is False
+    
+    # maximum batch size
+    monkeypatch.setattr(ApiSnnBatch, 'max_batch_size', 2)
+    response = client.post('/api/name/batch', data=json.dumps(datas), content_type='application/json')
+    assert response.status_code == 413
+    assert response.get_json()['success'] is False
+    response = client.post('/api/name/batch', data='\n'.join(json.dumps(data) for data in datas), content_type='application/x-ndjson')
+    outputs = [json.loads(line) for line in response.data.splitlines()]
+    assert len(outputs) == 3
+    assert outputs[0] == expected_outputs[0]
+    assert outputs[2]['success'] is False and '2' in outputs[2]['error_msg']
+
+
+def test_blueprint_snn_etag(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(ApiSnn, 'response_cache', ResponseCache(maxsize=10, sqlite_path=str(tmp_path / 'cache.sqlite3')))
+    data = {
+        "nmm_type": "plant",
+        "species_origins": [["Ephedra sinica", "草麻黄"]],
+        "medicinal_parts": [["herbaceous stem", "草质茎"]],
+        "special_descriptions": [],
+        "processing_methods": [],
+    }
+    response = client.post('/api/name', data=json.dumps(data), content_type='application/json')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    assert etag
+    assert ApiSnn.response_cache.get(etag.strip('"')) == response.data
+    
+    # served from the cache
+    cached_response = client.post('/api/name', data=json.dumps(data), content_type='application/json')
+    assert cached_response.data == response.data
+    assert cached_response.headers['ETag'] == etag
+    assert ApiSnn.response_cache.memory.stats()['hits'] == 2 # including the check above
+    
+    # not modified
+    for if_none_match in [etag, f'W/{etag}', f'"other", {etag}']:
+        response_304 = client.post('/api/name', data=json.dumps(data), content_type='application/json', headers={'If-None-Match': if_none_match})
+        assert response_304.status_code == 304
+        assert response_304.data == b''
+        assert response_304.headers['ETag'] == etag
+    
+    # `*` is not an explicit match
+    response_star = client.post('/api/name', data=json.dumps(data), content_type='application/json', headers={'If-None-Match': '*'})
+    assert response_star.status_code == 200 and response_star.data == response.data
+    
+    # another name element
+    data['species_origins'] = [["Ephedra intermedia", "中麻黄"]]
+    response = client.post('/api/name', data=json.dumps(data), content_type='application/json', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    
+    # without cache
+    monkeypatch.setattr(ApiSnn, 'response_cache', None)
+    uncached_response = client.post('/api/name', data=json.dumps(data), content_type='application/json')
+    assert uncached_response.data == response.data
+    assert uncached_response.headers['ETag'] == response.headers['ETag']
@@ -0,0 +1,44 @@
+import gc
+import importlib
+import os
+from types import SimpleNamespace
+
+import shennongname.flask.config
+import shennongname.flask.gunicorn_conf
+
+
+def load_gunicorn_conf(monkeypatch, **env):
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    importlib.reload(shennongname.flask.config)
+    return importlib.reload(shennongname.flask.gunicorn_conf)
+
+
+def test_gunicorn_conf(monkeypatch):
+    conf = load_gunicorn_conf(monkeypatch, PORT='5002', GUNICORN_WORKERS='0', GUNICORN_THREADS='2', GUNICORN_PRELOAD_APP='True', GUNICORN_MAX_REQUESTS='100')
+    assert conf.bind == '0.0.0.0:5002'
+    assert conf.workers == (os.cpu_count() or 1)
+    assert conf.threads == 2 and conf.worker_class == 'gthread'
+    assert conf.preload_app is True
+    assert conf.max_requests == 100 and conf.max_requests_jitter == 1000
+    
+    conf = load_gunicorn_conf(monkeypatch, GUNICORN_WORKERS='3', GUNICORN_THREADS='1', GUNICORN_PRELOAD_APP='False', GUNICORN_MAX_REQUESTS='0')
+    assert conf.workers == 3
+    assert conf.worker_class == 'sync'
+    assert conf.preload_app is False
+    assert conf.max_requests == 0 and conf.max_requests_jitter == 0
+    
+    monkeypatch.undo()
+    importlib.reload(shennongname.flask.config)
+    importlib.reload(shennongname.flask.gunicorn_conf)
+
+
+def test_on_starting():
+    # the master process is warmed up and frozen only with preload_app
+    shennongname.flask.gunicorn_conf.on_starting(SimpleNamespace(cfg=SimpleNamespace(preload_app=False)))
+    assert gc.get_freeze_count() == 0
+    try:
+        shennongname.flask.gunicorn_conf.on_starting(SimpleNamespace(cfg=SimpleNamespace(preload_app=True)))
+        assert gc.get_freeze_count() > 0
+    finally:
+        gc.unfreeze()
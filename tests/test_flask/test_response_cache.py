@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+import time
+
+from shennongname.flask.cache import ResponseCache, SqliteCache, hash_nmmsn_ne
+from shennongname.snnmma.model import NmmsnNameElement
+
+
+def test_hash_nmmsn_ne():
+    nmmsn_ne = NmmsnNameElement.model_validate({
+        'nmm_type': 'plant',
+        'species_origins': [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+        'medicinal_parts': [['herbaceous stem', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [],
+    })
+    # same canonical form
+    same = NmmsnNameElement.model_validate({
+        'nmm_type': 'Plant',
+        'species_origins': [[' Ephedra sinica', '草麻黄 '], 'OR', ['Ephedra intermedia', '中麻黄']],
+        'medicinal_parts': [['herbaceous stem ', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [],
+    })
+    other = NmmsnNameElement.model_validate({
+        'nmm_type': 'plant',
+        'species_origins': [['Ephedra sinica', '草麻黄']],
+        'medicinal_parts': [['herbaceous stem', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [],
+    })
+    assert len(hash_nmmsn_ne(nmmsn_ne)) == 64
+    assert hash_nmmsn_ne(nmmsn_ne) == hash_nmmsn_ne(same)
+    assert hash_nmmsn_ne(nmmsn_ne) != hash_nmmsn_ne(other)
+    
+    # the invalid name elements are hashed by their JSON
+    invalid = NmmsnNameElement.model_validate({'nmm_type': 'plant', 'species_origins': [['a', '甲'], ['b', '乙']], 'medicinal_parts': [], 'special_descriptions': [], 'processing_methods': []})
+    invalid_other = NmmsnNameElement.model_validate({'nmm_type': 'plant', 'species_origins': [['a', '甲'], ['c', '丙']], 'medicinal_parts': [], 'special_descriptions': [], 'processing_methods': []})
+    assert hash_nmmsn_ne(invalid) != hash_nmmsn_ne(invalid_other)
+
+
+def test_sqlite_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = SqliteCache(path, ttl=10)
+    assert cache.get('a') is None
+    cache.set('a', b'1')
+    cache.set('a', b'2')
+    assert cache.get('a') == b'2'
+    
+    # shared by the threads and the other instances
+    results = []
+    thread = threading.Thread(target=lambda: results.append(SqliteCache(path).get('a')))
+    thread.start()
+    thread.join()
+    assert results == [b'2']
+    
+    # expiration
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 10)
+    assert cache.get('a') is None
+    cache.prune_interval = 1
+    cache.set('b', b'3')
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_response_cache(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = ResponseCache(maxsize=2, ttl=60, sqlite_path=path)
+    assert cache.get('a') is None
+    cache.set('a', b'1')
+    assert cache.get('a') == b'1'
+    
+    # another process only sharing the SQLite file
+    other = ResponseCache(maxsize=2, ttl=60, sqlite_path=path)
+    assert other.get('a') == b'1'
+    assert other.memory.stats()['size'] == 1
+    
+    assert ResponseCache(maxsize=0, sqlite_path=path).get('a') == b'1'
+    memory_only = ResponseCache(maxsize=2)
+    memory_only.set('a', b'1')
+    assert memory_only.shared is None and memory_only.get('a') == b'1'
+    
+    cache.clear()
+    assert cache.get('a') is None
+
+
+def test_sqlite_cache_errors(tmp_path, caplog):
+    path = str(tmp_path / 'cache.sqlite3')
+    cache = SqliteCache(path)
+    cache.set('a', b'1')
+    
+    # another process holds a write lock on the database
+    lock = sqlite3.connect(path, isolation_level=None)
+    lock.execute('BEGIN EXCLUSIVE')
+    try:
+        locked_cache = ResponseCache(maxsize=2, sqlite_path=path)
+        locked_cache.shared.connect().execute('PRAGMA busy_timeout = 0')
+        # the readers are not blocked (WAL), the writes fail without raising
+        assert locked_cache.get('a') == b'1'
+        locked_cache.set('b', b'2')
+        locked_cache.clear()
+        assert len(locked_cache.shared) == 1
+    finally:
+        lock.execute('ROLLBACK')
+        lock.close()
+    assert 'Failed to clear the SQLite cache' in caplog.text
+    assert cache.get('a') == b'1' and cache.get('b') is None
+    
+    # a file that is not a database
+    not_a_database = tmp_path / 'not_a_database.sqlite3'
+    not_a_database.write_bytes(b'not a database' * 100)
+    broken_cache = SqliteCache(str(not_a_database))
+    assert broken_cache.get('a') is None
+    broken_cache.set('a', b'1')
+    broken_cache.clear()
+    assert len(broken_cache) == 0
@@ -1,8 +1,16 @@
+import json
+import random
+import subprocess
+import sys
+
 import pytest
 
-from shennongname.snnmma.model import NmmsnNameElement
+from shennongname.snnmma.model import NmmsnNameElement, dump_json_bytes
 
 from shennongname.snnmma.algorithm import (
+    NmmType,
+    NmmTypeCode,
+    get_nmm_type,
     AsciiStr,
     convert_to_pinyin,
     split_sentence_by_words,
@@ -15,9 +23,48 @@ from shennongname.snnmma.algorithm import (
     construct_nmmsn_spe_des,
     construct_nmmsn_pro_met,
     construct_nmmsn,
+    construct_nmmsn_batch,
+    NmmsnBatchPipes,
+    memoize_call,
+    unwrap_memoized,
 )
 
 
+@pytest.mark.parametrize('nmm_type, normalized, code, is_pafa, is_pro', [
+    ('plant', 'plant', NmmTypeCode.PLANT, True, False),
+    (' Animal ', 'animal', NmmTypeCode.ANIMAL, True, False),
+    ('藻类药', '藻类药', NmmTypeCode.ALGAL, True, False),
+    ('真菌', '真菌', NmmTypeCode.FUNGAL, True, False),
+    ('Fungi', 'fungi', NmmTypeCode.FUNGAL, True, False),
+    ('PROCESSED', 'processed', NmmTypeCode.PROCESSED, False, True),
+    ('炮制药', '炮制药', NmmTypeCode.PROCESSED, False, True),
+    ('processed-other', 'processed_other', NmmTypeCode.PROCESSED_OTHER, False, False),
+    ('其他药', '其他药', NmmTypeCode.OTHER, False, False),
+    ('mineral', 'mineral', NmmTypeCode.MINERAL, False, False),
+    ('unknown', 'unknown', None, False, False),
+    ('', '', None, False, False),
+])
+def test_nmm_type(nmm_type, normalized, code, is_pafa, is_pro):
+    nmm_type_cls = NmmType(nmm_type)
+    assert nmm_type_cls.nmm_type == normalized
+    assert nmm_type_cls.code is code
+    assert nmm_type_cls.is_pafa() == is_pafa
+    assert nmm_type_cls.is_pro() == is_pro
+    assert nmm_type_cls.is_pafa_pro() == (is_pafa or is_pro)
+
+
+def test_nmm_type_code():
+    # every label of `NmmType` is resolved to its code
+    for code in NmmTypeCode:
+        en, zh = getattr(NmmType, code.name)
+        assert NmmType(en).code is code and NmmType(zh).code is code
+        assert code == en and code.zh == zh
+    
+    # the instances are cached per raw input
+    assert get_nmm_type(' Plant ') is get_nmm_type(' Plant ')
+    assert get_nmm_type(' Plant ').code is NmmTypeCode.PLANT
+
+
 class TestAsciiStr():
     def test_char_is_printable_ascii(self):
         assert AsciiStr.char_is_printable_ascii('a') == True
@@ -76,6 +123,13 @@ class TestAsciiStr():
         assert AsciiStr("Hello × World").replace_non_alphabet_and_hyphen_and_space(replacement='?').str == "Hello ? World"
 
 
+def test_lazy_import():
+    # pypinyin and pydantic are only imported on first use
+    code = "import sys, shennongname.snnmma.algorithm; print([i for i in ('pypinyin', 'pydantic') if i in sys.modules])"
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
+
+
 def test_convert_to_pinyin():
     assert convert_to_pinyin("青蒿") == "qīng hāo"
     assert convert_to_pinyin("人参") == "rén shēn"
@@ -130,6 +184,50 @@ class TestMapping:
         assert Mapping(self.mapping_mm).verify_mapping_type() == 'mm'
         
 
+    def test_add_and_remove(self):
+        mapping_cls = Mapping(self.mapping_oo)
+        assert len(mapping_cls) == 2
+        assert mapping_cls.add(' appla ', '苹果').mapping_type == 'mo'
+        assert mapping_cls.add('apple', '苹果果').mapping_type == 'mm'
+        assert mapping_cls.remove('appla', '苹果').mapping_type == 'om'
+        assert mapping_cls.remove('apple', '苹果果').mapping_type == 'oo'
+        assert mapping_cls.remove('apple', '苹果').remove('car', '汽车').mapping_type == 'nn'
+        with pytest.raises(KeyError):
+            mapping_cls.remove('car', '汽车')
+        with pytest.raises(ValueError):
+            mapping_cls.add('car', ' ')
+        
+        # the incremental updates give the same mapping as building it from scratch
+        rng = random.Random(0)
+        mapping_cls = Mapping([])
+        items = set()
+        for _ in range(1000):
+            item = (f'key{rng.randrange(20)}', f'value{rng.randrange(20)}')
+            if item in items and rng.random() < 0.7:
+                items.remove(item)
+                mapping_cls.remove(*item)
+            else:
+                items.add(item)
+                mapping_cls.add(*item)
+            expected = Mapping(list(items))
+            assert mapping_cls.mapping == expected.mapping == sorted(items)
+            assert mapping_cls.mapping_type == expected.mapping_type
+    
+    
+    def test_lookup(self):
+        mapping_cls = Mapping(self.mapping_mm)
+        assert ('apple', '苹果') in mapping_cls
+        assert ('apple', '汽车') not in mapping_cls
+        assert mapping_cls.get_values('apple') == {'苹果', '苹果果'}
+        assert mapping_cls.get_values('banana') == set()
+        assert mapping_cls.get_keys('苹果') == {'apple', 'appla'}
+        assert mapping_cls.get_keys('汽车') == {'car'}
+        
+        mapping_cls = Mapping([(' Apple ', '苹果')], ignore_case=True)
+        assert mapping_cls.mapping == [('apple', '苹果')]
+        assert ('apple', '苹果') in mapping_cls
+        
+
     def test_get_forward_mapping(self):
         mappings = [self.mapping_nn, self.mapping_oo, self.mapping_mo]
         expected_forward_mappings = [
@@ -296,6 +394,23 @@ class TestNmmsnNeData:
                 ne_data = NmmsnNeData(ne_list)
 
 
+    def test_compact_form(self):
+        ne_data = NmmsnNeData(self.valid_ne_list[1])
+        assert ne_data.pairs == (('a', 'A'), ('b', 'B'), ('c d', 'C D'))
+        assert ne_data.ops == ('or', 'and')
+        assert ne_data.freeze() == (ne_data.pairs, ne_data.ops)
+        assert hash(ne_data.freeze()) == hash(NmmsnNeData(self.expected_ne_list[1]).freeze())
+        # the terms are interned
+        assert ne_data.pairs[2][0] is NmmsnNeData.init_from_str(' c d | C D ').pairs[0][0]
+        # the list form is built on access, and the setter cleans the data
+        ne_data.nmmsn_ne_list.append('or')
+        assert ne_data.nmmsn_ne_list == self.expected_ne_list[1]
+        ne_data.nmmsn_ne_list = [[' e ', 'E'], 'AND', ['f', 'F']]
+        assert ne_data.nmmsn_ne_list == [['e', 'E'], 'and', ['f', 'F']]
+        with pytest.raises(AttributeError):
+            ne_data.other = 1
+        
+        
     def test_str(self):
         # Test empty input data
         nmmsn_ne_list = []
@@ -336,6 +451,37 @@ class TestNmmsnNeData:
                 ne_data = NmmsnNeData.init_from_str(invalid_input)
         
     
+    def test_init_from_str_tokenizer(self):
+        # the same results and errors as splitting the string with `split_sentence_by_words` then `str.split('|')`
+        def reference_init_from_str(nmmsn_ne_str: str) -> NmmsnNeData:
+            if nmmsn_ne_str.strip() == '':
+                return NmmsnNeData([])
+            nmmsn_ne_list = split_sentence_by_words(f' {nmmsn_ne_str} ', [' or ', ' and '], keep_sep=True)
+            return NmmsnNeData([i.split('|') if '|' in i else i for i in nmmsn_ne_list])
+        
+        def outcome(func, nmmsn_ne_str: str):
+            try:
+                return func(nmmsn_ne_str).freeze()
+            except ValueError as e:
+                return str(e)
+        
+        tokens = ['a', 'b c', ' ', '  ', '|', ' | ', 'and', 'or', 'AND', ' and ', ' or ', '甲', '\t']
+        rng = random.Random(0)
+        for _ in range(3000):
+            nmmsn_ne_str = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 10)))
+            assert outcome(NmmsnNeData.init_from_str, nmmsn_ne_str) == outcome(reference_init_from_str, nmmsn_ne_str), nmmsn_ne_str
+        
+        # (mostly) well-formed strings, with extra whitespace
+        spaces = ['', ' ', '  ']
+        for _ in range(1000):
+            parts = []
+            for _ in range(rng.randint(1, 5)):
+                parts.append(f'{rng.choice(spaces)}{rng.choice(tokens[:2])}{rng.choice(spaces)}|{rng.choice(spaces)}{rng.choice(tokens[-2:])}{rng.choice(spaces)}')
+                parts.append(rng.choice([' and ', ' or ', '  and  ', ' or  and ']))
+            nmmsn_ne_str = ''.join(parts[:-1])
+            assert outcome(NmmsnNeData.init_from_str, nmmsn_ne_str) == outcome(reference_init_from_str, nmmsn_ne_str), nmmsn_ne_str
+        
+    
     def test_validate_empty(self):
         ne_data = NmmsnNeData(self.valid_ne_list[3])
         with pytest.raises(ValueError):
@@ -368,6 +514,40 @@ class TestNmmsnNeData:
                 ne_data.validate_oo_mapping_type()
 
     
+    def test_fused_validation(self):
+        # the fused validate-and-clean pass raises the same errors, in the same order, as the separate passes
+        def reference_validate(ne_list: list) -> list:
+            cleaned = []
+            for i in ne_list:
+                if isinstance(i, list):
+                    if len(i) != 2:
+                        raise ValueError("The length of the inner list is not 2.")
+                    if all(j.strip() for j in i):
+                        cleaned.append([j.strip() for j in i])
+                elif isinstance(i, str):
+                    if i.strip().lower() not in ['or', 'and']:
+                        raise ValueError("The str in the input data is empty or not in the available logic operator list.")
+                    cleaned.append(i.strip().lower())
+                else:
+                    raise ValueError("The type of the item in the input data is not list or str.")
+            NmmsnNeData([]).validate_str_pair_logic_operator_pattern(cleaned)
+            NmmsnNeData(cleaned).validate_empty().validate_only_and_or_only_or().validate_oo_mapping_type()
+            return cleaned
+        
+        def outcome(func, ne_list: list):
+            try:
+                return func(ne_list)
+            except ValueError as e:
+                return str(e)
+        
+        items = [['a', 'A'], ['b', 'B'], ['a', 'B'], [' ', 'C'], ['c', 'C', 'c'], 'and', ' OR ', 'but', '', 1]
+        rng = random.Random(0)
+        for _ in range(2000):
+            ne_list = [rng.choice(items) for _ in range(rng.randint(0, 6))]
+            fused = outcome(lambda x: NmmsnNeData(x, validate_empty=True, validate_only_and_or_only_or=True, validate_oo_mapping_type=True).nmmsn_ne_list, ne_list)
+            assert fused == outcome(reference_validate, ne_list)
+    
+    
     def test_convert_inner_list_to_tuple_and_convert_inner_tuple_to_list(self):
         ne_data = NmmsnNeData(self.valid_ne_list[0])
         tuple_ne_list = [('a', 'A'), 'or', ('b', 'B'), 'and', ('c', 'C')]
@@ -406,6 +586,52 @@ class TestNmmsnNeData:
         unordered_ne_data = NmmsnNeData(unordered_ne_list)
         assert unordered_ne_data.logic_order(exclude_and=True).nmmsn_ne_list == ordered_ne_list
         
+        # Test 4: sorted by the second str of the pairs
+        unordered_ne_data = NmmsnNeData([['a', '乙'], 'and', ['b', '丙'], 'or', ['c', '甲']])
+        assert unordered_ne_data.logic_order(based_on_str_pair_index=1).nmmsn_ne_list == [['b', '丙'], 'and', ['a', '乙'], 'or', ['c', '甲']]
+    
+    
+    def test_canonical_key(self):
+        ne_data = NmmsnNeData(self.special_ne_list[0])
+        key = ne_data.canonical_key()
+        assert key == ((('a', 'A'), ('b', 'B'), ('c', 'C')), ('or', 'and'))
+        # the object is not modified
+        assert ne_data.nmmsn_ne_list == self.special_ne_list[0]
+        # the same logic gives the same key, whatever the order and the duplicates
+        assert NmmsnNeData([['c', 'C'], 'and', ['b', 'B'], 'or', ['a', 'A']]).canonical_key() == key
+        # the groups with the same first pair are ordered by the whole groups
+        assert NmmsnNeData([['a', 'A'], 'and', ['c', 'C'], 'or', ['b', 'B'], 'and', ['a', 'A']]).canonical_key() == (
+            (('a', 'A'), ('b', 'B'), ('a', 'A'), ('c', 'C')), ('and', 'or', 'and')
+        )
+        
+        # the same canonical ordering as the previous implementation (on one-to-one pairs, without ties)
+        def reference_logic_order(ne_list: list, exclude_and: bool) -> list:
+            groups = [[]]
+            for item in ne_list:
+                if item == 'or':
+                    groups.append([])
+                elif item != 'and':
+                    groups[-1].append(tuple(item))
+            if not exclude_and:
+                groups = [sorted(set(group), key=lambda x: x[0]) for group in groups]
+            groups = sorted(set(tuple(group) for group in groups), key=lambda x: x[0][0])
+            sorted_lst = []
+            for group in groups:
+                for pair in group:
+                    sorted_lst += [list(pair), 'and']
+                sorted_lst[-1] = 'or'
+            return sorted_lst[:-1]
+        
+        rng = random.Random(0)
+        for _ in range(300):
+            terms = rng.sample(range(100), rng.randint(1, 8))
+            ne_list = []
+            for i in terms:
+                ne_list += [[f'term {i}', f'术语{i}'], rng.choice(['and', 'or'])]
+            ne_list = ne_list[:-1] + ['or'] + ne_list[:-1] # every group is duplicated
+            exclude_and = rng.random() < 0.5
+            assert NmmsnNeData(ne_list).logic_order(exclude_and=exclude_and).nmmsn_ne_list == reference_logic_order(ne_list, exclude_and)
+        
 
     def test_stringify(self):
         # 1
@@ -867,3 +1093,89 @@ def test_construct_nmmsn():
         }
     }
     assert construct_nmmsn(input).model_dump() == expected_output
+
+
+def test_construct_nmmsn_batch():
+    inputs = [
+        {
+            'nmm_type': 'plant',
+            'species_origins': [['Ephedra sinica', '草麻黄']],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': []
+        },
+        {
+            'nmm_type': 'processed',
+            'species_origins': [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': [['segmented', '段制'], 'and', ['aquafried honey', '蜜炙制']]
+        },
+        # failed: processing methods in non-processed NMM
+        {
+            'nmm_type': 'plant',
+            'species_origins': [['Ephedra sinica', '草麻黄']],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': [['segmented', '段制']]
+        },
+        # failed: empty species origins
+        {
+            'nmm_type': 'plant',
+            'species_origins': [],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': []
+        },
+    ]
+    # repeat the inputs, so that the memoized results are used
+    nmmsn_nes = [NmmsnNameElement.model_validate(i) for i in inputs * 3]
+    
+    expected_outputs = [construct_nmmsn(i).model_dump() for i in nmmsn_nes]
+    outputs = construct_nmmsn_batch(nmmsn_nes)
+    assert [i.model_dump() for i in outputs] == expected_outputs
+    assert construct_nmmsn_batch([]) == []
+    
+    # the outputs built without validation are the same as the validated ones, and do not share the memoized lists
+    for output in outputs:
+        assert type(output).model_validate(output.model_dump()) == output
+        assert json.loads(dump_json_bytes(output)) == output.model_dump()
+    outputs[0].nmmsn.nmmsn_name_element.species_origins[0][0] = 'modified'
+    assert outputs[4].nmmsn.nmmsn_name_element.species_origins[0][0] == 'Ephedra sinica'
+
+
+class PipeError(Exception):
+    def __init__(self, pipe_name: str, reason: str):
+        super().__init__(f'{pipe_name}: {reason}')
+        self.pipe_name = pipe_name
+
+
+def test_memoize_call():
+    assert unwrap_memoized(memoize_call(len, [1, 2])) == 2
+    
+    # any exception is raised again as it is, e.g., with several arguments or with a quoted message
+    for exception in [PipeError('spe_ori', 'failed'), KeyError('a'), ValueError('b')]:
+        def fail(_):
+            raise exception
+        result = memoize_call(fail, [])
+        raised = []
+        for _ in range(2):
+            with pytest.raises(type(exception)) as exc_info:
+                unwrap_memoized(result)
+            assert str(exc_info.value) == str(exception)
+            assert exc_info.value.args == exception.args
+            assert exc_info.value.__dict__ == exception.__dict__
+            raised.append(exc_info.value)
+        # every hit raises a new exception, the first one (and its traceback) is not kept
+        assert raised[0] is not raised[1] and raised[0] is not exception
+        assert not hasattr(result, 'exception')
+    
+    pipes = NmmsnBatchPipes()
+    calls = []
+    def constructor(ne_input):
+        calls.append(ne_input)
+        raise PipeError('spe_ori', 'failed')
+    for _ in range(2):
+        with pytest.raises(PipeError, match='spe_ori: failed'):
+            pipes._memoize_ne('spe_ori', constructor, [['a', '甲']])
+    assert len(calls) == 1
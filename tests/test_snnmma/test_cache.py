@@ -0,0 +1,148 @@
+import pytest
+
+from shennongname.snnmma.model import NmmsnNameElement
+from shennongname.snnmma.algorithm import construct_nmmsn
+from shennongname.snnmma.cache import (
+    LruCache,
+    canonicalize_nmmsn_ne,
+    NmmsnCachedPipes,
+    NmmsnCache,
+)
+
+
+def test_lru_cache():
+    cache = LruCache(2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1 # 'b' becomes the least recently used
+    cache.set('c', 3)
+    assert cache.get('b') is LruCache.MISSING
+    assert cache.get('b', None) is None
+    assert cache.get('c') == 3
+    assert cache.stats() == {'maxsize': 2, 'size': 2, 'hits': 2, 'misses': 2, 'evictions': 1}
+    cache.clear()
+    assert cache.stats() == {'maxsize': 2, 'size': 0, 'hits': 0, 'misses': 0, 'evictions': 0}
+    
+    with pytest.raises(ValueError):
+        LruCache(0)
+
+
+def test_lru_cache_ttl(monkeypatch):
+    now = 0.0
+    monkeypatch.setattr(LruCache, 'clock', staticmethod(lambda: now))
+    cache = LruCache(2, ttl=10)
+    cache.set('a', 1)
+    now = 5.0
+    cache.set('b', 2)
+    assert cache.get('a') == 1
+    now = 10.0
+    assert cache.get('a') is LruCache.MISSING # expired
+    assert cache.get('b') == 2
+    now = 15.0
+    assert cache.get('b', None) is None
+    assert cache.stats() == {'maxsize': 2, 'size': 0, 'hits': 2, 'misses': 2, 'evictions': 0}
+    
+    with pytest.raises(ValueError):
+        LruCache(2, ttl=0)
+
+
+def test_canonicalize_nmmsn_ne():
+    nmmsn_ne_1 = NmmsnNameElement.model_validate({
+        'nmm_type': 'Plant',
+        'species_origins': [['Ephedra sinica', '草麻黄']],
+        'medicinal_parts': [[' herbaceous stem ', '草质茎']],
+        'special_descriptions': [['', '']],
+        'processing_methods': [],
+    })
+    nmmsn_ne_2 = NmmsnNameElement.model_validate({
+        'nmm_type': 'plant',
+        'species_origins': [['Ephedra sinica ', '草麻黄']],
+        'medicinal_parts': [['herbaceous stem', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [],
+    })
+    assert canonicalize_nmmsn_ne(nmmsn_ne_1) == canonicalize_nmmsn_ne(nmmsn_ne_2)
+    
+    # raw processing methods are checked before cleaning
+    nmmsn_ne_3 = nmmsn_ne_2.model_copy(update={'processing_methods': [['', '']]})
+    assert canonicalize_nmmsn_ne(nmmsn_ne_3) != canonicalize_nmmsn_ne(nmmsn_ne_2)
+    
+    # invalid name element list
+    nmmsn_ne_4 = nmmsn_ne_2.model_copy(update={'species_origins': [['Ephedra sinica', '草麻黄'], 'but']})
+    assert canonicalize_nmmsn_ne(nmmsn_ne_4) is None
+
+
+def test_nmmsn_cache():
+    nmmsn_ne = NmmsnNameElement.model_validate({
+        'nmm_type': 'processed',
+        'species_origins': [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+        'medicinal_parts': [['stem herbaceous', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [['segmented', '段制'], 'and', ['aquafried honey', '蜜炙制']],
+    })
+    other_nmmsn_nes = [
+        nmmsn_ne.model_copy(update={'processing_methods': [['segmented', '段制']]}),
+        nmmsn_ne.model_copy(update={'nmm_type': 'plant'}), # failed
+        nmmsn_ne.model_copy(update={'species_origins': []}), # failed
+    ]
+    
+    nmmsn_cache = NmmsnCache(maxsize=2)
+    for i in [nmmsn_ne, nmmsn_ne] + other_nmmsn_nes + [nmmsn_ne]:
+        assert nmmsn_cache.construct_nmmsn(i).model_dump() == construct_nmmsn(i).model_dump()
+    assert nmmsn_cache.stats() == {'maxsize': 2, 'size': 2, 'hits': 1, 'misses': 5, 'evictions': 3}
+    
+    # the returned result is a copy
+    result = nmmsn_cache.construct_nmmsn(nmmsn_ne)
+    result.nmmsn.nmmsn = 'modified' # type: ignore
+    assert nmmsn_cache.construct_nmmsn(nmmsn_ne).nmmsn.nmmsn != 'modified' # type: ignore
+
+
+def test_nmmsn_cached_pipes():
+    nmmsn_ne = NmmsnNameElement.model_validate({
+        'nmm_type': 'processed',
+        'species_origins': [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+        'medicinal_parts': [['stem herbaceous', '草质茎']],
+        'special_descriptions': [],
+        'processing_methods': [['segmented', '段制']],
+    })
+    nmmsn_nes = [
+        nmmsn_ne,
+        # only the processing methods differ
+        nmmsn_ne.model_copy(update={'processing_methods': [['segmented', '段制'], 'and', ['aquafried honey', '蜜炙制']]}),
+        # invalid species origins
+        nmmsn_ne.model_copy(update={'species_origins': [['Ephedra sinica', '草麻黄'], 'and', ['Ephedra sinica', '麻黄']]}),
+        nmmsn_ne.model_copy(update={'species_origins': [['Ephedra sinica', '草麻黄'], 'and', ['Ephedra sinica', '麻黄']]}),
+    ]
+    
+    cached_pipes = NmmsnCachedPipes(maxsize=10)
+    for i in nmmsn_nes:
+        assert construct_nmmsn(i, cached_pipes).model_dump() == construct_nmmsn(i).model_dump()
+    stats = cached_pipes.stats()
+    assert stats['spe_ori'] == {'maxsize': 10, 'size': 2, 'hits': 2, 'misses': 2, 'evictions': 0}
+    assert stats['med_par'] == {'maxsize': 10, 'size': 1, 'hits': 3, 'misses': 1, 'evictions': 0}
+    assert stats['pro_met'] == {'maxsize': 10, 'size': 2, 'hits': 2, 'misses': 2, 'evictions': 0}
+    
+    # the sub-results are also used by the cache of the whole NMMSN
+    nmmsn_cache = NmmsnCache(maxsize=10, pipes=cached_pipes)
+    assert nmmsn_cache.construct_nmmsn(nmmsn_ne).model_dump() == construct_nmmsn(nmmsn_ne).model_dump()
+    assert cached_pipes.stats()['spe_ori']['hits'] == 3
+    
+    cached_pipes.clear()
+    assert cached_pipes.stats()['spe_ori']['size'] == 0
+
+
+def test_nmmsn_cached_pipes_exception():
+    class KeyErrorPipes(NmmsnCachedPipes):
+        CONSTRUCTORS = {**NmmsnCachedPipes.CONSTRUCTORS, 'spe_ori': lambda ne_input: {}['missing']}
+    
+    cached_pipes = KeyErrorPipes(maxsize=10)
+    raised = []
+    for _ in range(2):
+        with pytest.raises(KeyError) as exc_info:
+            cached_pipes.spe_ori([['a', '甲']])
+        # the message is not quoted again
+        assert exc_info.value.args == ('missing',)
+        raised.append(exc_info.value)
+    assert cached_pipes.stats()['spe_ori']['hits'] == 1
+    # the cache hits raise distinct exceptions, the shared cache does not keep a raised one
+    assert raised[0] is not raised[1]
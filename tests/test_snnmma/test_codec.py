@@ -0,0 +1,79 @@
+import random
+
+import pandas as pd
+import pytest
+
+from shennongname.snnmma.algorithm import NmmsnNeData
+from shennongname.snnmma.codec import (
+    EMPTY_FROZEN_NMMSN_NE,
+    decode_nmmsn_ne,
+    decode_nmmsn_ne_series,
+    encode_nmmsn_ne,
+    encode_nmmsn_ne_series,
+)
+
+
+# terms with irregular whitespace, logic operators inside words, Chinese characters, etc.
+TERMS = ['a', 'b  c', 'Oryza sativa', 'sand', 'ORe', 'x\ty', 'or-and', 'And', 'mixed OR terms', '甲', '乙 丙', '草麻黄']
+AMBIGUOUS_TERMS = ['a|b', 'a or b', 'or', 'and b', 'a and', '|']
+
+
+def random_nmmsn_ne_list(rng: random.Random, terms: list[str]) -> list:
+    nmmsn_ne_list = []
+    for _ in range(rng.randint(0, 6)):
+        nmmsn_ne_list.append([rng.choice(terms), rng.choice(terms)])
+        nmmsn_ne_list.append(rng.choice(['and', 'or', ' AND ', 'Or']))
+    return nmmsn_ne_list[:-1]
+
+
+def test_encode_nmmsn_ne():
+    nmmsn_ne_list = [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄'], 'and', ['Ephedra equisetina', '木贼麻黄']]
+    assert encode_nmmsn_ne(nmmsn_ne_list) == 'Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄 and Ephedra equisetina | 木贼麻黄'
+    assert encode_nmmsn_ne(NmmsnNeData(nmmsn_ne_list)) == encode_nmmsn_ne(NmmsnNeData(nmmsn_ne_list).freeze())
+    assert encode_nmmsn_ne([['a', '甲']]) == 'a | 甲'
+    assert encode_nmmsn_ne([]) == ''
+
+    for term in AMBIGUOUS_TERMS:
+        with pytest.raises(ValueError):
+            encode_nmmsn_ne([['a', '甲'], 'or', [term, '乙']])
+        with pytest.raises(ValueError):
+            encode_nmmsn_ne([[term if term.strip() else 'a', term]])
+
+
+def test_round_trip():
+    rng = random.Random(0)
+    for _ in range(3000):
+        nmmsn_ne_data = NmmsnNeData(random_nmmsn_ne_list(rng, TERMS))
+        encoded = encode_nmmsn_ne(nmmsn_ne_data)
+        assert decode_nmmsn_ne(encoded).freeze() == nmmsn_ne_data.freeze(), encoded
+        # the encoding is canonical
+        assert encode_nmmsn_ne(decode_nmmsn_ne(encoded)) == encoded
+
+    # the terms are either encoded losslessly or rejected
+    for _ in range(3000):
+        nmmsn_ne_data = NmmsnNeData(random_nmmsn_ne_list(rng, TERMS + AMBIGUOUS_TERMS))
+        try:
+            encoded = encode_nmmsn_ne(nmmsn_ne_data)
+        except ValueError:
+            assert any(term in AMBIGUOUS_TERMS for pair in nmmsn_ne_data.pairs for term in pair)
+            continue
+        assert decode_nmmsn_ne(encoded).freeze() == nmmsn_ne_data.freeze(), encoded
+
+
+def test_series():
+    rng = random.Random(1)
+    nmmsn_ne_lists = [random_nmmsn_ne_list(rng, TERMS) for _ in range(50)]
+    series = pd.Series(nmmsn_ne_lists * 3 + [None], index=range(10, 161), name='species_origins')
+
+    encoded = encode_nmmsn_ne_series(series)
+    assert encoded.index.equals(series.index) and encoded.name == 'species_origins'
+    assert encoded.tolist() == [encode_nmmsn_ne(i) for i in nmmsn_ne_lists] * 3 + ['']
+
+    decoded = decode_nmmsn_ne_series(encoded)
+    assert decoded.index.equals(series.index) and decoded.name == 'species_origins'
+    assert decoded.tolist() == [NmmsnNeData(i).freeze() for i in nmmsn_ne_lists] * 3 + [EMPTY_FROZEN_NMMSN_NE]
+    # the frozen name elements are encoded back to the same strings
+    assert encode_nmmsn_ne_series(decoded).equals(encoded)
+
+    # the missing cells are empty name elements
+    assert decode_nmmsn_ne_series(pd.Series(['a | 甲', None])).tolist() == [((('a', '甲'),), ()), EMPTY_FROZEN_NMMSN_NE]
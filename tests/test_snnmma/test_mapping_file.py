@@ -0,0 +1,80 @@
+import random
+
+import pandas as pd
+import pytest
+
+from shennongname.snnmma.algorithm import Mapping
+from shennongname.snnmma.mapping_file import MappedMapping, save_mapping
+from shennongname.snnmma.standardize import TermStandardizer
+
+
+def test_mapped_mapping(tmp_path):
+    path = tmp_path / 'mapping.bin'
+    mapping = Mapping([('appla', 'apple'), ('appli', 'apple'), ('carr', 'car'), ('苹果', 'apple')])
+    save_mapping(mapping, path)
+    
+    with MappedMapping(path) as mapped_mapping:
+        assert len(mapped_mapping) == 4
+        assert mapped_mapping.mapping_type == 'mo'
+        assert mapped_mapping.get_keys(' apple ') == {'appla', 'appli', '苹果'}
+        assert mapped_mapping.get_values('苹果') == {'apple'}
+        assert mapped_mapping.get_values('banana') == set()
+        assert mapped_mapping.get('carr') == 'car'
+        assert mapped_mapping.get('car') is None
+        assert ('appla', 'apple') in mapped_mapping
+        assert ('appla', 'car') not in mapped_mapping
+        assert list(mapped_mapping.items()) == mapping.mapping
+        assert mapped_mapping.to_mapping().mapping == mapping.mapping
+        # it can be used to standardize terms
+        assert TermStandardizer(mapped_mapping).standardize('appli') == 'apple'
+    
+    save_mapping(Mapping([]), path)
+    with MappedMapping(path) as mapped_mapping:
+        assert len(mapped_mapping) == 0
+        assert mapped_mapping.mapping_type == 'nn'
+        assert mapped_mapping.get_values('apple') == set()
+
+
+def test_mapped_mapping_lookups(tmp_path):
+    # the same lookups as the in-memory mapping
+    rng = random.Random(0)
+    mapping = Mapping([(f'key {rng.randrange(200)}', f'值{rng.randrange(100)}') for _ in range(300)], ignore_case=True)
+    path = tmp_path / 'mapping.bin'
+    save_mapping(mapping, path)
+    
+    with MappedMapping(path) as mapped_mapping:
+        assert mapped_mapping.mapping_type == mapping.mapping_type
+        for i in range(220):
+            assert mapped_mapping.get_values(f'KEY {i}') == mapping.get_values(f'key {i}')
+        for i in range(110):
+            assert mapped_mapping.get_keys(f'值{i}') == mapping.get_keys(f'值{i}')
+
+
+def test_invalid_mapping_file(tmp_path):
+    path = tmp_path / 'mapping.bin'
+    path.write_bytes(b'not a mapping file, not a mapping file')
+    with pytest.raises(ValueError):
+        MappedMapping(path)
+    
+    save_mapping(Mapping([('appla', 'apple')]), path)
+    path.write_bytes(path.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        MappedMapping(path)
+
+
+def test_standardize_mapped_mapping(tmp_path, monkeypatch):
+    mapping = Mapping([('Ephedra sinica', 'Ephedra sinica'), ('Ephedra sinica Stapf', 'Ephedra sinica'), ('麻黄', 'Ephedra sinica')], ignore_case=True)
+    path = tmp_path / 'mapping.bin'
+    save_mapping(mapping, path)
+    series = pd.Series(['EPHEDRA sinica stapf', 'Ephedra sinica;麻黄', 'Ephedra', '', None, '麻黄 '] * 3)
+    
+    # the lookups are served from the mapped buffer, without building the mapping in memory
+    monkeypatch.setattr(MappedMapping, 'to_mapping', lambda self: pytest.fail('the mapping is copied'))
+    with MappedMapping(path) as mapped_mapping:
+        standardizer = TermStandardizer(mapped_mapping)
+        assert standardizer.standardize_series(series).equals(TermStandardizer(mapping).standardize_series(series))
+        assert standardizer.standardize(' ephedra SINICA stapf;x') == 'ephedra sinica;failed_mapping' # the values are in lower case as well
+    
+    save_mapping(Mapping([('apple', 'appla'), ('apple', 'appli')]), path)
+    with MappedMapping(path) as mapped_mapping, pytest.raises(ValueError):
+        TermStandardizer(mapped_mapping)
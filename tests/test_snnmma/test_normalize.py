@@ -0,0 +1,83 @@
+import random
+import re
+
+import pytest
+
+from shennongname.snnmma.normalize import (
+    collapse_whitespace,
+    remove_whitespace,
+    collapse_hyphens,
+    remove_chars,
+    get_split_pattern,
+    is_printable_ascii,
+    get_non_printable_ascii_characters,
+    replace_non_printable_ascii,
+    replace_non_alphabet_and_hyphen_and_space,
+)
+
+
+def test_collapse_whitespace():
+    assert collapse_whitespace(' a \t\n  b ') == ' a b '
+    assert collapse_whitespace('') == ''
+
+
+def test_remove_whitespace():
+    assert remove_whitespace('  Hello    World!  ') == 'HelloWorld!'
+
+
+def test_collapse_hyphens():
+    assert collapse_hyphens('a--b---c-d') == 'a-b-c-d'
+
+
+def test_remove_chars():
+    assert remove_chars('（原）板蓝', '（）') == '原板蓝'
+    assert remove_chars('abc', 'xyz') == 'abc'
+
+
+def test_get_split_pattern():
+    # the patterns are cached by the separator tuple
+    assert get_split_pattern((' and ', ' or ')) is get_split_pattern((' and ', ' or '))
+    assert get_split_pattern((' and ', ' or ')) is not get_split_pattern((' and ', ' or '), keep_sep=True)
+    
+    assert get_split_pattern((' and ', ' or ')).split('a and b or c') == ['a', 'b', 'c']
+    assert get_split_pattern((' and ', ' or '), keep_sep=True).split('a and b or c') == ['a', ' and ', None, 'b', None, ' or ', 'c']
+
+
+# Equivalence with the per-character reference implementations
+
+def reference_char_is_printable_ascii(c: str) -> bool:
+    return ord(c) < 128 and ord(c) >= 32
+
+
+def reference_char_is_alphabet_and_hyphen_and_space(c: str) -> bool:
+    return c.isalpha() or c == "-" or c == " "
+
+
+def reference_replace(s: str, replacement: str, char_is_kept, collapse_hyphen: bool) -> str:
+    s = "".join([c if char_is_kept(c) else replacement for c in s])
+    s = re.sub(r"\s+", " ", s)
+    if collapse_hyphen:
+        s = re.sub(r"-+", "-", s)
+    return s.strip()
+
+
+def generate_corpus(n: int = 500, seed: int = 0) -> list[str]:
+    corpus = [
+        '', 'Hello World!', 'Hello \x00 World!', 'Hello 你 World! 你好，世界', 'Hello × World',
+        'Ephedra sinica var. intermedia', '（ 原 ）板 蓝', '乙-丙 -- 丁', ' a\t\nb ', 'A or B-c and D',
+        'x²½①_9', '\x7f\x1f', 'Café naïve', '蜜炙制段制', 'a\\1b',
+    ]
+    rng = random.Random(seed)
+    alphabet = 'aZ -_.\t\n\x00\x7f×（）你好²½é9' + ''.join(chr(rng.randrange(0x20, 0x3000)) for _ in range(50))
+    for _ in range(n):
+        corpus.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20))))
+    return corpus
+
+
+@pytest.mark.parametrize("replacement", ['', '?', ' ', '-', '\\1'])
+def test_single_pass_equivalence(replacement):
+    for s in generate_corpus():
+        assert is_printable_ascii(s) == all(reference_char_is_printable_ascii(c) for c in s)
+        assert get_non_printable_ascii_characters(s) == set(c for c in s if not reference_char_is_printable_ascii(c))
+        assert replace_non_printable_ascii(s, replacement) == reference_replace(s, replacement, reference_char_is_printable_ascii, False)
+        assert replace_non_alphabet_and_hyphen_and_space(s, replacement) == reference_replace(s, replacement, reference_char_is_alphabet_and_hyphen_and_space, True)
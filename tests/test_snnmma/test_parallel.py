@@ -0,0 +1,42 @@
+import pytest
+
+from shennongname.snnmma.model import NmmsnNameElement
+from shennongname.snnmma.algorithm import construct_nmmsn
+from shennongname.snnmma.parallel import (
+    chunk_iterable,
+    NmmsnProcessPool,
+    construct_nmmsn_parallel,
+)
+
+
+def test_chunk_iterable():
+    assert list(chunk_iterable(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(chunk_iterable([], 2)) == []
+
+
+def test_construct_nmmsn_parallel():
+    nmmsn_nes = []
+    for species in ['Ephedra sinica', 'Ephedra intermedia', 'Ephedra equisetina']:
+        for processing_methods in [[], [['segmented', '段制']]]:
+            nmmsn_nes.append(NmmsnNameElement.model_validate({
+                'nmm_type': 'processed' if processing_methods else 'plant',
+                'species_origins': [[species, '麻黄']],
+                'medicinal_parts': [['herbaceous stem', '草质茎']],
+                'special_descriptions': [],
+                'processing_methods': processing_methods,
+            }))
+    # the last one fails
+    nmmsn_nes.append(nmmsn_nes[1].model_copy(update={'nmm_type': 'plant'}))
+    expected_outputs = [construct_nmmsn(i).model_dump() for i in nmmsn_nes]
+    
+    for jobs in [1, 2]:
+        outputs = construct_nmmsn_parallel(nmmsn_nes, jobs=jobs, chunksize=2)
+        assert [i.model_dump() for i in outputs] == expected_outputs
+    
+    # the pool can be reused
+    with NmmsnProcessPool(jobs=2, chunksize=3) as pool:
+        for _ in range(2):
+            assert [i.model_dump() for i in pool.construct_nmmsn(iter(nmmsn_nes))] == expected_outputs
+    
+    with pytest.raises(ValueError):
+        NmmsnProcessPool(jobs=1, chunksize=0)
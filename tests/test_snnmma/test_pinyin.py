@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from shennongname.snnmma.algorithm import NmmsnPipes, convert_to_pinyin, construct_nmmsn
+from shennongname.snnmma.model import NmmsnNameElement
+from shennongname.snnmma.pinyin import PinyinEngine, PINYIN_TABLE_ENV
+
+
+NMMSN_ZH_LIST = [
+    '草麻黄草质茎',
+    '蒸制炒制鲜或干木贼麻黄或中麻黄或草麻黄草质茎或根茎与根',
+    '蜜炙制段制木贼麻黄或中麻黄或草麻黄草质茎',
+    '虚拟的草麻黄变种或虚拟的草麻黄杂交种',
+    '丁与乙-丙或甲',
+    '',
+]
+
+
+def test_convert():
+    engine = PinyinEngine()
+    for nmmsn_zh in NMMSN_ZH_LIST:
+        assert engine.convert(nmmsn_zh) == convert_to_pinyin(nmmsn_zh)
+    # the segments are cached
+    assert engine.convert_segment.cache_info().hits > 0
+
+
+def test_table(tmp_path, monkeypatch):
+    engine = PinyinEngine().add_terms(['草麻黄', ' 草质茎 ', ''])
+    assert engine.table == {'草麻黄': 'cǎo má huáng', '草质茎': 'cǎo zhì jīng'}
+    
+    path = tmp_path / 'pinyin_table.json'
+    engine.save(path)
+    loaded_engine = PinyinEngine.load(path)
+    assert loaded_engine.table == engine.table
+    
+    # the table is used before pypinyin
+    loaded_engine.table['草麻黄'] = 'custom'
+    assert loaded_engine.convert('草麻黄或中麻黄') == 'custom huò zhōng má huáng'
+    
+    monkeypatch.setenv(PINYIN_TABLE_ENV, str(path))
+    assert PinyinEngine.from_env().table == engine.table
+    monkeypatch.delenv(PINYIN_TABLE_ENV)
+    assert PinyinEngine.from_env().table == {}
+    
+    # the terms of a realistic concatenated name are looked up in the table, without pypinyin
+    engine = PinyinEngine().add_terms(['段制', '草麻黄', '中麻黄', '草质茎', '根'])
+    engine.convert_segment = lambda segment: pytest.fail(f'pypinyin called on {segment}')
+    assert engine.convert('段制草麻黄草质茎') == 'duàn zhì cǎo má huáng cǎo zhì jīng'
+    assert engine.convert('段制中麻黄或草麻黄草质茎与根') == 'duàn zhì zhōng má huáng huò cǎo má huáng cǎo zhì jīng yǔ gēn'
+    output = construct_nmmsn(NmmsnNameElement(
+        nmm_type='processed',
+        species_origins=[['Ephedra sinica', '草麻黄']],
+        medicinal_parts=[['herbaceous stem', '草质茎']],
+        special_descriptions=[],
+        processing_methods=[['segmented', '段制']],
+    ), NmmsnPipes(engine))
+    assert output.nmmsn.nmmsn_zh.zh == '段制草麻黄草质茎' # type: ignore
+    assert output.nmmsn.nmmsn_zh.pinyin == 'duàn zhì cǎo má huáng cǎo zhì jīng' # type: ignore
+    
+    # only the unknown terms are converted by pypinyin
+    assert PinyinEngine({'段制': 'custom'}).convert('段制草麻黄') == 'custom cǎo má huáng'
+    
+    path.write_text('[]', encoding='utf-8')
+    with pytest.raises(ValueError):
+        PinyinEngine.load(path)
+
+
+def test_bad_table_env(tmp_path):
+    # the default engine is only created on first use, thus a bad table does not fail the import
+    path = tmp_path / 'missing.json'
+    code = '\n'.join([
+        'import shennongname.snnmma.algorithm',
+        'from shennongname.snnmma.pinyin import get_default_pinyin_engine',
+        'try:',
+        '    get_default_pinyin_engine()',
+        'except ValueError as e:',
+        '    print(e)',
+    ])
+    result = subprocess.run([sys.executable, '-c', code], env={**os.environ, PINYIN_TABLE_ENV: str(path)}, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert PINYIN_TABLE_ENV in result.stdout and str(path) in result.stdout
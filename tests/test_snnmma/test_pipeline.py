@@ -0,0 +1,108 @@
+import json
+
+import pandas as pd
+
+from shennongname.snnmma.algorithm import Default
+from shennongname.snnmma.pipeline import construct_nmmsn_table
+
+
+CSV_TABLE = '''nmm_type,species_origins,medicinal_parts,special_descriptions,processing_methods
+plant,Ephedra sinica | 草麻黄,herbaceous stem | 草质茎,,
+processed,Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄,stem herbaceous | 草质茎,,segmented | 段制 and aquafried honey | 蜜炙制
+plant,Ephedra sinica | 草麻黄 | 麻黄,herbaceous stem | 草质茎,,
+plant,,herbaceous stem | 草质茎,,
+plant,failed_mapping,herbaceous stem | 草质茎,,
+'''
+
+EXPECTED_OUTPUTS = [
+    ['Ephedra sinica Herbaceous-stem', '草麻黄草质茎', 'cǎo má huáng cǎo zhì jīng'],
+    ['Ephedra intermedia vel sinica Stem-herbaceous Segmented and Aquafried-honey', '蜜炙制段制中麻黄或草麻黄草质茎', 'mì zhì zhì duàn zhì zhōng má huáng huò cǎo má huáng cǎo zhì jīng'],
+    # the inner list is not a pair
+    [Default.FAILED_CONSTRUCT_TOKEN] * 3,
+    # empty species origins
+    [Default.FAILED_CONSTRUCT_TOKEN] * 3,
+    # failed token left by term mapping
+    [Default.FAILED_MAPPING_TOKEN] * 3,
+]
+
+
+def test_construct_nmmsn_table_csv(tmp_path):
+    input_path = tmp_path / 'input.csv'
+    input_path.write_text(CSV_TABLE, encoding='utf-8')
+    
+    for output_name in ['output.csv', 'output.tsv']:
+        output_path = tmp_path / output_name
+        # a small chunksize, so that the table is processed in multiple chunks
+        assert construct_nmmsn_table(input_path, output_path, chunksize=2) == 5
+        
+        output = pd.read_csv(output_path, sep=',' if output_name.endswith('.csv') else '\t', dtype=str, keep_default_na=False)
+        assert output[['nmmsn', 'nmmsn_zh', 'nmmsn_pinyin']].values.tolist() == EXPECTED_OUTPUTS
+        assert output['error_msg'][0] == ''
+        assert output['species_origins'][1] == 'Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄'
+
+
+def test_construct_nmmsn_table_jsonl(tmp_path):
+    records = [
+        {
+            'nmm_type': 'plant',
+            'species_origins': [['Ephedra sinica', '草麻黄']],
+            'medicinal_parts': 'herbaceous stem | 草质茎', # a cell can also be a string
+            'special_descriptions': [],
+            'processing_methods': [],
+        },
+        {
+            'nmm_type': 'plant',
+            'species_origins': [['Ephedra sinica', '草麻黄']],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': [['segmented', '段制']],
+        },
+    ]
+    input_path = tmp_path / 'input.jsonl'
+    input_path.write_text('\n'.join(json.dumps(i, ensure_ascii=False) for i in records), encoding='utf-8')
+    output_path = tmp_path / 'output.jsonl'
+    
+    assert construct_nmmsn_table(input_path, output_path, chunksize=1) == 2
+    
+    outputs = [json.loads(i) for i in output_path.read_text(encoding='utf-8').splitlines()]
+    assert len(outputs) == 2
+    assert outputs[0]['nmmsn'] == 'Ephedra sinica Herbaceous-stem'
+    assert outputs[0]['species_origins'] == [['Ephedra sinica', '草麻黄']]
+    assert outputs[1]['nmmsn'] == Default.FAILED_CONSTRUCT_TOKEN
+    assert outputs[1]['error_msg'] == 'Pipe: construct_nmmsn. Status: failed. Reason: Processing methods detected in non-processed NMM.'
+
+
+def test_construct_nmmsn_table_jsonl_to_csv(tmp_path):
+    records = [
+        {
+            'nmm_type': 'processed',
+            'species_origins': [['Ephedra sinica', '草麻黄'], 'or', ['Ephedra intermedia', '中麻黄']],
+            'medicinal_parts': 'herbaceous stem | 草质茎',
+            'special_descriptions': [],
+            'processing_methods': [['segmented', '段制']],
+        },
+        # can not be encoded, written as JSON
+        {
+            'nmm_type': 'plant',
+            'species_origins': [['Ephedra sinica', '草麻黄', '麻黄']],
+            'medicinal_parts': [['herbaceous stem', '草质茎']],
+            'special_descriptions': [],
+            'processing_methods': [],
+        },
+    ]
+    input_path = tmp_path / 'input.jsonl'
+    input_path.write_text('\n'.join(json.dumps(i, ensure_ascii=False) for i in records), encoding='utf-8')
+    output_path = tmp_path / 'output.csv'
+    assert construct_nmmsn_table(input_path, output_path) == 2
+    
+    output = pd.read_csv(output_path, dtype=str, keep_default_na=False)
+    assert output['species_origins'].tolist() == ['Ephedra sinica | 草麻黄 or Ephedra intermedia | 中麻黄', '[["Ephedra sinica", "草麻黄", "麻黄"]]']
+    assert output['processing_methods'].tolist() == ['segmented | 段制', '']
+    
+    # the output can be used as the input of the pipeline
+    rerun_path = tmp_path / 'rerun.csv'
+    output.iloc[:1].to_csv(input_path.with_suffix('.csv'), index=False)
+    assert construct_nmmsn_table(input_path.with_suffix('.csv'), rerun_path) == 1
+    rerun = pd.read_csv(rerun_path, dtype=str, keep_default_na=False)
+    assert rerun.loc[0, 'nmmsn'] == output.loc[0, 'nmmsn'] != Default.FAILED_CONSTRUCT_TOKEN
+    assert rerun.loc[0, 'species_origins'] == output.loc[0, 'species_origins']
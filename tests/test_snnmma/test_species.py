@@ -0,0 +1,57 @@
+import random
+
+from shennongname.snnmma.algorithm import detect_species_inclusion
+from shennongname.snnmma.species import SpeciesIndex
+
+
+def reference_detect_species_inclusion(species_list: list[str]) -> tuple[bool, list[str]]:
+    # the quadratic implementation replaced by `SpeciesIndex`
+    species_list = sorted([' '.join(species.split()) for species in species_list], key=len)
+    highest_level_species = []
+    inclusion_detected = False
+    for species in species_list:
+        if not any(species.lower().startswith(higher_species.lower()) for higher_species in highest_level_species):
+            highest_level_species.append(species)
+        else:
+            inclusion_detected = True
+    return inclusion_detected, sorted(highest_level_species)
+
+
+def test_species_index():
+    index = SpeciesIndex(['Prinsepia uniflora var. serrata', 'Prinsepia sinensis'])
+    assert len(index) == 2
+    assert 'prinsepia uniflora var. serrata f. alba' in index
+    assert 'Prinsepia uniflora' not in index
+    
+    # adding a species including some species of the index
+    assert index.add('Prinsepia uniflora') == True
+    assert len(index) == 2
+    assert index.highest_level_species() == ['Prinsepia sinensis', 'Prinsepia uniflora']
+    assert index.find_including('Prinsepia uniflora var. serrata') == 'Prinsepia uniflora'
+    
+    # adding an included species, or the same species with another case
+    assert index.add('Prinsepia uniflora var. serrata') == True
+    assert index.add('PRINSEPIA SINENSIS') == True
+    assert index.add('Ephedra sinica') == False
+    assert index.highest_level_species() == ['Ephedra sinica', 'Prinsepia sinensis', 'Prinsepia uniflora']
+    
+    assert index.add('Prinsepia') == True
+    assert len(index) == 2
+    assert index.highest_level_species() == ['Ephedra sinica', 'Prinsepia']
+
+
+def test_detect_species_inclusion_equivalence():
+    rng = random.Random(0)
+    genera = ['Prinsepia', 'Ephedra', 'ephedra', 'Eph']
+    epithets = ['uniflora', 'sinica', 'sin', 'Sinica', 'intermedia']
+    ranks = ['var.', 'subsp.', 'f.']
+    for _ in range(500):
+        species_list = []
+        for _ in range(rng.randint(0, 12)):
+            species = [rng.choice(genera)]
+            for _ in range(rng.randint(0, 2)):
+                species.append(rng.choice(epithets))
+                if rng.random() < 0.5:
+                    species.append(rng.choice(ranks))
+            species_list.append('  ' * rng.randint(0, 1) + ' '.join(species))
+        assert detect_species_inclusion(species_list) == reference_detect_species_inclusion(species_list)
@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from shennongname.snnmma.algorithm import Default, Mapping
+from shennongname.snnmma.standardize import TermStandardizer
+
+
+MAPPING = [
+    ('Ephedra sinica', 'Ephedra sinica'),
+    ('Ephedra sinica Stapf', 'Ephedra sinica'),
+    ('stir-fried', 'stirfried'),
+]
+
+
+def test_standardize():
+    standardizer = TermStandardizer(Mapping(MAPPING))
+    assert standardizer.standardize(' Ephedra sinica Stapf ') == 'Ephedra sinica'
+    assert standardizer.standardize('ephedra sinica') == Default.FAILED_MAPPING_TOKEN
+    assert standardizer.standardize('stir-fried; steamed') == f'stirfried;{Default.FAILED_MAPPING_TOKEN}'
+    assert standardizer.standardize(' ') == ''
+    
+    standardizer = TermStandardizer(Mapping(MAPPING, ignore_case=True), failed_token='unknown')
+    assert standardizer.standardize('EPHEDRA SINICA') == 'ephedra sinica'
+    assert standardizer.standardize('steamed') == 'unknown'
+    
+    # a term with multiple standard terms can not be standardized
+    with pytest.raises(ValueError):
+        TermStandardizer(Mapping(MAPPING + [('stir-fried', 'fried')]))
+
+
+def test_standardize_series():
+    standardizer = TermStandardizer(Mapping(MAPPING))
+    series = pd.Series(
+        ['Ephedra sinica Stapf', 'stir-fried;Ephedra sinica', 'steamed', '', None, 'Ephedra sinica Stapf'],
+        index=[5, 4, 3, 2, 1, 0],
+        name='term',
+    )
+    result = standardizer.standardize_series(series)
+    assert result.index.tolist() == series.index.tolist()
+    assert result.name == 'term'
+    assert result.tolist() == ['Ephedra sinica', 'stirfried;Ephedra sinica', Default.FAILED_MAPPING_TOKEN, '', '', 'Ephedra sinica']
+    # the same results as standardizing every cell
+    assert result.tolist() == [standardizer.standardize(i or '') for i in series]
+    
+    assert standardizer.standardize_series(pd.Series([], dtype=object)).tolist() == []
+
+
+def test_from_table(tmp_path):
+    table_path = tmp_path / 'mapping.tsv'
+    pd.DataFrame({'nonstandard': [i[0] for i in MAPPING] + [''], 'standard': [i[1] for i in MAPPING] + ['x']}).to_csv(table_path, sep='\t', index=False)
+    standardizer = TermStandardizer.from_table(table_path, 'nonstandard', 'standard')
+    assert len(standardizer.mapping) == 3
+    
+    df = pd.DataFrame({'species': ['Ephedra sinica Stapf'], 'processing': ['stir-fried'], 'other': ['stir-fried']})
+    result = standardizer.standardize_frame(df, ['species', 'processing'])
+    assert result.to_dict('records') == [{'species': 'Ephedra sinica', 'processing': 'stirfried', 'other': 'stir-fried'}]
+    assert df['species'][0] == 'Ephedra sinica Stapf'